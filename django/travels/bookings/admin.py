@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Bus,Seat,Booking,Ticket,Payment, Profile
+from .models import Bus,Seat,Booking,Ticket,Payment, Profile, GeocodeCacheEntry, SweeperRun, BookingHistory
 # Register your models here.
 
 class PaymentAdmin(admin.ModelAdmin):
@@ -19,9 +19,24 @@ class BookingAdmin(admin.ModelAdmin):
 class ProfileAdmin(admin.ModelAdmin):
     list_display = ['user', 'is_email_verified']
 
+class GeocodeCacheEntryAdmin(admin.ModelAdmin):
+    list_display = ('query', 'label', 'lat', 'lon', 'created_at')
+    search_fields = ('query', 'label')
+
+class SweeperRunAdmin(admin.ModelAdmin):
+    list_display = ('name', 'started_at', 'finished_at', 'batches', 'rows', 'last_pk', 'elapsed_ms')
+    list_filter = ('name',)
+
+class BookingHistoryAdmin(admin.ModelAdmin):
+    list_display = ('booking_id', 'user', 'bus_name', 'seat_number', 'journey_date', 'status', 'archived_at')
+    search_fields = ('booking_id', 'bus_number', 'razorpay_order_id')
+
 admin.site.register(Profile, ProfileAdmin)
 admin.site.register(Bus, BusAdmin)
 admin.site.register(Seat, SeatAdmin)
 admin.site.register(Booking, BookingAdmin)
 admin.site.register(Ticket, TicketAdmin)
-admin.site.register(Payment, PaymentAdmin)
\ No newline at end of file
+admin.site.register(Payment, PaymentAdmin)
+admin.site.register(GeocodeCacheEntry, GeocodeCacheEntryAdmin)
+admin.site.register(SweeperRun, SweeperRunAdmin)
+admin.site.register(BookingHistory, BookingHistoryAdmin)
\ No newline at end of file
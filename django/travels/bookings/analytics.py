@@ -0,0 +1,134 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, DateField, F, Sum
+from django.db.models.functions import Trunc
+
+from .models import Booking, BookingHistory, Bus, DailyBusRollup
+
+
+GRANULARITIES = ("day", "week", "month")
+GROUPINGS = {
+    "total": (),
+    "bus": ("bus_id",),
+    "route": ("route_origin", "route_destination"),
+}
+
+
+def period_start(day, granularity):
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def period_days(start, end, granularity):
+    days = {}
+    day = start
+    while day <= end:
+        period = period_start(day, granularity)
+        days[period] = days.get(period, 0) + 1
+        day += timedelta(days=1)
+    return days
+
+
+def grouped(queryset, date_field, granularity, group_by):
+    queryset = queryset.annotate(period=Trunc(date_field, granularity, output_field=DateField()))
+    if group_by == "route":
+        queryset = queryset.annotate(
+            route_origin=F("bus__origin_normalized"),
+            route_destination=F("bus__destination_normalized"),
+        )
+    return queryset.values("period", *GROUPINGS[group_by]).order_by()
+
+
+def row_key(row, group_by):
+    return tuple(row[field] for field in GROUPINGS[group_by])
+
+
+def sales_rows(start, end, granularity, group_by, bus_id):
+    queryset = DailyBusRollup.objects.filter(day__range=(start, end))
+    if bus_id is not None:
+        queryset = queryset.filter(bus_id=bus_id)
+    return grouped(queryset, "day", granularity, group_by).annotate(
+        bookings=Sum("bookings"),
+        revenue=Sum("revenue"),
+        refunds=Sum("refunds"),
+        refunded=Sum("refunded"),
+    )
+
+
+def occupancy_rows(start, end, granularity, group_by, bus_id):
+    for model in (Booking, BookingHistory):
+        queryset = model.objects.filter(journey_date__range=(start, end)).exclude(status=Booking.STATUS_CANCELLED)
+        if bus_id is not None:
+            queryset = queryset.filter(bus_id=bus_id)
+        yield from grouped(queryset, "journey_date", granularity, group_by).annotate(booked=Count("pk"))
+
+
+def seat_capacity(group_by, bus_id, keys):
+    buses = Bus.objects.all()
+    if bus_id is not None:
+        buses = buses.filter(pk=bus_id)
+    if group_by == "total":
+        return {(): buses.aggregate(seats=Sum("no_of_seats"))["seats"] or 0}
+    if group_by == "bus":
+        bus_ids = {key[0] for key in keys if key[0] is not None}
+        return {(pk,): seats for pk, seats in buses.filter(pk__in=bus_ids).values_list("id", "no_of_seats")}
+    return {
+        (origin, destination): seats
+        for origin, destination, seats in (
+            buses.values_list("origin_normalized", "destination_normalized")
+            .annotate(seats=Sum("no_of_seats"))
+            .order_by()
+        )
+    }
+
+
+def build_series(start, end, granularity, group_by, bus_id=None):
+    series = {}
+
+    def entry(period, key):
+        if (period, key) not in series:
+            series[period, key] = {
+                "period": period,
+                **dict(zip(GROUPINGS[group_by], key)),
+                "bookings": 0,
+                "revenue": 0,
+                "refunds": 0,
+                "booked_seats": 0,
+            }
+        return series[period, key]
+
+    for row in sales_rows(start, end, granularity, group_by, bus_id):
+        values = entry(row["period"], row_key(row, group_by))
+        values["bookings"] += row["bookings"]
+        values["revenue"] += (row["revenue"] - row["refunded"]) / 100
+        values["refunds"] += row["refunds"]
+
+    for row in occupancy_rows(start, end, granularity, group_by, bus_id):
+        entry(row["period"], row_key(row, group_by))["booked_seats"] += row["booked"]
+
+    capacity = seat_capacity(group_by, bus_id, {key for _, key in series})
+    days = period_days(start, end, granularity)
+    for (period, key), values in series.items():
+        seats = (capacity.get(key) or 0) * days.get(period, 0)
+        values["seat_capacity"] = seats
+        values["occupancy"] = round(values["booked_seats"] / seats, 4) if seats else None
+
+    return [series[key] for key in sorted(series, key=lambda item: (item[0], tuple(str(part) for part in item[1])))]
+
+
+def analytics_cache_key(start, end, granularity, group_by, bus_id):
+    return f"analytics:{start}:{end}:{granularity}:{group_by}:{bus_id or ''}"
+
+
+def revenue_series(start, end, granularity="day", group_by="total", bus_id=None):
+    key = analytics_cache_key(start, end, granularity, group_by, bus_id)
+    series = cache.get(key)
+    if series is None:
+        series = build_series(start, end, granularity, group_by, bus_id)
+        cache.set(key, series, settings.ANALYTICS_CACHE_SECONDS)
+    return series
@@ -0,0 +1,92 @@
+from django.utils import timezone
+
+from .models import Booking, BookingHistory, Payment, PaymentHistory
+
+
+def archive_bookings(window):
+    today = timezone.localdate()
+    rows = list(
+        window.values(
+            "id",
+            "user_id",
+            "bus_id",
+            "bus__bus_name",
+            "bus__number",
+            "bus__origin",
+            "bus__destination",
+            "seat__seat_number",
+            "journey_date",
+            "status",
+            "booking_time",
+            "ticket__status",
+            "order_payment__razorpay_order_id",
+        )
+    )
+    if not rows:
+        return []
+
+    booking_ids = [row["id"] for row in rows]
+    archived = set(
+        BookingHistory.objects.filter(booking_id__in=booking_ids).values_list("booking_id", flat=True)
+    )
+    order_ids = dict(
+        Payment.objects.filter(booking_id__in=booking_ids).values_list("booking_id", "razorpay_order_id")
+    )
+    BookingHistory.objects.bulk_create(
+        [
+            BookingHistory(
+                booking_id=row["id"],
+                user_id=row["user_id"],
+                bus_id=row["bus_id"],
+                bus_name=row["bus__bus_name"],
+                bus_number=row["bus__number"],
+                origin=row["bus__origin"],
+                destination=row["bus__destination"],
+                seat_number=row["seat__seat_number"],
+                journey_date=row["journey_date"],
+                status=(
+                    Booking.STATUS_EXPIRED
+                    if row["status"] == Booking.STATUS_CONFIRMED and row["journey_date"] and row["journey_date"] < today
+                    else row["status"]
+                ),
+                booking_time=row["booking_time"],
+                ticket_status=row["ticket__status"],
+                razorpay_order_id=row["order_payment__razorpay_order_id"] or order_ids.get(row["id"]),
+            )
+            for row in rows
+            if row["id"] not in archived
+        ]
+    )
+    return booking_ids
+
+
+def archive_payments(window):
+    payments = list(window)
+    if not payments:
+        return []
+
+    payment_ids = [payment.id for payment in payments]
+    archived = set(
+        PaymentHistory.objects.filter(payment_id__in=payment_ids).values_list("payment_id", flat=True)
+    )
+    payments = [payment for payment in payments if payment.id not in archived]
+    PaymentHistory.objects.bulk_create(
+        [
+            PaymentHistory(
+                payment_id=payment.id,
+                user_id=payment.user_id,
+                bus_id=payment.bus_id,
+                razorpay_order_id=payment.razorpay_order_id,
+                razorpay_payment_id=payment.razorpay_payment_id,
+                amount=payment.amount,
+                refunded_amount=payment.refunded_amount,
+                refunded_seats=payment.refunded_seats,
+                seat_ids=payment.seat_ids,
+                journey_date=payment.journey_date,
+                status=payment.status,
+                created_at=payment.created_at,
+            )
+            for payment in payments
+        ]
+    )
+    return payment_ids
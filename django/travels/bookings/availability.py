@@ -0,0 +1,135 @@
+from django.db.models import Prefetch, prefetch_related_objects
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .models import Booking, Seat
+from .seat_bitmap_service import SeatBitmapService
+from .seat_hold_service import SeatHoldService
+
+
+def parse_journey_date(value):
+    if not value:
+        return None
+
+    try:
+        return parse_date(str(value))
+    except ValueError:
+        return None
+
+
+def journey_date_from_request(request):
+    params = getattr(request, "query_params", None) or getattr(request, "GET", None)
+    return parse_journey_date(params.get("date") if params else None)
+
+
+def seats_prefetch():
+    return Prefetch("seats", queryset=Seat.objects.order_by("id"))
+
+
+class SeatAvailability:
+    def __init__(self, journey_date=None):
+        self.journey_date = journey_date
+        self.bus_ids = set()
+        self.booked_seat_ids = set()
+        self.held_seat_ids = set()
+
+    @classmethod
+    def for_buses(cls, buses, journey_date=None):
+        availability = cls(journey_date)
+        availability.load(buses)
+        return availability
+
+    def load(self, buses):
+        buses = [bus for bus in buses if bus.id not in self.bus_ids]
+        if not buses:
+            return self
+
+        prefetch_related_objects(buses, seats_prefetch())
+        bus_ids = [bus.id for bus in buses]
+
+        if self.journey_date:
+            self._load_booked_seats(buses)
+            self.held_seat_ids.update(
+                SeatHoldService.held_seat_ids(
+                    [seat.id for bus in buses for seat in bus.seats.all()],
+                    self.journey_date,
+                )
+            )
+
+        self.bus_ids.update(bus_ids)
+        return self
+
+    def _load_booked_seats(self, buses):
+        bitmaps = SeatBitmapService.get_many([bus.id for bus in buses], self.journey_date)
+        missing = []
+
+        for bus in buses:
+            seat_ids = [seat.id for seat in bus.seats.all()]
+            if bus.id in bitmaps:
+                self.booked_seat_ids.update(SeatBitmapService.decode(bitmaps[bus.id], seat_ids))
+            else:
+                missing.append(bus)
+
+        if not missing:
+            return
+
+        booked = self._booked_seat_ids(missing)
+        self.booked_seat_ids.update(booked)
+
+        stored = SeatBitmapService.store_many(
+            {
+                bus.id: SeatBitmapService.encode([seat.id for seat in bus.seats.all()], booked)
+                for bus in missing
+            },
+            self.journey_date,
+        )
+        if not stored:
+            return
+
+        # Bookings committed between the read and the store found no bitmap to patch.
+        current = self._booked_seat_ids(missing)
+        changed = booked ^ current
+        if not changed:
+            return
+
+        self.booked_seat_ids.difference_update(booked - current)
+        self.booked_seat_ids.update(current)
+        for bus in missing:
+            for offset, seat in enumerate(bus.seats.all()):
+                if seat.id in changed:
+                    SeatBitmapService.set_offset(bus.id, offset, self.journey_date, seat.id in current)
+
+    def _booked_seat_ids(self, buses):
+        return set(
+            Booking.objects.filter(
+                bus_id__in=[bus.id for bus in buses],
+                journey_date=self.journey_date,
+            ).values_list("seat_id", flat=True)
+        )
+
+    def covers(self, bus):
+        return bus.id in self.bus_ids
+
+    def is_held(self, seat, now=None):
+        if seat.id in self.held_seat_ids:
+            return True
+        if not seat.is_held or not seat.hold_expires_at:
+            return False
+        if seat.hold_journey_date and self.journey_date and seat.hold_journey_date != self.journey_date:
+            return False
+        return seat.hold_expires_at > (now or timezone.now())
+
+    def seats_for(self, bus):
+        if not self.covers(bus):
+            self.load([bus])
+
+        now = timezone.now()
+        return [
+            {
+                "id": seat.id,
+                "seat_number": seat.seat_number,
+                "is_booked": seat.id in self.booked_seat_ids,
+                "is_held": self.is_held(seat, now),
+            }
+            for seat in bus.seats.all()
+        ]
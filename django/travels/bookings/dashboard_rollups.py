@@ -0,0 +1,72 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, Sum
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import Bus, DailyBusRollup
+
+
+SUMMARY_CACHE_KEY = "admin-dashboard-summary"
+
+
+def add_to_rollup(bus_id, bookings=0, revenue=0, refunds=0, refunded=0, day=None):
+    day = day or timezone.localdate()
+    DailyBusRollup.objects.bulk_create([DailyBusRollup(day=day, bus_id=bus_id)], ignore_conflicts=True)
+    DailyBusRollup.objects.filter(day=day, bus_id=bus_id).update(
+        bookings=Greatest(F("bookings") + bookings, 0),
+        revenue=F("revenue") + revenue,
+        refunds=F("refunds") + refunds,
+        refunded=F("refunded") + refunded,
+    )
+
+
+def record_sale(payment, bookings):
+    paid_on = timezone.localdate(payment.created_at)
+    if paid_on == timezone.localdate():
+        add_to_rollup(payment.bus_id, bookings=bookings, revenue=payment.amount)
+    else:
+        add_to_rollup(payment.bus_id, bookings=bookings)
+        add_to_rollup(payment.bus_id, revenue=payment.amount, day=paid_on)
+
+
+def record_refund(payment, amount):
+    add_to_rollup(payment.bus_id, refunds=1, refunded=amount, day=timezone.localdate(payment.created_at))
+
+
+def record_cancellation(booking, bus_id=None):
+    add_to_rollup(bus_id or booking.bus_id, bookings=-1, day=timezone.localdate(booking.booking_time))
+
+
+def record_bus_change(booking, previous_bus_id):
+    if previous_bus_id != booking.bus_id:
+        record_cancellation(booking, bus_id=previous_bus_id)
+        add_to_rollup(booking.bus_id, bookings=1, day=timezone.localdate(booking.booking_time))
+
+
+def rollup_totals(queryset):
+    totals = queryset.aggregate(
+        bookings=Sum("bookings"),
+        revenue=Sum("revenue"),
+        refunds=Sum("refunds"),
+        refunded=Sum("refunded"),
+    )
+    totals = {key: value or 0 for key, value in totals.items()}
+    return {
+        "bookings": totals["bookings"],
+        "revenue": (totals["revenue"] - totals["refunded"]) / 100,
+        "refunds": totals["refunds"],
+        "refunded": totals["refunded"] / 100,
+    }
+
+
+def dashboard_summary():
+    summary = cache.get(SUMMARY_CACHE_KEY)
+    if summary is None:
+        summary = {
+            "totals": rollup_totals(DailyBusRollup.objects.all()),
+            "today": rollup_totals(DailyBusRollup.objects.filter(day=timezone.localdate())),
+            "active_buses": Bus.objects.filter(is_active=True).count(),
+        }
+        cache.set(SUMMARY_CACHE_KEY, summary, settings.DASHBOARD_SUMMARY_CACHE_SECONDS)
+    return summary
@@ -0,0 +1,188 @@
+import csv
+import json
+from itertools import chain
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Booking, BookingHistory, Payment, PaymentHistory
+
+
+BOOKING_COLUMNS = [
+    "id",
+    "username",
+    "bus_id",
+    "bus_number",
+    "bus_name",
+    "origin",
+    "destination",
+    "seat_number",
+    "journey_date",
+    "status",
+    "booking_time",
+    "razorpay_order_id",
+    "archived",
+]
+
+PAYMENT_COLUMNS = [
+    "id",
+    "username",
+    "razorpay_order_id",
+    "razorpay_payment_id",
+    "amount",
+    "seat_ids",
+    "journey_date",
+    "status",
+    "created_at",
+    "archived",
+]
+
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def filter_rows(queryset, date_field, filters):
+    if filters.get("start"):
+        queryset = queryset.filter(**{f"{date_field}__gte": filters["start"]})
+    if filters.get("end"):
+        queryset = queryset.filter(**{f"{date_field}__lte": filters["end"]})
+    if filters.get("status"):
+        queryset = queryset.filter(status=filters["status"])
+    return queryset
+
+
+def booking_rows(filters):
+    live = filter_rows(Booking.objects.all(), "journey_date", filters)
+    archived = filter_rows(BookingHistory.objects.all(), "journey_date", filters)
+    if filters.get("bus_id") is not None:
+        live = live.filter(bus_id=filters["bus_id"])
+        archived = archived.filter(bus_id=filters["bus_id"])
+
+    chunk_size = settings.EXPORT_CHUNK_SIZE
+    live_rows = (
+        live.order_by("id")
+        .values_list(
+            "id",
+            "user__username",
+            "bus_id",
+            "bus__number",
+            "bus__bus_name",
+            "bus__origin",
+            "bus__destination",
+            "seat__seat_number",
+            "journey_date",
+            "status",
+            "booking_time",
+            "order_payment__razorpay_order_id",
+        )
+        .iterator(chunk_size=chunk_size)
+    )
+    archived_rows = (
+        archived.order_by("booking_id")
+        .values_list(
+            "booking_id",
+            "user__username",
+            "bus_id",
+            "bus_number",
+            "bus_name",
+            "origin",
+            "destination",
+            "seat_number",
+            "journey_date",
+            "status",
+            "booking_time",
+            "razorpay_order_id",
+        )
+        .iterator(chunk_size=chunk_size)
+    )
+    return chain(
+        (row + (False,) for row in live_rows),
+        (row + (True,) for row in archived_rows),
+    )
+
+
+def payment_rows(filters):
+    live = filter_rows(Payment.objects.all(), "created_at__date", filters)
+    archived = filter_rows(PaymentHistory.objects.all(), "created_at__date", filters)
+    if filters.get("bus_id") is not None:
+        live = live.filter(booking__bus_id=filters["bus_id"])
+        archived = archived.none()
+
+    fields = [
+        "user__username",
+        "razorpay_order_id",
+        "razorpay_payment_id",
+        "amount",
+        "seat_ids",
+        "journey_date",
+        "status",
+        "created_at",
+    ]
+    chunk_size = settings.EXPORT_CHUNK_SIZE
+    return chain(
+        (row + (False,) for row in live.order_by("id").values_list("id", *fields).iterator(chunk_size=chunk_size)),
+        (
+            row + (True,)
+            for row in archived.order_by("payment_id")
+            .values_list("payment_id", *fields)
+            .iterator(chunk_size=chunk_size)
+        ),
+    )
+
+
+EXPORTS = {
+    "bookings": (BOOKING_COLUMNS, booking_rows),
+    "payments": (PAYMENT_COLUMNS, payment_rows),
+}
+
+
+def csv_lines(columns, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def ndjson_lines(columns, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(columns, row)), cls=DjangoJSONEncoder) + "\n"
+
+
+def buffered(lines, size):
+    buffer = []
+    length = 0
+    for line in lines:
+        buffer.append(line)
+        length += len(line)
+        if length >= size:
+            yield "".join(buffer)
+            buffer = []
+            length = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def export_stream(dataset, file_format, filters):
+    columns, rows = EXPORTS[dataset]
+    lines = csv_lines if file_format == "csv" else ndjson_lines
+    return buffered(lines(columns, rows(filters)), settings.EXPORT_BUFFER_BYTES)
+
+
+async def aiter_chunks(chunks):
+    next_chunk = sync_to_async(next, thread_sensitive=True)
+    try:
+        while True:
+            chunk = await next_chunk(chunks, None)
+            if chunk is None:
+                return
+            yield chunk
+    finally:
+        await sync_to_async(chunks.close, thread_sensitive=True)()
@@ -0,0 +1,113 @@
+import csv
+import io
+import json
+import logging
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import Bus
+from .seat_provisioning import bulk_provision_seats
+from .serializers import FleetImportSerializer
+from .utils import Util
+
+
+logger = logging.getLogger(__name__)
+
+
+class FleetImportError(ValueError):
+    pass
+
+
+def parse_fleet(content, file_format):
+    if isinstance(content, bytes):
+        try:
+            content = content.decode("utf-8-sig")
+        except UnicodeDecodeError:
+            raise FleetImportError("File must be UTF-8 encoded")
+
+    if file_format == "csv":
+        try:
+            return [
+                {key.strip(): (value or "").strip() for key, value in row.items() if key}
+                for row in csv.DictReader(io.StringIO(content))
+            ]
+        except csv.Error as exc:
+            raise FleetImportError(f"Invalid CSV: {exc}")
+
+    if file_format == "json":
+        try:
+            rows = json.loads(content)
+        except ValueError as exc:
+            raise FleetImportError(f"Invalid JSON: {exc}")
+        if isinstance(rows, dict):
+            rows = rows.get("buses")
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise FleetImportError("JSON must be a list of bus objects")
+        return rows
+
+    raise FleetImportError("Format must be csv or json")
+
+
+def chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def validate_fleet(rows, batch_size):
+    errors = []
+    buses = []
+    seen_numbers = {}
+
+    for offset, chunk in enumerate(chunks(rows, batch_size)):
+        numbers = {str(row.get("number", "")).strip() for row in chunk}
+        taken = set(Bus.objects.filter(number__in=numbers).values_list("number", flat=True))
+
+        for index, row in enumerate(chunk, start=offset * batch_size + 1):
+            serializer = FleetImportSerializer(data=row)
+            if not serializer.is_valid():
+                errors.append({"row": index, "errors": serializer.errors})
+                continue
+
+            number = serializer.validated_data["number"]
+            if number in taken:
+                errors.append({"row": index, "errors": {"number": ["bus with this number already exists."]}})
+                continue
+            if number in seen_numbers:
+                errors.append({"row": index, "errors": {"number": [f"Duplicate of row {seen_numbers[number]}."]}})
+                continue
+
+            seen_numbers[number] = index
+            bus = Bus(**serializer.validated_data)
+            bus.normalize_search_fields()
+            buses.append(bus)
+
+    return buses, errors
+
+
+def import_fleet(rows, batch_size=None, dry_run=False):
+    batch_size = max(batch_size or settings.FLEET_IMPORT_BATCH_SIZE, 1)
+    buses, errors = validate_fleet(rows, batch_size)
+    result = {"rows": len(rows), "created": 0, "seats": 0, "errors": errors}
+    if dry_run or not buses:
+        return result
+
+    routes = {}
+    with transaction.atomic():
+        for chunk in chunks(buses, batch_size):
+            created = Bus.objects.bulk_create(chunk)
+            result["seats"] += bulk_provision_seats(created)
+            result["created"] += len(created)
+            for bus in created:
+                routes.setdefault((bus.origin_normalized, bus.destination_normalized), bus.id)
+
+        for bus_id in routes.values():
+            Util.queue_route_map_prerender(bus_id)
+
+    logger.info(
+        "Fleet import created %s bus(es) and %s seat(s), %s row(s) rejected",
+        result["created"],
+        result["seats"],
+        len(errors),
+    )
+    return result
@@ -0,0 +1,242 @@
+import asyncio
+import logging
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import httpx
+import requests
+from django.conf import settings
+from django.db import connections
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_UPSTREAM_CONFIG = {
+    "timeout": 10,
+    "pool_connections": 4,
+    "pool_maxsize": 10,
+    "retries": 2,
+    "backoff_factor": 0.3,
+}
+
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+RETRY_METHODS = frozenset(["GET", "HEAD"])
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+_async_clients = weakref.WeakKeyDictionary()
+_metrics = {}
+_metrics_lock = threading.Lock()
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class Deadline:
+    def __init__(self, seconds):
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self):
+        return max(self.expires_at - time.monotonic(), 0)
+
+    def timeout(self, default):
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise requests.Timeout("Outbound request deadline exceeded")
+        return min(default, remaining)
+
+    def result(self, future):
+        try:
+            return future.result(timeout=self.remaining())
+        except FutureTimeoutError:
+            future.cancel()
+            raise requests.Timeout("Outbound request deadline exceeded")
+
+
+def upstream_config(upstream):
+    config = dict(DEFAULT_UPSTREAM_CONFIG)
+    config.update(getattr(settings, "OUTBOUND_HTTP", {}).get(upstream, {}))
+    return config
+
+
+def build_session(upstream, retries=True):
+    config = upstream_config(upstream)
+    retry = Retry(
+        total=config["retries"] if retries else 0,
+        connect=config["retries"] if retries else 0,
+        read=config["retries"] if retries else 0,
+        backoff_factor=config["backoff_factor"],
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=RETRY_METHODS,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=config["pool_connections"],
+        pool_maxsize=config["pool_maxsize"],
+        max_retries=retry,
+    )
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["User-Agent"] = "TravelsApp/1.0"
+    return session
+
+
+def get_session(upstream, retries=True):
+    key = (upstream, retries)
+    session = _sessions.get(key)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(key)
+            if session is None:
+                session = build_session(upstream, retries=retries)
+                _sessions[key] = session
+    return session
+
+
+def reset_sessions():
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+def build_async_client(upstream):
+    config = upstream_config(upstream)
+    return httpx.AsyncClient(
+        timeout=config["timeout"],
+        limits=httpx.Limits(max_connections=None, max_keepalive_connections=config["pool_maxsize"]),
+        transport=httpx.AsyncHTTPTransport(retries=config["retries"]),
+        headers={"User-Agent": "TravelsApp/1.0"},
+    )
+
+
+def get_async_client(upstream):
+    clients = _async_clients.setdefault(asyncio.get_running_loop(), {})
+    client = clients.get(upstream)
+    if client is None or client.is_closed:
+        client = build_async_client(upstream)
+        clients[upstream] = client
+    return client
+
+
+async def close_async_clients():
+    clients = _async_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.aclose()
+
+
+def record_latency(upstream, elapsed_ms, failed):
+    with _metrics_lock:
+        stats = _metrics.setdefault(
+            upstream,
+            {"requests": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0},
+        )
+        stats["requests"] += 1
+        stats["errors"] += int(failed)
+        stats["total_ms"] += elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+
+
+def upstream_metrics():
+    with _metrics_lock:
+        return {
+            upstream: {
+                **stats,
+                "avg_ms": stats["total_ms"] / stats["requests"] if stats["requests"] else 0.0,
+            }
+            for upstream, stats in _metrics.items()
+        }
+
+
+def reset_metrics():
+    with _metrics_lock:
+        _metrics.clear()
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, "OUTBOUND_HTTP_MAX_WORKERS", 8),
+                    thread_name_prefix="outbound-http",
+                )
+    return _executor
+
+
+def _run_and_release_connections(fn, args, kwargs):
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        connections.close_all()
+
+
+def submit(fn, *args, **kwargs):
+    return get_executor().submit(_run_and_release_connections, fn, args, kwargs)
+
+
+def wait(future, deadline=None):
+    if deadline is None:
+        return future.result()
+    return deadline.result(future)
+
+
+def send(session, upstream, method, url, **kwargs):
+    started = time.perf_counter()
+    failed = True
+
+    try:
+        response = session.request(method, url, **kwargs)
+        failed = response.status_code >= 500
+        return response
+    finally:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        record_latency(upstream, elapsed_ms, failed)
+        logger.debug("Outbound %s %s %s took %.1fms", upstream, method, url.split("?")[0], elapsed_ms)
+
+
+def request(upstream, method, url, deadline=None, **kwargs):
+    config = upstream_config(upstream)
+    timeout = kwargs.pop("timeout", config["timeout"])
+    if deadline is None:
+        return send(get_session(upstream), upstream, method, url, timeout=timeout, **kwargs)
+
+    session = get_session(upstream, retries=False)
+    attempts = config["retries"] + 1 if method.upper() in RETRY_METHODS else 1
+    for attempt in range(attempts):
+        last_attempt = attempt == attempts - 1
+        try:
+            response = send(session, upstream, method, url, timeout=deadline.timeout(timeout), **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if last_attempt or deadline.remaining() <= 0:
+                raise
+        else:
+            if last_attempt or response.status_code not in RETRY_STATUSES or deadline.remaining() <= 0:
+                return response
+            response.close()
+
+        backoff = config["backoff_factor"] * (2 ** attempt)
+        time.sleep(min(backoff, deadline.remaining()))
+
+
+async def arequest(upstream, method, url, **kwargs):
+    kwargs.setdefault("timeout", upstream_config(upstream)["timeout"])
+    started = time.perf_counter()
+    failed = True
+
+    try:
+        response = await get_async_client(upstream).request(method, url, **kwargs)
+        failed = response.status_code >= 500
+        return response
+    finally:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        record_latency(upstream, elapsed_ms, failed)
+        logger.debug("Outbound %s %s %s took %.1fms", upstream, method, url.split("?")[0], elapsed_ms)
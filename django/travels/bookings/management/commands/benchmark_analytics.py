@@ -0,0 +1,133 @@
+import random
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from datetime import time as clock
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from bookings.analytics import build_series, period_start, revenue_series
+from bookings.management.commands.benchmark_route_search import CITIES
+from bookings.models import Booking, Bus, DailyBusRollup, Seat
+
+
+class Command(BaseCommand):
+    help = "Compare a Python-loop revenue/occupancy report with the grouped analytics queries on synthetic bookings."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--bookings", type=int, default=5_000_000)
+        parser.add_argument("--buses", type=int, default=500)
+        parser.add_argument("--seats", type=int, default=40)
+        parser.add_argument("--granularity", default="week", choices=["day", "week", "month"])
+        parser.add_argument("--group-by", default="route", choices=["total", "bus", "route"])
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            started = time.perf_counter()
+            start, end = self.seed(options["bookings"], options["buses"], options["seats"])
+            seed_seconds = time.perf_counter() - started
+            if connection.vendor == "postgresql":
+                with connection.cursor() as cursor:
+                    cursor.execute("ANALYZE bookings_booking")
+                    cursor.execute("ANALYZE bookings_dailybusrollup")
+
+            granularity = options["granularity"]
+            group_by = options["group_by"]
+            loop_ms, loop_rows = self.measure(lambda: self.python_loop(start, end, granularity))
+            grouped_ms, grouped_rows = self.measure(lambda: build_series(start, end, granularity, group_by))
+            revenue_series(start, end, granularity, group_by)
+            cached_ms, _ = self.measure(lambda: revenue_series(start, end, granularity, group_by))
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(
+            f"Synthetic bookings: {options['bookings']} on {options['buses']} buses "
+            f"{start}..{end} ({connection.vendor}, seeded in {seed_seconds:.1f}s)"
+        )
+        self.stdout.write(f"python loop: {loop_ms:.0f} ms, {loop_rows} bucket(s)")
+        self.stdout.write(f"grouped aggregates: {grouped_ms:.0f} ms, {grouped_rows} bucket(s)")
+        self.stdout.write(f"cached: {cached_ms:.3f} ms")
+        if grouped_ms:
+            self.stdout.write(self.style.SUCCESS(f"Speed-up: {loop_ms / grouped_ms:.1f}x"))
+
+    def seed(self, count, bus_count, seat_count):
+        rng = random.Random(42)
+        user, _ = User.objects.get_or_create(username="analytics-benchmark")
+        buses = []
+        for index in range(bus_count):
+            origin, destination = rng.sample(CITIES, 2)
+            bus = Bus(
+                bus_name=f"Analytics {index}",
+                number=f"ANL-{index}",
+                origin=origin,
+                destination=destination,
+                features="AC",
+                start_time=clock(8, 0),
+                reach_time=clock(14, 0),
+                no_of_seats=seat_count,
+                price=500,
+            )
+            bus.normalize_search_fields()
+            buses.append(bus)
+        buses = Bus.objects.bulk_create(buses, batch_size=5000)
+        Seat.objects.bulk_create(
+            [Seat(bus=bus, seat_number=f"S{number}") for bus in buses for number in range(1, seat_count + 1)],
+            batch_size=5000,
+        )
+        seats = defaultdict(list)
+        for seat_id, bus_id in Seat.objects.filter(bus__in=buses).values_list("id", "bus_id"):
+            seats[bus_id].append(seat_id)
+
+        start = date(2030, 1, 1)
+        rollups = defaultdict(lambda: [0, 0])
+        batch = []
+        created = 0
+        day = start
+        while created < count:
+            for bus in buses:
+                for seat_id in seats[bus.id]:
+                    if created >= count:
+                        break
+                    if rng.random() < 0.3:
+                        continue
+                    batch.append(Booking(user=user, bus_id=bus.id, seat_id=seat_id, journey_date=day))
+                    sale_day = day - timedelta(days=rng.randrange(30))
+                    rollups[sale_day, bus.id][0] += 1
+                    rollups[sale_day, bus.id][1] += 50000
+                    created += 1
+                if len(batch) >= 50000:
+                    Booking.objects.bulk_create(batch, batch_size=5000)
+                    batch = []
+            day += timedelta(days=1)
+        Booking.objects.bulk_create(batch, batch_size=5000)
+        DailyBusRollup.objects.bulk_create(
+            [
+                DailyBusRollup(day=sale_day, bus_id=bus_id, bookings=bookings, revenue=revenue)
+                for (sale_day, bus_id), (bookings, revenue) in rollups.items()
+            ],
+            batch_size=5000,
+        )
+        return start - timedelta(days=29), day - timedelta(days=1)
+
+    def python_loop(self, start, end, granularity):
+        buckets = defaultdict(lambda: {"booked_seats": 0, "revenue": 0})
+        for booking in (
+            Booking.objects.filter(journey_date__range=(start, end))
+            .select_related("bus")
+            .iterator(chunk_size=5000)
+        ):
+            bucket = buckets[
+                period_start(booking.journey_date, granularity),
+                booking.bus.origin_normalized,
+                booking.bus.destination_normalized,
+            ]
+            bucket["booked_seats"] += 1
+            bucket["revenue"] += booking.bus.price
+        return buckets
+
+    def measure(self, report):
+        started = time.perf_counter()
+        rows = len(report())
+        return (time.perf_counter() - started) * 1000, rows
@@ -0,0 +1,83 @@
+import random
+import time
+from datetime import time as clock
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from bookings.models import Bus
+from bookings.route_search import filter_route
+
+
+CITIES = [
+    "Delhi", "Mumbai", "Jaipur", "Pune", "Chennai", "Kolkata", "Bengaluru", "Hyderabad",
+    "Ahmedabad", "Lucknow", "Chandigarh", "Indore", "Bhopal", "Nagpur", "Surat", "Patna",
+    "Kochi", "Goa", "Udaipur", "Agra", "Varanasi", "Amritsar", "Dehradun", "Mysuru",
+]
+
+
+class Command(BaseCommand):
+    help = "Compare legacy icontains route search with the normalized route search on a synthetic fleet."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--buses", type=int, default=100000)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--origin", default="jaip")
+        parser.add_argument("--destination", default="Delhi")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.seed(options["buses"])
+            if connection.vendor == "postgresql":
+                with connection.cursor() as cursor:
+                    cursor.execute("ANALYZE bookings_bus")
+
+            legacy = Bus.objects.filter(
+                is_active=True,
+                origin__icontains=options["origin"],
+                destination__icontains=options["destination"],
+            )
+            normalized = filter_route(
+                Bus.objects.filter(is_active=True),
+                origin=options["origin"],
+                destination=options["destination"],
+            )
+
+            legacy_ms, legacy_rows = self.measure(legacy, options["repeat"])
+            normalized_ms, normalized_rows = self.measure(normalized, options["repeat"])
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"Synthetic buses: {options['buses']} ({connection.vendor})")
+        self.stdout.write(f"icontains search: {legacy_ms:.2f} ms/query, {legacy_rows} row(s)")
+        self.stdout.write(f"normalized search: {normalized_ms:.2f} ms/query, {normalized_rows} row(s)")
+        if normalized_ms:
+            self.stdout.write(self.style.SUCCESS(f"Speed-up: {legacy_ms / normalized_ms:.1f}x"))
+
+    def seed(self, count):
+        rng = random.Random(42)
+        buses = []
+        for index in range(count):
+            origin, destination = rng.sample(CITIES, 2)
+            bus = Bus(
+                bus_name=f"Benchmark {index}",
+                number=f"BENCH-{index}",
+                origin=origin,
+                destination=destination,
+                features="AC",
+                start_time=clock(8, 0),
+                reach_time=clock(14, 0),
+                no_of_seats=40,
+                price=500,
+            )
+            bus.normalize_search_fields()
+            buses.append(bus)
+        Bus.objects.bulk_create(buses, batch_size=5000)
+
+    def measure(self, queryset, repeat):
+        rows = 0
+        started = time.perf_counter()
+        for _ in range(max(repeat, 1)):
+            rows = len(list(queryset.values_list("id", flat=True)))
+        elapsed = time.perf_counter() - started
+        return elapsed * 1000 / max(repeat, 1), rows
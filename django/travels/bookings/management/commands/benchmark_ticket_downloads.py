@@ -0,0 +1,72 @@
+import tempfile
+import time
+from datetime import time as clock
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from bookings.models import Booking, Bus, Ticket
+from bookings.ticket_service import TicketArtifactStore, generate_ticket_pdf_bytes, ticket_qr_image
+
+
+class Command(BaseCommand):
+    help = "Measure ticket downloads/sec with per-request rendering versus the ticket artifact store."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--downloads", type=int, default=200)
+
+    def handle(self, *args, **options):
+        downloads = max(options["downloads"], 1)
+
+        with tempfile.TemporaryDirectory() as artifact_root, override_settings(
+            TICKET_ARTIFACT_STORAGE="django.core.files.storage.FileSystemStorage",
+            TICKET_ARTIFACT_STORAGE_OPTIONS={"location": artifact_root},
+        ):
+            with transaction.atomic():
+                ticket = self.create_ticket()
+
+                render_rate = self.measure(lambda: self.render(ticket), downloads)
+                TicketArtifactStore.get_or_render(ticket)
+                cached_rate = self.measure(lambda: TicketArtifactStore.get_or_render(ticket), downloads)
+
+                transaction.set_rollback(True)
+
+        self.stdout.write(f"render per download: {render_rate:.1f} downloads/sec")
+        self.stdout.write(f"artifact store:      {cached_rate:.1f} downloads/sec")
+        self.stdout.write(self.style.SUCCESS(f"Speed-up: {cached_rate / render_rate:.1f}x"))
+
+    def create_ticket(self):
+        user = User.objects.create_user(username="ticket-benchmark", password=None)
+        bus = Bus.objects.create(
+            bus_name="Benchmark Express",
+            number="TICKET-BENCH",
+            origin="Delhi",
+            destination="Jaipur",
+            features="AC",
+            start_time=clock(8, 0),
+            reach_time=clock(14, 0),
+            no_of_seats=1,
+            price=500,
+        )
+        booking = Booking.objects.create(
+            user=user,
+            bus=bus,
+            seat=bus.seats.get(),
+            journey_date=timezone.localdate(),
+        )
+        return Ticket.objects.select_related("booking__user", "booking__bus", "booking__seat").get(
+            id=Ticket.objects.create(booking=booking, user=user).id
+        )
+
+    def render(self, ticket):
+        ticket_qr_image.cache_clear()
+        return generate_ticket_pdf_bytes(ticket)
+
+    def measure(self, download, count):
+        started = time.perf_counter()
+        for _ in range(count):
+            download()
+        return count / (time.perf_counter() - started)
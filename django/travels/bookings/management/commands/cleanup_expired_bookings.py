@@ -1,19 +1,57 @@
-from datetime import timedelta
+from argparse import BooleanOptionalAction
 
+from django.conf import settings
 from django.core.management.base import BaseCommand
-from django.utils import timezone
 
-from bookings.models import Booking
+from bookings.sweepers import stale_booking_cutoff, stale_bookings, sweep_stale_bookings
 
 
 class Command(BaseCommand):
     help = "Delete bookings whose journey date is older than 24 hours (before yesterday)."
 
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=settings.SWEEPER_BATCH_SIZE)
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0,
+            help="Seconds to pause between batches so replicas can catch up.",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Only count the bookings that would be deleted.")
+        parser.add_argument(
+            "--archive",
+            action=BooleanOptionalAction,
+            default=settings.STALE_BOOKING_ARCHIVE,
+            help="Copy each batch into the booking history table before deleting it.",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continue the last interrupted run from its last committed batch.",
+        )
+
     def handle(self, *args, **options):
-        cutoff_date = timezone.localdate() - timedelta(days=1)
-        deleted_count, _ = Booking.objects.filter(journey_date__lt=cutoff_date).delete()
+        cutoff_date = stale_booking_cutoff()
+
+        if options["dry_run"]:
+            count = stale_bookings().count()
+            batches = -(-count // max(options["batch_size"], 1))
+            self.stdout.write(
+                f"{count} stale booking record(s) with journey_date < {cutoff_date} "
+                f"would be deleted in {batches} batch(es)."
+            )
+            return
+
+        run = sweep_stale_bookings(
+            batch_size=options["batch_size"],
+            pause_seconds=options["sleep"],
+            archive=options["archive"],
+            resume=options["resume"],
+        )
+        action = "Archived and deleted" if options["archive"] else "Deleted"
         self.stdout.write(
             self.style.SUCCESS(
-                f"Deleted {deleted_count} stale booking record(s) with journey_date < {cutoff_date}."
+                f"{action} {run.rows} stale booking record(s) with journey_date < {cutoff_date} "
+                f"in {run.batches} batch(es)."
             )
         )
@@ -0,0 +1,39 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from bookings.fleet_import import FleetImportError, import_fleet, parse_fleet
+
+
+class Command(BaseCommand):
+    help = "Bulk-import buses and their seats from a CSV or JSON file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--batch-size", type=int, default=settings.FLEET_IMPORT_BATCH_SIZE)
+        parser.add_argument("--dry-run", action="store_true", help="Validate the file without creating anything.")
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        try:
+            rows = parse_fleet(path.read_bytes(), path.suffix.lstrip(".").lower())
+        except (OSError, FleetImportError) as exc:
+            raise CommandError(str(exc))
+
+        result = import_fleet(rows, batch_size=options["batch_size"], dry_run=options["dry_run"])
+
+        for error in result["errors"]:
+            self.stderr.write(f"row {error['row']}: {error['errors']}")
+
+        if options["dry_run"]:
+            valid = result["rows"] - len(result["errors"])
+            self.stdout.write(f"{valid} of {result['rows']} row(s) are valid.")
+            return
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {result['created']} bus(es) and {result['seats']} seat(s); "
+                f"{len(result['errors'])} row(s) rejected."
+            )
+        )
@@ -0,0 +1,134 @@
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from bookings import http_client
+from bookings.route_map_cache import get_route_map, get_route_map_async
+from bookings.tomtom_service import clear_geocode_memory_cache
+
+
+GEOCODE_PAYLOAD = json.dumps(
+    {"results": [{"address": {"freeformAddress": "Stub City"}, "position": {"lat": 26.9, "lon": 75.8}}]}
+).encode()
+ROUTE_PAYLOAD = json.dumps(
+    {
+        "routes": [
+            {
+                "summary": {"lengthInMeters": 280000},
+                "legs": [
+                    {
+                        "points": [
+                            {"latitude": 26.9, "longitude": 75.8},
+                            {"latitude": 28.6, "longitude": 77.2},
+                        ]
+                    }
+                ],
+            }
+        ]
+    }
+).encode()
+MAP_PAYLOAD = b"\xff\xd8" + b"\x00" * 20000 + b"\xff\xd9"
+
+
+def stub_handler(latency):
+    class StubTomTomHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            time.sleep(latency)
+            if self.path.startswith("/search/"):
+                body, content_type = GEOCODE_PAYLOAD, "application/json"
+            elif self.path.startswith("/routing/"):
+                body, content_type = ROUTE_PAYLOAD, "application/json"
+            else:
+                body, content_type = MAP_PAYLOAD, "image/jpeg"
+
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubTomTomHandler
+
+
+class StubTomTomServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass
+
+
+class Command(BaseCommand):
+    help = "Load-test sync versus async route map rendering against a local stub TomTom server."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=50)
+        parser.add_argument("--latency-ms", type=int, default=100)
+
+    def handle(self, *args, **options):
+        total = max(options["requests"], 1)
+        concurrency = max(options["concurrency"], 1)
+
+        server = StubTomTomServer(("127.0.0.1", 0), stub_handler(options["latency_ms"] / 1000))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        try:
+            with override_settings(
+                TOMTOM_API_KEY="loadtest",
+                TOMTOM_BASE_URL=f"http://127.0.0.1:{server.server_port}",
+                CACHES={
+                    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+                    "route_maps": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+                },
+            ):
+                clear_geocode_memory_cache()
+                get_route_map("Jaipur", "Delhi", 900, 360)
+
+                sync_rate = self.measure_sync(total, concurrency)
+                async_rate = self.measure_async(total, concurrency)
+        finally:
+            server.shutdown()
+            server.server_close()
+            http_client.reset_sessions()
+            clear_geocode_memory_cache()
+
+        self.stdout.write(
+            f"{total} route maps, concurrency {concurrency}, upstream latency {options['latency_ms']}ms"
+        )
+        self.stdout.write(f"sync thread pool: {sync_rate:.1f} req/sec")
+        self.stdout.write(f"async event loop: {async_rate:.1f} req/sec")
+        self.stdout.write(self.style.SUCCESS(f"Speed-up: {async_rate / sync_rate:.1f}x"))
+
+    def measure_sync(self, total, concurrency):
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(lambda _: get_route_map("Jaipur", "Delhi", 900, 360), range(total)))
+        return total / (time.perf_counter() - started)
+
+    def measure_async(self, total, concurrency):
+        async def run():
+            limit = asyncio.Semaphore(concurrency)
+
+            async def render():
+                async with limit:
+                    await get_route_map_async("Jaipur", "Delhi", 900, 360)
+
+            await render()
+            started = time.perf_counter()
+            await asyncio.gather(*(render() for _ in range(total)))
+            elapsed = time.perf_counter() - started
+            await http_client.close_async_clients()
+            return total / elapsed
+
+        return asyncio.run(run())
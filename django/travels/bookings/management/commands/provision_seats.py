@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from bookings.models import Bus
+from bookings.seat_provisioning import bulk_provision_seats
+
+
+class Command(BaseCommand):
+    help = "Bulk-create missing seats for every bus whose seat map is incomplete (e.g. after a fleet import)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of buses to provision per transaction.",
+        )
+        parser.add_argument(
+            "--bus-id",
+            type=int,
+            action="append",
+            dest="bus_ids",
+            help="Only provision the given bus id (repeatable).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(options["batch_size"], 1)
+        queryset = Bus.objects.order_by("id")
+        if options["bus_ids"]:
+            queryset = queryset.filter(id__in=options["bus_ids"])
+
+        total_buses = 0
+        total_seats = 0
+        last_id = 0
+
+        while True:
+            buses = list(queryset.filter(id__gt=last_id)[:batch_size])
+            if not buses:
+                break
+
+            with transaction.atomic():
+                total_seats += bulk_provision_seats(buses)
+
+            total_buses += len(buses)
+            last_id = buses[-1].id
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Provisioned {total_seats} seat(s) across {total_buses} bus(es)."
+            )
+        )
@@ -0,0 +1,69 @@
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import BigIntegerField, Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, TruncDate
+
+from bookings.dashboard_rollups import SUMMARY_CACHE_KEY
+from bookings.models import Booking, BookingHistory, DailyBusRollup, Payment, PaymentHistory
+
+
+PAID_STATUSES = ["SUCCESS", "REFUNDED"]
+
+
+class Command(BaseCommand):
+    help = "Rebuild the admin dashboard daily rollups from live and archived bookings and payments."
+
+    def handle(self, *args, **options):
+        counters = defaultdict(lambda: {"bookings": 0, "revenue": 0, "refunds": 0, "refunded": 0})
+
+        for model in (Booking, BookingHistory):
+            for row in (
+                model.objects.annotate(day=TruncDate("booking_time"))
+                .values("day", "bus_id")
+                .annotate(total=Count("pk"))
+                .order_by()
+            ):
+                counters[row["day"], row["bus_id"]]["bookings"] += row["total"]
+
+        archived_bus = Subquery(
+            BookingHistory.objects.filter(razorpay_order_id=OuterRef("razorpay_order_id")).values("bus_id")[:1]
+        )
+        payment_sources = (
+            Payment.objects.annotate(paid_bus=Coalesce("bus_id", "booking__bus_id", output_field=BigIntegerField())),
+            PaymentHistory.objects.annotate(paid_bus=Coalesce("bus_id", archived_bus, output_field=BigIntegerField())),
+        )
+        for queryset in payment_sources:
+            for row in (
+                queryset.filter(status__in=PAID_STATUSES)
+                .annotate(day=TruncDate("created_at"))
+                .values("day", "paid_bus")
+                .annotate(
+                    total=Sum("amount"),
+                    refunds=Sum("refunded_seats"),
+                    refunded=Sum("refunded_amount"),
+                )
+                .order_by()
+            ):
+                counter = counters[row["day"], row["paid_bus"]]
+                counter["revenue"] += row["total"]
+                counter["refunds"] += row["refunds"]
+                counter["refunded"] += row["refunded"]
+
+        with transaction.atomic():
+            DailyBusRollup.objects.all().delete()
+            DailyBusRollup.objects.bulk_create(
+                [DailyBusRollup(day=day, bus_id=bus_id, **values) for (day, bus_id), values in counters.items()],
+                batch_size=1000,
+            )
+        cache.delete(SUMMARY_CACHE_KEY)
+
+        bookings = sum(values["bookings"] for values in counters.values())
+        revenue = sum(values["revenue"] - values["refunded"] for values in counters.values())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt {len(counters)} rollup row(s): {bookings} booking(s), net revenue {revenue / 100:.2f}."
+            )
+        )
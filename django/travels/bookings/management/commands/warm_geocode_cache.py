@@ -0,0 +1,49 @@
+import requests
+from django.core.management.base import BaseCommand, CommandError
+
+from bookings.models import Bus, GeocodeCacheEntry
+from bookings.tomtom_service import (
+    fetch_geocode,
+    geocode_cache_key,
+    store_geocode,
+    tomtom_key_configured,
+)
+
+
+class Command(BaseCommand):
+    help = "Geocode every distinct bus origin/destination and persist the coordinates in the geocode cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--refresh",
+            action="store_true",
+            help="Re-fetch cities that are already cached.",
+        )
+
+    def handle(self, *args, **options):
+        if not tomtom_key_configured():
+            raise CommandError("TOMTOM_API_KEY is not configured")
+
+        cities = set(Bus.objects.values_list("origin_normalized", flat=True).distinct())
+        cities |= set(Bus.objects.values_list("destination_normalized", flat=True).distinct())
+        keys = {geocode_cache_key(city) for city in cities if city}
+        total = len(keys)
+
+        if not options["refresh"]:
+            keys -= set(GeocodeCacheEntry.objects.filter(query__in=keys).values_list("query", flat=True))
+
+        warmed = 0
+        failed = 0
+        for key in sorted(keys):
+            try:
+                store_geocode(key, fetch_geocode(key))
+                warmed += 1
+            except (ValueError, requests.RequestException) as exc:
+                failed += 1
+                self.stderr.write(f"Failed to geocode '{key}': {exc}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Geocoded {warmed} city name(s); {failed} failed; {total - len(keys)} already cached."
+            )
+        )
@@ -0,0 +1,78 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from bookings.models import Bus
+from bookings.route_map_cache import prerender_route_map
+from bookings.tasks import prerender_route_map_task
+from bookings.tomtom_service import tomtom_key_configured
+
+
+class Command(BaseCommand):
+    help = "Pre-render route maps for every distinct active route."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=settings.ROUTE_MAP_WARM_CONCURRENCY)
+        parser.add_argument(
+            "--enqueue",
+            action="store_true",
+            help="Queue one Celery task per route instead of rendering in this process.",
+        )
+
+    def handle(self, *args, **options):
+        if not tomtom_key_configured():
+            raise CommandError("TOMTOM_API_KEY is not configured")
+
+        if options["enqueue"]:
+            bus_ids = self.route_bus_ids()
+            for bus_id in bus_ids:
+                prerender_route_map_task.delay(bus_id=bus_id)
+            self.stdout.write(self.style.SUCCESS(f"Queued {len(bus_ids)} route map(s)"))
+            return
+
+        routes = list(
+            Bus.objects.filter(is_active=True)
+            .order_by()
+            .values_list("origin_normalized", "destination_normalized")
+            .distinct()
+        )
+        started = time.perf_counter()
+        failed = 0
+
+        with ThreadPoolExecutor(max_workers=max(options["concurrency"], 1)) as pool:
+            futures = {
+                pool.submit(self.warm, origin, destination): (origin, destination)
+                for origin, destination in routes
+            }
+            for future in as_completed(futures):
+                origin, destination = futures[future]
+                try:
+                    future.result()
+                except (ValueError, requests.RequestException) as exc:
+                    failed += 1
+                    self.stderr.write(f"{origin} -> {destination}: {exc}")
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(f"Warmed {len(routes) - failed} of {len(routes)} route(s) in {elapsed:.1f}s")
+        )
+
+    def route_bus_ids(self):
+        bus_ids = {}
+        for bus_id, origin, destination in (
+            Bus.objects.filter(is_active=True)
+            .order_by("id")
+            .values_list("id", "origin_normalized", "destination_normalized")
+        ):
+            bus_ids.setdefault((origin, destination), bus_id)
+        return list(bus_ids.values())
+
+    def warm(self, origin, destination):
+        try:
+            prerender_route_map(origin, destination)
+        finally:
+            connections.close_all()
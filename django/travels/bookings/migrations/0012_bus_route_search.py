@@ -0,0 +1,88 @@
+from django.db import migrations, models
+
+
+POSTGRES_INDEXES = [
+    (
+        "bus_origin_norm_prefix_idx",
+        "CREATE INDEX IF NOT EXISTS bus_origin_norm_prefix_idx "
+        "ON bookings_bus (origin_normalized varchar_pattern_ops)",
+    ),
+    (
+        "bus_destination_norm_prefix_idx",
+        "CREATE INDEX IF NOT EXISTS bus_destination_norm_prefix_idx "
+        "ON bookings_bus (destination_normalized varchar_pattern_ops)",
+    ),
+    (
+        "bus_origin_norm_trgm_idx",
+        "CREATE INDEX IF NOT EXISTS bus_origin_norm_trgm_idx "
+        "ON bookings_bus USING gin (origin_normalized gin_trgm_ops)",
+    ),
+    (
+        "bus_destination_norm_trgm_idx",
+        "CREATE INDEX IF NOT EXISTS bus_destination_norm_trgm_idx "
+        "ON bookings_bus USING gin (destination_normalized gin_trgm_ops)",
+    ),
+]
+
+
+def normalize_city(value):
+    return " ".join((value or "").split()).lower()
+
+
+def backfill_normalized_routes(apps, schema_editor):
+    Bus = apps.get_model("bookings", "Bus")
+    buses = list(Bus.objects.only("id", "origin", "destination"))
+    for bus in buses:
+        bus.origin_normalized = normalize_city(bus.origin)
+        bus.destination_normalized = normalize_city(bus.destination)
+    Bus.objects.bulk_update(buses, ["origin_normalized", "destination_normalized"], batch_size=1000)
+
+
+def create_postgres_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for _, sql in POSTGRES_INDEXES:
+        schema_editor.execute(sql)
+
+
+def drop_postgres_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for name, _ in POSTGRES_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0011_profile_is_email_verified"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="bus",
+            name="origin_normalized",
+            field=models.CharField(default="", editable=False, max_length=50),
+        ),
+        migrations.AddField(
+            model_name="bus",
+            name="destination_normalized",
+            field=models.CharField(default="", editable=False, max_length=50),
+        ),
+        migrations.RunPython(backfill_normalized_routes, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="bus",
+            index=models.Index(
+                fields=["origin_normalized", "destination_normalized"],
+                name="bus_route_normalized_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="bus",
+            index=models.Index(fields=["destination_normalized"], name="bus_destination_norm_idx"),
+        ),
+        migrations.RunPython(create_postgres_indexes, drop_postgres_indexes),
+    ]
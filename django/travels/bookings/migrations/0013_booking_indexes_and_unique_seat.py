@@ -0,0 +1,52 @@
+# Generated by Django 4.2.11 on 2026-10-18 15:16
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def cancel_duplicate_confirmed_bookings(apps, schema_editor):
+    Booking = apps.get_model("bookings", "Booking")
+    duplicates = (
+        Booking.objects.filter(status="CONFIRMED", journey_date__isnull=False)
+        .values("seat_id", "journey_date")
+        .annotate(bookings=Count("id"), first_id=Min("id"))
+        .filter(bookings__gt=1)
+        .order_by()
+    )
+    for duplicate in duplicates:
+        Booking.objects.filter(
+            status="CONFIRMED",
+            seat_id=duplicate["seat_id"],
+            journey_date=duplicate["journey_date"],
+        ).exclude(id=duplicate["first_id"]).update(status="CANCELLED")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0012_bus_route_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['seat', 'journey_date'], name='booking_seat_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['user', 'journey_date'], name='booking_user_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['status', 'journey_date'], name='booking_status_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['booking_time'], name='booking_time_idx'),
+        ),
+        migrations.RunPython(cancel_duplicate_confirmed_bookings, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='booking',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'CONFIRMED')), fields=('seat', 'journey_date'), name='unique_confirmed_seat_per_date'),
+        ),
+    ]
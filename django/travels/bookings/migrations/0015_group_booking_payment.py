@@ -0,0 +1,29 @@
+# Generated by Django 4.2.11 on 2026-10-18 15:34
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0014_geocodecacheentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='order_payment',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='bookings', to='bookings.payment'),
+        ),
+        migrations.AddField(
+            model_name='payment',
+            name='journey_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='payment',
+            name='seat_ids',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.11 on 2026-10-18 15:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0015_group_booking_payment'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SweeperRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50)),
+                ('started_at', models.DateTimeField()),
+                ('finished_at', models.DateTimeField()),
+                ('batches', models.PositiveIntegerField(default=0)),
+                ('rows', models.PositiveIntegerField(default=0)),
+                ('elapsed_ms', models.FloatField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['name', '-started_at'], name='sweeper_run_name_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.11 on 2026-10-18 15:39
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('bookings', '0016_sweeperrun'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sweeperrun',
+            name='last_pk',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='sweeperrun',
+            name='finished_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='BookingHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('booking_id', models.PositiveBigIntegerField(unique=True)),
+                ('bus_id', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('bus_name', models.CharField(max_length=100)),
+                ('bus_number', models.CharField(max_length=20)),
+                ('origin', models.CharField(max_length=50)),
+                ('destination', models.CharField(max_length=50)),
+                ('seat_number', models.CharField(max_length=10)),
+                ('journey_date', models.DateField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('CONFIRMED', 'Confirmed'), ('EXPIRED', 'Expired'), ('CANCELLED', 'Cancelled')], max_length=20)),
+                ('booking_time', models.DateTimeField()),
+                ('ticket_status', models.CharField(blank=True, max_length=20, null=True)),
+                ('razorpay_order_id', models.CharField(blank=True, max_length=100, null=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='booking_history', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'journey_date'], name='booking_history_user_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 4.2.11 on 2026-10-18 15:41
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('bookings', '0017_booking_history'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchiveRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(unique=True)),
+                ('bookings', models.PositiveIntegerField(default=0)),
+                ('payments', models.PositiveIntegerField(default=0)),
+                ('revenue', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PaymentHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('payment_id', models.PositiveBigIntegerField(unique=True)),
+                ('razorpay_order_id', models.CharField(max_length=100, unique=True)),
+                ('razorpay_payment_id', models.CharField(blank=True, max_length=100, null=True)),
+                ('amount', models.PositiveIntegerField()),
+                ('seat_ids', models.JSONField(blank=True, default=list)),
+                ('journey_date', models.DateField(blank=True, null=True)),
+                ('status', models.CharField(max_length=20)),
+                ('created_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name='bookinghistory',
+            name='booking_history_user_idx',
+        ),
+        migrations.AddIndex(
+            model_name='bookinghistory',
+            index=models.Index(fields=['user', '-booking_time', '-booking_id'], name='booking_history_user_idx'),
+        ),
+        migrations.AddField(
+            model_name='paymenthistory',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='payment_history', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
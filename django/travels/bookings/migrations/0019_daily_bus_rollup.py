@@ -0,0 +1,29 @@
+# Generated by Django 4.2.11 on 2026-10-18 15:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0018_archive_payments_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyBusRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('bus_id', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('bookings', models.PositiveIntegerField(default=0)),
+                ('revenue', models.PositiveBigIntegerField(default=0)),
+                ('refunds', models.PositiveIntegerField(default=0)),
+                ('refunded', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='dailybusrollup',
+            constraint=models.UniqueConstraint(fields=('day', 'bus_id'), name='unique_daily_bus_rollup'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.11 on 2026-10-18 15:47
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def bus_relation():
+    return models.ForeignKey(
+        blank=True,
+        db_constraint=False,
+        null=True,
+        on_delete=django.db.models.deletion.DO_NOTHING,
+        related_name='+',
+        to='bookings.bus',
+    )
+
+
+def keep_bus_column(model_name):
+    return migrations.SeparateDatabaseAndState(
+        database_operations=[
+            migrations.AlterField(
+                model_name=model_name,
+                name='bus_id',
+                field=models.BigIntegerField(blank=True, db_index=True, null=True),
+            ),
+        ],
+        state_operations=[
+            migrations.RemoveField(model_name=model_name, name='bus_id'),
+            migrations.AddField(model_name=model_name, name='bus', field=bus_relation()),
+        ],
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0019_daily_bus_rollup'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='dailybusrollup',
+            name='unique_daily_bus_rollup',
+        ),
+        keep_bus_column('bookinghistory'),
+        keep_bus_column('dailybusrollup'),
+        migrations.AddConstraint(
+            model_name='dailybusrollup',
+            constraint=models.UniqueConstraint(fields=('day', 'bus'), name='unique_daily_bus_rollup'),
+        ),
+    ]
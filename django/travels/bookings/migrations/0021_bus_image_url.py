@@ -0,0 +1,33 @@
+from django.db import migrations, models
+
+
+def backfill_image_urls(apps, schema_editor):
+    Bus = apps.get_model("bookings", "Bus")
+    buses = []
+    for bus in Bus.objects.exclude(image="").exclude(image__isnull=True).only("id", "image"):
+        try:
+            bus.image_url = bus.image.url
+        except Exception:
+            continue
+        buses.append(bus)
+    Bus.objects.bulk_update(buses, ["image_url"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0020_rollup_bus_relations"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="bus",
+            name="image_url",
+            field=models.CharField(blank=True, default="", editable=False, max_length=500),
+        ),
+        migrations.RunPython(backfill_image_urls, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="bus",
+            index=models.Index(fields=["is_active", "-id"], name="bus_active_id_idx"),
+        ),
+    ]
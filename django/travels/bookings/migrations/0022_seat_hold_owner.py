@@ -0,0 +1,26 @@
+# Generated by Django 4.2.11 on 2026-10-18 16:21
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('bookings', '0021_bus_image_url'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='seat',
+            name='hold_journey_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='seat',
+            name='hold_owner',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,16 @@
+# Generated by Django 4.2.11 on 2026-10-18 16:28
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0022_seat_hold_owner'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='ArchiveRollup',
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 4.2.11 on 2026-10-18 16:42
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+import django.db.models.deletion
+
+
+def backfill_payment_bus_and_refunds(apps, schema_editor):
+    Booking = apps.get_model("bookings", "Booking")
+    BookingHistory = apps.get_model("bookings", "BookingHistory")
+    Payment = apps.get_model("bookings", "Payment")
+    PaymentHistory = apps.get_model("bookings", "PaymentHistory")
+
+    booking_bus = models.Subquery(Booking.objects.filter(pk=models.OuterRef("booking_id")).values("bus_id")[:1])
+    order_bus = models.Subquery(Booking.objects.filter(order_payment=models.OuterRef("pk")).values("bus_id")[:1])
+    Payment.objects.filter(bus__isnull=True).update(bus=Coalesce(booking_bus, order_bus))
+    archived_bus = models.Subquery(
+        BookingHistory.objects.filter(razorpay_order_id=models.OuterRef("razorpay_order_id")).values("bus_id")[:1]
+    )
+    PaymentHistory.objects.filter(bus__isnull=True).update(bus=archived_bus)
+
+    for model in (Payment, PaymentHistory):
+        payments = list(model.objects.filter(status="REFUNDED").only("id", "amount", "seat_ids"))
+        for payment in payments:
+            payment.refunded_amount = payment.amount
+            payment.refunded_seats = max(len(payment.seat_ids or []), 1)
+        model.objects.bulk_update(payments, ["refunded_amount", "refunded_seats"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0023_drop_archive_rollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payment',
+            name='bus',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='bookings.bus'),
+        ),
+        migrations.AddField(
+            model_name='payment',
+            name='refunded_amount',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='payment',
+            name='refunded_seats',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='paymenthistory',
+            name='bus',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='bookings.bus'),
+        ),
+        migrations.AddField(
+            model_name='paymenthistory',
+            name='refunded_amount',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='paymenthistory',
+            name='refunded_seats',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_payment_bus_and_refunds, migrations.RunPython.noop),
+    ]
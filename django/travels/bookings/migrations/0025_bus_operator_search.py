@@ -0,0 +1,61 @@
+from django.db import migrations, models
+
+
+POSTGRES_INDEXES = [
+    (
+        "bus_name_norm_prefix_idx",
+        "CREATE INDEX IF NOT EXISTS bus_name_norm_prefix_idx "
+        "ON bookings_bus (bus_name_normalized varchar_pattern_ops)",
+    ),
+    (
+        "bus_name_norm_trgm_idx",
+        "CREATE INDEX IF NOT EXISTS bus_name_norm_trgm_idx "
+        "ON bookings_bus USING gin (bus_name_normalized gin_trgm_ops)",
+    ),
+]
+
+
+def normalize_city(value):
+    return " ".join((value or "").split()).lower()
+
+
+def backfill_normalized_bus_names(apps, schema_editor):
+    Bus = apps.get_model("bookings", "Bus")
+    buses = list(Bus.objects.only("id", "bus_name"))
+    for bus in buses:
+        bus.bus_name_normalized = normalize_city(bus.bus_name)
+    Bus.objects.bulk_update(buses, ["bus_name_normalized"], batch_size=1000)
+
+
+def create_postgres_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for _, sql in POSTGRES_INDEXES:
+        schema_editor.execute(sql)
+
+
+def drop_postgres_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for name, _ in POSTGRES_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0024_payment_bus_and_refunds"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="bus",
+            name="bus_name_normalized",
+            field=models.CharField(default="", editable=False, max_length=100),
+        ),
+        migrations.RunPython(backfill_normalized_bus_names, migrations.RunPython.noop),
+        migrations.RunPython(create_postgres_indexes, drop_postgres_indexes),
+    ]
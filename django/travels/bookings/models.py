@@ -1,11 +1,27 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.utils import timezone
+
+
+def normalize_city(value):
+    return " ".join((value or "").split()).lower()
+
+
+SEARCH_FIELDS = {
+    "origin": "origin_normalized",
+    "destination": "destination_normalized",
+    "bus_name": "bus_name_normalized",
+}
+
 
 class Bus(models.Model):
     bus_name = models.CharField(max_length=100)
     number = models.CharField(max_length=20,unique=True)
     origin = models.CharField(max_length=50)
     destination = models.CharField(max_length=50)
+    origin_normalized = models.CharField(max_length=50, default="", editable=False)
+    destination_normalized = models.CharField(max_length=50, default="", editable=False)
+    bus_name_normalized = models.CharField(max_length=100, default="", editable=False)
     features = models.TextField()
     start_time = models.TimeField()
     reach_time = models.TimeField()
@@ -14,10 +30,46 @@ class Bus(models.Model):
 
     is_active = models.BooleanField(default=True)   
     image = models.ImageField(upload_to="buses/", null=True, blank=True)  
+    image_url = models.CharField(max_length=500, blank=True, default="", editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["origin_normalized", "destination_normalized"],
+                name="bus_route_normalized_idx",
+            ),
+            models.Index(fields=["destination_normalized"], name="bus_destination_norm_idx"),
+            models.Index(fields=["is_active", "-id"], name="bus_active_id_idx"),
+        ]
 
     def __str__(self):
         return f"{self.bus_name} {self.origin} → {self.destination}"
 
+    def normalize_search_fields(self):
+        self.origin_normalized = normalize_city(self.origin)
+        self.destination_normalized = normalize_city(self.destination)
+        self.bus_name_normalized = normalize_city(self.bus_name)
+
+    def resolve_image_url(self):
+        if not self.image:
+            return ""
+        try:
+            return self.image.url
+        except Exception:
+            return ""
+
+    def save(self, *args, **kwargs):
+        self.normalize_search_fields()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and SEARCH_FIELDS.keys() & set(update_fields):
+            kwargs["update_fields"] = set(update_fields) | set(SEARCH_FIELDS.values())
+        super().save(*args, **kwargs)
+
+        image_url = self.resolve_image_url()
+        if image_url != self.image_url:
+            self.image_url = image_url
+            Bus.objects.filter(pk=self.pk).update(image_url=image_url)
+
 
 class Seat(models.Model):
     bus = models.ForeignKey('Bus', on_delete=models.CASCADE, related_name='seats')
@@ -25,6 +77,8 @@ class Seat(models.Model):
     is_booked = models.BooleanField(default=False)
     is_held = models.BooleanField(default=False)
     hold_expires_at = models.DateTimeField(null=True, blank=True)
+    hold_owner = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    hold_journey_date = models.DateField(null=True, blank=True)
 
     def __str__(self):
         return f"{self.bus} {self.seat_number} "
@@ -50,6 +104,37 @@ class Booking(models.Model):
         default=STATUS_CONFIRMED,
     )
     booking_time = models.DateTimeField(auto_now_add=True)
+    order_payment = models.ForeignKey(
+        "Payment",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="bookings",
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["seat", "journey_date"], name="booking_seat_date_idx"),
+            models.Index(fields=["user", "journey_date"], name="booking_user_date_idx"),
+            models.Index(fields=["status", "journey_date"], name="booking_status_date_idx"),
+            models.Index(fields=["booking_time"], name="booking_time_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["seat", "journey_date"],
+                condition=models.Q(status="CONFIRMED"),
+                name="unique_confirmed_seat_per_date",
+            ),
+        ]
+
+    def effective_status(self, today=None):
+        if (
+            self.status == self.STATUS_CONFIRMED
+            and self.journey_date
+            and self.journey_date < (today or timezone.localdate())
+        ):
+            return self.STATUS_EXPIRED
+        return self.status
 
     def __str__(self):
         return f"{self.user.username}-{self.bus.bus_name}-{self.bus.start_time}-{self.bus.reach_time}-{self.seat.seat_number}"
@@ -58,10 +143,22 @@ class Booking(models.Model):
 class Payment(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="payments")
     booking = models.ForeignKey(Booking, on_delete=models.SET_NULL, null=True, blank=True)
+    bus = models.ForeignKey(
+        Bus,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
     razorpay_order_id = models.CharField(max_length=100, unique=True)
     razorpay_payment_id = models.CharField(max_length=100, null=True, blank=True)
     razorpay_signature = models.CharField(max_length=255, null=True, blank=True)
     amount = models.PositiveIntegerField()
+    refunded_amount = models.PositiveIntegerField(default=0)
+    refunded_seats = models.PositiveIntegerField(default=0)
+    seat_ids = models.JSONField(default=list, blank=True)
+    journey_date = models.DateField(null=True, blank=True)
     status = models.CharField(
         max_length=20,
         choices=[
@@ -104,3 +201,114 @@ class Ticket(models.Model):
 
     def __str__ (self):
         return f"Ticket #{self.id} - {self.user.username} - {self.status}"
+
+
+class GeocodeCacheEntry(models.Model):
+    query = models.CharField(max_length=100, unique=True)
+    label = models.CharField(max_length=255)
+    lat = models.FloatField()
+    lon = models.FloatField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.query} ({self.lat}, {self.lon})"
+
+
+class SweeperRun(models.Model):
+    name = models.CharField(max_length=50)
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField(null=True, blank=True)
+    batches = models.PositiveIntegerField(default=0)
+    rows = models.PositiveIntegerField(default=0)
+    last_pk = models.PositiveBigIntegerField(default=0)
+    elapsed_ms = models.FloatField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["name", "-started_at"], name="sweeper_run_name_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} @ {self.started_at:%Y-%m-%d %H:%M} ({self.rows} rows)"
+
+
+class BookingHistory(models.Model):
+    booking_id = models.PositiveBigIntegerField(unique=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="booking_history")
+    bus = models.ForeignKey(
+        Bus,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    bus_name = models.CharField(max_length=100)
+    bus_number = models.CharField(max_length=20)
+    origin = models.CharField(max_length=50)
+    destination = models.CharField(max_length=50)
+    seat_number = models.CharField(max_length=10)
+    journey_date = models.DateField(null=True, blank=True)
+    status = models.CharField(max_length=20, choices=Booking.STATUS_CHOICES)
+    booking_time = models.DateTimeField()
+    ticket_status = models.CharField(max_length=20, null=True, blank=True)
+    razorpay_order_id = models.CharField(max_length=100, null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "-booking_time", "-booking_id"], name="booking_history_user_idx"),
+        ]
+
+    def __str__(self):
+        return f"Booking #{self.booking_id} - {self.bus_name} - {self.journey_date}"
+
+
+class PaymentHistory(models.Model):
+    payment_id = models.PositiveBigIntegerField(unique=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="payment_history")
+    bus = models.ForeignKey(
+        Bus,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    razorpay_order_id = models.CharField(max_length=100, unique=True)
+    razorpay_payment_id = models.CharField(max_length=100, null=True, blank=True)
+    amount = models.PositiveIntegerField()
+    refunded_amount = models.PositiveIntegerField(default=0)
+    refunded_seats = models.PositiveIntegerField(default=0)
+    seat_ids = models.JSONField(default=list, blank=True)
+    journey_date = models.DateField(null=True, blank=True)
+    status = models.CharField(max_length=20)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.razorpay_order_id} - {self.status}"
+
+
+class DailyBusRollup(models.Model):
+    day = models.DateField()
+    bus = models.ForeignKey(
+        Bus,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    bookings = models.PositiveIntegerField(default=0)
+    revenue = models.PositiveBigIntegerField(default=0)
+    refunds = models.PositiveIntegerField(default=0)
+    refunded = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["day", "bus"], name="unique_daily_bus_rollup"),
+        ]
+
+    def __str__(self):
+        return f"{self.day} bus={self.bus_id}: {self.bookings} bookings"
@@ -0,0 +1,91 @@
+import heapq
+from base64 import b64decode, b64encode
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class BookingTimelinePagination(BasePagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            booking_time, pk = b64decode(encoded.encode("ascii"), altchars=b"-_").decode("ascii").split("|")
+            return datetime.fromisoformat(booking_time), int(pk)
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, booking_time, pk):
+        token = b64encode(f"{booking_time.isoformat()}|{pk}".encode("ascii"), altchars=b"-_").decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def paginate_sources(self, sources, request):
+        self.base_url = remove_query_param(request.build_absolute_uri(), self.cursor_query_param)
+        page_size = self.get_page_size(request)
+        position = self.decode_cursor(request)
+
+        streams = []
+        for queryset, pk_field in sources:
+            if position is not None:
+                booking_time, pk = position
+                queryset = queryset.filter(
+                    Q(booking_time__lt=booking_time) | Q(booking_time=booking_time, **{f"{pk_field}__lt": pk})
+                )
+            rows = list(queryset.order_by("-booking_time", f"-{pk_field}")[:page_size + 1])
+            streams.append([((row.booking_time, getattr(row, pk_field)), row) for row in rows])
+
+        merged = list(heapq.merge(*streams, key=lambda item: item[0], reverse=True))
+        page = merged[:page_size]
+        self.next_link = self.encode_cursor(*page[-1][0]) if len(merged) > page_size else None
+        return [row for _, row in page]
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.next_link, "previous": None, "results": data})
+
+
+class AdminBusPagination(BookingTimelinePagination):
+    page_size = 50
+    max_page_size = 200
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            return int(b64decode(encoded.encode("ascii"), altchars=b"-_").decode("ascii"))
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, pk):
+        token = b64encode(str(pk).encode("ascii"), altchars=b"-_").decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = remove_query_param(request.build_absolute_uri(), self.cursor_query_param)
+        page_size = self.get_page_size(request)
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(pk__lt=position)
+
+        rows = list(queryset.order_by("-pk")[:page_size + 1])
+        page = rows[:page_size]
+        self.next_link = self.encode_cursor(page[-1].pk) if len(rows) > page_size else None
+        return page
@@ -14,15 +14,36 @@ logger = logging.getLogger(__name__)
 
 class LocalRedisOTPService:
     _client = None
+    _binary_client = None
 
     @classmethod
     def _reset_client(cls):
         cls._client = None
+        cls._binary_client = None
 
     @classmethod
     def enabled(cls):
         return True
 
+    @classmethod
+    def _build_client(cls, decode_responses):
+        try:
+            return redis.Redis(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                db=0,
+                decode_responses=decode_responses,
+                socket_connect_timeout=3,
+                socket_timeout=3,
+            )
+        except Exception:
+            logger.exception(
+                "Failed to initialize Redis client for host=%s port=%s",
+                settings.REDIS_HOST,
+                settings.REDIS_PORT,
+            )
+            return None
+
     @classmethod
     def get_client(cls):
         if not cls.enabled():
@@ -34,25 +55,20 @@ class LocalRedisOTPService:
             return None
 
         if cls._client is None:
-            try:
-                cls._client = redis.Redis(
-                    host=settings.REDIS_HOST,
-                    port=settings.REDIS_PORT,
-                    db=0,
-                    decode_responses=True,
-                    socket_connect_timeout=3,
-                    socket_timeout=3,
-                )
-            except Exception:
-                logger.exception(
-                    "Failed to initialize Redis client for host=%s port=%s",
-                    settings.REDIS_HOST,
-                    settings.REDIS_PORT,
-                )
-                cls._client = None
+            cls._client = cls._build_client(decode_responses=True)
 
         return cls._client
 
+    @classmethod
+    def get_binary_client(cls):
+        if not cls.enabled() or redis is None:
+            return None
+
+        if cls._binary_client is None:
+            cls._binary_client = cls._build_client(decode_responses=False)
+
+        return cls._binary_client
+
     @classmethod
     def is_available(cls):
         client = cls.get_client()
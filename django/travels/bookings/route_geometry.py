@@ -0,0 +1,142 @@
+from array import array
+
+
+POLYLINE_PRECISION = 5
+
+
+def compact_points(points):
+    coords = array("d")
+    for lat, lon in points:
+        coords.append(lat)
+        coords.append(lon)
+    return coords
+
+
+def point_count(coords):
+    return len(coords) // 2
+
+
+def iter_points(coords):
+    return zip(coords[0::2], coords[1::2])
+
+
+def route_bbox(coords, padding_ratio=0.12):
+    min_lat = max_lat = coords[0]
+    min_lon = max_lon = coords[1]
+
+    for index in range(2, len(coords), 2):
+        lat = coords[index]
+        lon = coords[index + 1]
+        if lat < min_lat:
+            min_lat = lat
+        elif lat > max_lat:
+            max_lat = lat
+        if lon < min_lon:
+            min_lon = lon
+        elif lon > max_lon:
+            max_lon = lon
+
+    lat_padding = max((max_lat - min_lat) * padding_ratio, 0.05)
+    lon_padding = max((max_lon - min_lon) * padding_ratio, 0.05)
+
+    return {
+        "min_lat": max(min_lat - lat_padding, -85),
+        "max_lat": min(max_lat + lat_padding, 85),
+        "min_lon": max(min_lon - lon_padding, -180),
+        "max_lon": min(max_lon + lon_padding, 180),
+    }
+
+
+def _segment_distance_sq(coords, point, start, end):
+    lat, lon = coords[2 * point], coords[2 * point + 1]
+    start_lat, start_lon = coords[2 * start], coords[2 * start + 1]
+    end_lat, end_lon = coords[2 * end], coords[2 * end + 1]
+
+    d_lat = end_lat - start_lat
+    d_lon = end_lon - start_lon
+    length_sq = d_lat * d_lat + d_lon * d_lon
+    if length_sq == 0:
+        return (lat - start_lat) ** 2 + (lon - start_lon) ** 2
+
+    t = ((lat - start_lat) * d_lat + (lon - start_lon) * d_lon) / length_sq
+    t = min(max(t, 0.0), 1.0)
+    return (lat - start_lat - t * d_lat) ** 2 + (lon - start_lon - t * d_lon) ** 2
+
+
+def simplify(coords, tolerance):
+    count = point_count(coords)
+    if count < 3 or tolerance <= 0:
+        return array("d", coords)
+
+    tolerance_sq = tolerance * tolerance
+    keep = bytearray(count)
+    keep[0] = keep[-1] = 1
+    stack = [(0, count - 1)]
+
+    while stack:
+        start, end = stack.pop()
+        farthest = None
+        farthest_sq = tolerance_sq
+        for point in range(start + 1, end):
+            distance_sq = _segment_distance_sq(coords, point, start, end)
+            if distance_sq > farthest_sq:
+                farthest = point
+                farthest_sq = distance_sq
+
+        if farthest is not None:
+            keep[farthest] = 1
+            stack.append((start, farthest))
+            stack.append((farthest, end))
+
+    simplified = array("d")
+    for point in range(count):
+        if keep[point]:
+            simplified.append(coords[2 * point])
+            simplified.append(coords[2 * point + 1])
+    return simplified
+
+
+def _encode_value(value, chunks):
+    value = ~(value << 1) if value < 0 else value << 1
+    while value >= 0x20:
+        chunks.append(chr((0x20 | (value & 0x1F)) + 63))
+        value >>= 5
+    chunks.append(chr(value + 63))
+
+
+def encode_polyline(coords, precision=POLYLINE_PRECISION):
+    factor = 10 ** precision
+    chunks = []
+    previous = [0, 0]
+
+    for index, value in enumerate(coords):
+        scaled = round(value * factor)
+        _encode_value(scaled - previous[index % 2], chunks)
+        previous[index % 2] = scaled
+
+    return "".join(chunks)
+
+
+def decode_polyline(encoded, precision=POLYLINE_PRECISION):
+    factor = 10 ** precision
+    coords = array("d")
+    current = [0, 0]
+    position = 0
+    component = 0
+
+    while position < len(encoded):
+        result = 0
+        shift = 0
+        while True:
+            byte = ord(encoded[position]) - 63
+            position += 1
+            result |= (byte & 0x1F) << shift
+            shift += 5
+            if byte < 0x20:
+                break
+
+        current[component] += ~(result >> 1) if result & 1 else result >> 1
+        coords.append(current[component] / factor)
+        component ^= 1
+
+    return coords
@@ -0,0 +1,169 @@
+import asyncio
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+
+from . import http_client
+from .models import normalize_city
+from .route_geometry import decode_polyline, encode_polyline, point_count, route_bbox, simplify
+from .tomtom_service import (
+    fetch_route_map_image,
+    fetch_route_map_image_async,
+    fetch_route_points,
+    fetch_route_points_async,
+    geocode_location,
+    geocode_location_async,
+)
+
+
+def route_cache():
+    return caches[settings.ROUTE_MAP_CACHE_ALIAS]
+
+
+def route_cache_key(kind, origin, destination, *parts):
+    raw = "|".join([normalize_city(origin), normalize_city(destination), *[str(part) for part in parts]])
+    return f"{kind}:{hashlib.sha1(raw.encode('utf-8')).hexdigest()}"
+
+
+def route_deadline():
+    return http_client.Deadline(settings.ROUTE_MAP_DEADLINE_SECONDS)
+
+
+def build_route(route_data):
+    return {
+        "origin": route_data["origin"],
+        "destination": route_data["destination"],
+        "distance_meters": route_data["distance_meters"],
+        "polyline": encode_polyline(route_data["points"]),
+        "point_count": point_count(route_data["points"]),
+        "bbox": route_bbox(route_data["points"]),
+    }
+
+
+def build_route_map(content, content_type):
+    return {
+        "content": content,
+        "content_type": content_type,
+        "etag": f'"{hashlib.sha1(content).hexdigest()}"',
+    }
+
+
+def get_route(origin, destination, deadline=None):
+    key = route_cache_key("route", origin, destination)
+    route = route_cache().get(key)
+    if route is not None:
+        return route
+
+    deadline = deadline or route_deadline()
+    origin_lookup = http_client.submit(geocode_location, origin, deadline=deadline)
+    destination_lookup = http_client.submit(geocode_location, destination, deadline=deadline)
+    route_data = fetch_route_points(
+        http_client.wait(origin_lookup, deadline),
+        http_client.wait(destination_lookup, deadline),
+        deadline=deadline,
+    )
+    route = build_route(route_data)
+    route_cache().set(key, route)
+    return route
+
+
+def get_route_map(origin, destination, width, height, deadline=None):
+    key = route_cache_key("route-map", origin, destination, width, height)
+    route_map = route_cache().get(key)
+    if route_map is not None:
+        return route_map
+
+    deadline = deadline or route_deadline()
+    route = get_route(origin, destination, deadline=deadline)
+    content, content_type = fetch_route_map_image(
+        route["bbox"],
+        width=width,
+        height=height,
+        deadline=deadline,
+    )
+    route_map = build_route_map(content, content_type)
+    route_cache().set(key, route_map)
+    return route_map
+
+
+def prerender_route_map(origin, destination):
+    for width, height in settings.ROUTE_MAP_PRERENDER_SIZES:
+        get_route_map(origin, destination, width, height)
+
+
+async def get_route_async(origin, destination):
+    key = route_cache_key("route", origin, destination)
+    route = await route_cache().aget(key)
+    if route is not None:
+        return route
+
+    origin_location, destination_location = await asyncio.gather(
+        geocode_location_async(origin),
+        geocode_location_async(destination),
+    )
+    route = build_route(await fetch_route_points_async(origin_location, destination_location))
+    await route_cache().aset(key, route)
+    return route
+
+
+async def render_route_map_async(origin, destination, width, height):
+    route = await get_route_async(origin, destination)
+    content, content_type = await fetch_route_map_image_async(route["bbox"], width=width, height=height)
+    return build_route_map(content, content_type)
+
+
+async def get_route_map_async(origin, destination, width, height):
+    key = route_cache_key("route-map", origin, destination, width, height)
+    route_map = await route_cache().aget(key)
+    if route_map is not None:
+        return route_map
+
+    route_map = await asyncio.wait_for(
+        render_route_map_async(origin, destination, width, height),
+        timeout=settings.ROUTE_MAP_DEADLINE_SECONDS,
+    )
+    await route_cache().aset(key, route_map)
+    return route_map
+
+
+def build_geometry(route, tolerance):
+    simplified = simplify(decode_polyline(route["polyline"]), tolerance)
+    polyline = encode_polyline(simplified)
+    return {
+        "origin": route["origin"]["label"],
+        "destination": route["destination"]["label"],
+        "distance_meters": route["distance_meters"],
+        "bbox": route["bbox"],
+        "tolerance": tolerance,
+        "point_count": point_count(simplified),
+        "original_point_count": route["point_count"],
+        "polyline": polyline,
+        "etag": f'"{hashlib.sha1(polyline.encode("utf-8")).hexdigest()}"',
+    }
+
+
+def get_route_geometry(origin, destination, tolerance, deadline=None):
+    key = route_cache_key("route-geometry", origin, destination, tolerance)
+    geometry = route_cache().get(key)
+    if geometry is not None:
+        return geometry
+
+    geometry = build_geometry(get_route(origin, destination, deadline=deadline), tolerance)
+    route_cache().set(key, geometry)
+    return geometry
+
+
+async def get_route_geometry_async(origin, destination, tolerance):
+    key = route_cache_key("route-geometry", origin, destination, tolerance)
+    geometry = await route_cache().aget(key)
+    if geometry is not None:
+        return geometry
+
+    route = await asyncio.wait_for(
+        get_route_async(origin, destination),
+        timeout=settings.ROUTE_MAP_DEADLINE_SECONDS,
+    )
+    geometry = await asyncio.to_thread(build_geometry, route, tolerance)
+    await route_cache().aset(key, geometry)
+    return geometry
@@ -0,0 +1,25 @@
+from .models import normalize_city
+
+
+TRIGRAM_MIN_LENGTH = 3
+
+
+def normalized_lookup(field, value):
+    key = normalize_city(value)
+    if len(key) < TRIGRAM_MIN_LENGTH:
+        return {f"{field}_normalized__startswith": key}
+    return {f"{field}_normalized__contains": key}
+
+
+def filter_route(queryset, origin=None, destination=None):
+    if origin:
+        queryset = queryset.filter(**normalized_lookup("origin", origin))
+    if destination:
+        queryset = queryset.filter(**normalized_lookup("destination", destination))
+    return queryset
+
+
+def filter_operator(queryset, operator=None):
+    if operator:
+        queryset = queryset.filter(**normalized_lookup("bus_name", operator))
+    return queryset
@@ -0,0 +1,146 @@
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.dateparse import parse_date
+
+from .models import Seat
+from .redis_service import LocalRedisOTPService
+
+
+logger = logging.getLogger(__name__)
+
+
+SET_BIT_IF_EXISTS = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('SETBIT', KEYS[1], ARGV[1], ARGV[2])
+    return 1
+end
+return 0
+"""
+
+
+class SeatBitmapService:
+    @staticmethod
+    def _ttl_seconds():
+        return getattr(settings, "SEAT_BITMAP_TTL_SECONDS", 600)
+
+    @staticmethod
+    def _key(bus_id, journey_date):
+        if isinstance(journey_date, str):
+            journey_date = parse_date(journey_date)
+        return f"seatmap:{bus_id}:{journey_date.isoformat()}"
+
+    @staticmethod
+    def encode(seat_ids, booked_seat_ids):
+        bitmap = bytearray((len(seat_ids) + 7) // 8)
+        for offset, seat_id in enumerate(seat_ids):
+            if seat_id in booked_seat_ids:
+                bitmap[offset // 8] |= 0x80 >> (offset % 8)
+        return bytes(bitmap)
+
+    @staticmethod
+    def decode(bitmap, seat_ids):
+        booked = set()
+        for offset, seat_id in enumerate(seat_ids):
+            index = offset // 8
+            if index < len(bitmap) and bitmap[index] & (0x80 >> (offset % 8)):
+                booked.add(seat_id)
+        return booked
+
+    @staticmethod
+    def seat_offset(seat):
+        return Seat.objects.filter(bus_id=seat.bus_id, id__lt=seat.id).count()
+
+    @classmethod
+    def get_many(cls, bus_ids, journey_date):
+        client = LocalRedisOTPService.get_binary_client()
+        if client is None or not bus_ids:
+            return {}
+
+        try:
+            values = client.mget([cls._key(bus_id, journey_date) for bus_id in bus_ids])
+        except Exception:
+            logger.warning("Redis unavailable while reading seat bitmaps for date=%s", journey_date)
+            LocalRedisOTPService._reset_client()
+            return {}
+
+        return {
+            bus_id: value
+            for bus_id, value in zip(bus_ids, values)
+            if value is not None
+        }
+
+    @classmethod
+    def store_many(cls, bitmaps, journey_date):
+        client = LocalRedisOTPService.get_binary_client()
+        if client is None or not bitmaps:
+            return False
+
+        try:
+            pipeline = client.pipeline(transaction=False)
+            for bus_id, bitmap in bitmaps.items():
+                pipeline.set(cls._key(bus_id, journey_date), bitmap, ex=cls._ttl_seconds(), nx=True)
+            pipeline.execute()
+            return True
+        except Exception:
+            logger.warning("Redis unavailable while storing seat bitmaps for date=%s", journey_date)
+            LocalRedisOTPService._reset_client()
+            return False
+
+    @classmethod
+    def set_offset(cls, bus_id, offset, journey_date, booked):
+        client = LocalRedisOTPService.get_binary_client()
+        if client is None:
+            return False
+
+        try:
+            return bool(
+                client.eval(
+                    SET_BIT_IF_EXISTS,
+                    1,
+                    cls._key(bus_id, journey_date),
+                    offset,
+                    1 if booked else 0,
+                )
+            )
+        except Exception:
+            logger.warning(
+                "Redis unavailable while updating seat bitmap for bus_id=%s date=%s",
+                bus_id,
+                journey_date,
+            )
+            LocalRedisOTPService._reset_client()
+            return False
+
+    @classmethod
+    def set_seat(cls, seat, journey_date, booked):
+        if not journey_date:
+            return
+
+        offset = cls.seat_offset(seat)
+        transaction.on_commit(
+            lambda: cls.set_offset(seat.bus_id, offset, journey_date, booked)
+        )
+
+    @classmethod
+    def mark_booked(cls, seat, journey_date):
+        cls.set_seat(seat, journey_date, True)
+
+    @classmethod
+    def mark_free(cls, seat, journey_date):
+        cls.set_seat(seat, journey_date, False)
+
+    @classmethod
+    def invalidate_bus(cls, bus_id):
+        client = LocalRedisOTPService.get_binary_client()
+        if client is None:
+            return 0
+
+        try:
+            keys = list(client.scan_iter(match=f"seatmap:{bus_id}:*", count=500))
+            return client.delete(*keys) if keys else 0
+        except Exception:
+            logger.warning("Redis unavailable while invalidating seat bitmaps for bus_id=%s", bus_id)
+            LocalRedisOTPService._reset_client()
+            return 0
@@ -0,0 +1,171 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .models import Seat
+from .redis_service import LocalRedisOTPService
+
+
+logger = logging.getLogger(__name__)
+
+
+ACQUIRE_HOLDS = """
+for _, key in ipairs(KEYS) do
+    local holder = redis.call('GET', key)
+    if holder and holder ~= ARGV[1] then
+        return 0
+    end
+end
+for _, key in ipairs(KEYS) do
+    redis.call('SET', key, ARGV[1], 'PX', ARGV[2])
+end
+return 1
+"""
+
+RELEASE_HOLDS = """
+local released = 0
+for _, key in ipairs(KEYS) do
+    if redis.call('GET', key) == ARGV[1] then
+        released = released + redis.call('DEL', key)
+    end
+end
+return released
+"""
+
+
+class HoldUnavailable(Exception):
+    pass
+
+
+class SeatHoldService:
+    @staticmethod
+    def _key(seat_id, journey_date):
+        return f"seathold:{seat_id}:{journey_date}"
+
+    @classmethod
+    def _keys(cls, seats, journey_date):
+        return [cls._key(seat.id, journey_date) for seat in seats]
+
+    @staticmethod
+    def _ordered(seats):
+        return sorted(seats, key=lambda seat: seat.id)
+
+    @staticmethod
+    def owner(user):
+        return str(user.id)
+
+    @staticmethod
+    def ttl_seconds():
+        return getattr(settings, "SEAT_HOLD_TTL_SECONDS", 300)
+
+    @classmethod
+    def _redis_failed(cls, action, seats):
+        logger.warning(
+            "Redis unavailable while %s seat holds for seat_ids=%s, using database",
+            action,
+            [seat.id for seat in seats],
+        )
+        LocalRedisOTPService._reset_client()
+
+    @classmethod
+    def acquire(cls, seats, journey_date, user):
+        seats = cls._ordered(seats)
+        client = LocalRedisOTPService.get_client()
+        if client is not None:
+            try:
+                keys = cls._keys(seats, journey_date)
+                return bool(client.eval(ACQUIRE_HOLDS, len(keys), *keys, cls.owner(user), cls.ttl_seconds() * 1000))
+            except Exception:
+                cls._redis_failed("acquiring", seats)
+
+        now = timezone.now()
+        try:
+            with transaction.atomic():
+                for seat in seats:
+                    held = (
+                        Seat.objects
+                        .filter(id=seat.id)
+                        .filter(
+                            Q(is_held=False)
+                            | Q(hold_expires_at__isnull=True)
+                            | Q(hold_expires_at__lte=now)
+                            | Q(hold_owner=user, hold_journey_date=journey_date)
+                        )
+                        .update(
+                            is_held=True,
+                            hold_expires_at=now + timedelta(seconds=cls.ttl_seconds()),
+                            hold_owner=user,
+                            hold_journey_date=journey_date,
+                        )
+                    )
+                    if not held:
+                        raise HoldUnavailable(seat.id)
+        except HoldUnavailable:
+            return False
+        return True
+
+    @classmethod
+    def is_lost(cls, seats, journey_date, user):
+        client = LocalRedisOTPService.get_client()
+        if client is not None:
+            try:
+                owner = cls.owner(user)
+                holders = client.mget(cls._keys(seats, journey_date))
+                return any(holder is not None and holder != owner for holder in holders)
+            except Exception:
+                cls._redis_failed("checking", seats)
+
+        if isinstance(journey_date, str):
+            journey_date = parse_date(journey_date)
+        now = timezone.now()
+        return any(
+            seat.is_held
+            and seat.hold_expires_at
+            and seat.hold_expires_at > now
+            and seat.hold_owner_id not in (None, user.id)
+            and seat.hold_journey_date == journey_date
+            for seat in seats
+        )
+
+    @classmethod
+    def release(cls, seats, journey_date, user):
+        seats = cls._ordered(seats)
+        client = LocalRedisOTPService.get_client()
+        if client is not None:
+            try:
+                keys = cls._keys(seats, journey_date)
+                client.eval(RELEASE_HOLDS, len(keys), *keys, cls.owner(user))
+                return
+            except Exception:
+                cls._redis_failed("releasing", seats)
+
+        Seat.objects.filter(
+            id__in=[seat.id for seat in seats],
+            is_held=True,
+            hold_owner=user,
+            hold_journey_date=journey_date,
+        ).update(is_held=False, hold_expires_at=None, hold_owner=None, hold_journey_date=None)
+
+    @classmethod
+    def held_seat_ids(cls, seat_ids, journey_date):
+        seat_ids = list(seat_ids)
+        if not seat_ids or journey_date is None:
+            return set()
+
+        client = LocalRedisOTPService.get_client()
+        if client is None:
+            return set()
+
+        try:
+            holders = client.mget([cls._key(seat_id, journey_date) for seat_id in seat_ids])
+        except Exception:
+            logger.warning("Redis unavailable while reading seat holds for journey_date=%s", journey_date)
+            LocalRedisOTPService._reset_client()
+            return set()
+
+        return {seat_id for seat_id, holder in zip(seat_ids, holders) if holder is not None}
@@ -0,0 +1,69 @@
+import logging
+from collections import defaultdict
+
+from django.db import transaction
+
+from .models import Booking, Seat
+from .seat_bitmap_service import SeatBitmapService
+
+
+logger = logging.getLogger(__name__)
+
+
+def seat_numbers(count):
+    return [f"S{i}" for i in range(1, int(count) + 1)]
+
+
+def missing_seats(bus, existing_numbers):
+    return [
+        Seat(bus_id=bus.id, seat_number=number)
+        for number in seat_numbers(bus.no_of_seats)
+        if number not in existing_numbers
+    ]
+
+
+def provision_seats(bus):
+    return Seat.objects.bulk_create(missing_seats(bus, set()))
+
+
+def reconcile_seats(bus):
+    existing = dict(Seat.objects.filter(bus=bus).values_list("seat_number", "id"))
+    wanted = set(seat_numbers(bus.no_of_seats))
+
+    with transaction.atomic():
+        created = Seat.objects.bulk_create(missing_seats(bus, existing))
+
+        surplus_ids = [seat_id for number, seat_id in existing.items() if number not in wanted]
+        removed = 0
+        if surplus_ids:
+            booked_ids = set(
+                Booking.objects.filter(seat_id__in=surplus_ids).values_list("seat_id", flat=True)
+            )
+            if booked_ids:
+                logger.warning(
+                    "Keeping %s booked seat(s) beyond no_of_seats for bus_id=%s",
+                    len(booked_ids),
+                    bus.id,
+                )
+            removed, _ = Seat.objects.filter(
+                id__in=[seat_id for seat_id in surplus_ids if seat_id not in booked_ids]
+            ).delete()
+
+        if removed:
+            transaction.on_commit(lambda: SeatBitmapService.invalidate_bus(bus.id))
+
+    return len(created), removed
+
+
+def bulk_provision_seats(buses, batch_size=1000):
+    buses = list(buses)
+    existing = defaultdict(set)
+    for bus_id, number in Seat.objects.filter(bus__in=buses).values_list("bus_id", "seat_number"):
+        existing[bus_id].add(number)
+
+    seats = []
+    for bus in buses:
+        seats.extend(missing_seats(bus, existing[bus.id]))
+
+    Seat.objects.bulk_create(seats, batch_size=batch_size)
+    return len(seats)
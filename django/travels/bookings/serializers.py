@@ -1,6 +1,8 @@
 import logging
 from rest_framework import serializers
-from .models import Bus, Seat, Booking, Payment, Profile
+from .availability import SeatAvailability, journey_date_from_request
+from .models import Bus, Seat, Booking, BookingHistory, Payment, Profile
+from .utils import Util
 from django.contrib.auth.models import User
 
 
@@ -91,13 +93,24 @@ class SeatSerializer(serializers.ModelSerializer):
         fields = ["id", "seat_number", "is_booked"]
 
 
+class BusListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        buses = list(data.all() if hasattr(data, "all") else data)
+        self.context["seat_availability"] = SeatAvailability.for_buses(
+            buses,
+            journey_date_from_request(self.context.get("request")),
+        )
+        return super().to_representation(buses)
+
+
 class BusSerializers(serializers.ModelSerializer):
     seats = serializers.SerializerMethodField()
     image = serializers.SerializerMethodField()
 
     class Meta:
         model = Bus
-        fields = "__all__"
+        exclude = ["origin_normalized", "destination_normalized", "bus_name_normalized"]
+        list_serializer_class = BusListSerializer
 
     def get_image(self, obj):
         image = getattr(obj, "image", None)
@@ -114,29 +127,14 @@ class BusSerializers(serializers.ModelSerializer):
         return request.build_absolute_uri(image_url) if request else image_url
 
     def get_seats(self, obj):
-        request = self.context.get("request")
-        params = getattr(request, "query_params", None) or getattr(request, "GET", None)
-        date = params.get("date") if params else None
-
-        seats = Seat.objects.filter(bus=obj)
-        result = []
-
-        for seat in seats:
-            is_booked = False
+        availability = self.context.get("seat_availability")
+        if availability is None:
+            availability = SeatAvailability(
+                journey_date_from_request(self.context.get("request"))
+            )
+            self.context["seat_availability"] = availability
 
-            if date:
-                is_booked = Booking.objects.filter(
-                    seat=seat,
-                    journey_date=date
-                ).exists()
-
-            result.append({
-                "id": seat.id,
-                "seat_number": seat.seat_number,
-                "is_booked": is_booked,
-            })
-
-        return result
+        return availability.seats_for(obj)
 
 
 class BookingSerializer(serializers.ModelSerializer):
@@ -147,6 +145,7 @@ class BookingSerializer(serializers.ModelSerializer):
     bus_id = serializers.IntegerField(source="bus.id", read_only=True)
     seat_id = serializers.IntegerField(source="seat.id", read_only=True)
     seat_number = serializers.CharField(source="seat.seat_number", read_only=True)
+    status = serializers.SerializerMethodField()
 
     class Meta:
         model = Booking
@@ -164,6 +163,49 @@ class BookingSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["user", "booking_time", "bus", "seat", "status"]
 
+    def get_status(self, obj):
+        today = self.context.get("today")
+        return obj.effective_status(today)
+
+
+class BookingHistorySerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(source="booking_id", read_only=True)
+    user = serializers.StringRelatedField()
+    bus_id = serializers.IntegerField(read_only=True)
+    bus = serializers.SerializerMethodField()
+    seat = serializers.SerializerMethodField()
+    seat_id = serializers.SerializerMethodField()
+    archived = serializers.SerializerMethodField()
+
+    class Meta:
+        model = BookingHistory
+        fields = [
+            "id",
+            "user",
+            "bus",
+            "bus_id",
+            "seat",
+            "seat_id",
+            "seat_number",
+            "journey_date",
+            "status",
+            "booking_time",
+            "archived",
+        ]
+        read_only_fields = fields
+
+    def get_bus(self, obj):
+        return f"{obj.bus_name} {obj.origin} → {obj.destination}"
+
+    def get_seat(self, obj):
+        return f"{self.get_bus(obj)} {obj.seat_number} "
+
+    def get_seat_id(self, obj):
+        return None
+
+    def get_archived(self, obj):
+        return True
+
 
 class PaymentSerializer(serializers.ModelSerializer):
     class Meta:
@@ -185,7 +227,7 @@ class AdminBusSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Bus
-        fields = "__all__"
+        exclude = ["origin_normalized", "destination_normalized", "bus_name_normalized"]
 
     def get_image(self, obj):
         image = getattr(obj, "image", None)
@@ -201,6 +243,54 @@ class AdminBusSerializer(serializers.ModelSerializer):
         request = self.context.get("request")
         return request.build_absolute_uri(image_url) if request else image_url
 
+    def create(self, validated_data):
+        bus = super().create(validated_data)
+        Util.queue_route_map_prerender(bus.id)
+        return bus
+
+    def update(self, instance, validated_data):
+        previous_route = (instance.origin, instance.destination)
+        bus = super().update(instance, validated_data)
+        if (bus.origin, bus.destination) != previous_route:
+            Util.queue_route_map_prerender(bus.id)
+        return bus
+
+
+class AdminBusListSerializer(serializers.ModelSerializer):
+    image = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Bus
+        fields = [
+            "id",
+            "bus_name",
+            "number",
+            "origin",
+            "destination",
+            "features",
+            "start_time",
+            "reach_time",
+            "no_of_seats",
+            "price",
+            "is_active",
+            "image",
+        ]
+
+    def get_image(self, obj):
+        if not obj.image_url:
+            return None
+
+        request = self.context.get("request")
+        return request.build_absolute_uri(obj.image_url) if request else obj.image_url
+
+
+class FleetImportSerializer(AdminBusSerializer):
+    image = None
+
+    class Meta(AdminBusSerializer.Meta):
+        exclude = ["origin_normalized", "destination_normalized", "bus_name_normalized", "image"]
+        extra_kwargs = {"number": {"validators": []}}
+
 
 class AdminRecentBookingSerializer(serializers.ModelSerializer):
     bus_name = serializers.CharField(source="bus.bus_name")
@@ -1,14 +1,14 @@
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.contrib.auth.models import User
-from .models import Bus, Seat, Profile
+from .models import Bus, Profile
+from .seat_provisioning import provision_seats
 
 
 @receiver(post_save, sender=Bus)
 def create_seats_for_bus(sender, instance, created, **kwargs):
     if created and not kwargs.get("raw", False):
-        for i in range(1, int(instance.no_of_seats) + 1):
-            Seat.objects.create(bus=instance, seat_number=f"S{i}")
+        provision_seats(instance)
 
 
 @receiver(post_save, sender=User)
@@ -0,0 +1,158 @@
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .archive import archive_bookings, archive_payments
+from .models import Booking, Payment, Seat, SweeperRun
+
+
+logger = logging.getLogger(__name__)
+
+
+def pk_windows(queryset, batch_size, last_pk=0):
+    while True:
+        window = queryset.filter(pk__gt=last_pk).order_by("pk")
+        pks = list(window.values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            return
+
+        last_pk = pks[-1]
+        yield window.filter(pk__lte=last_pk), last_pk
+        if len(pks) < batch_size:
+            return
+
+
+def start_run(name, resume):
+    if resume:
+        run = SweeperRun.objects.filter(name=name, finished_at__isnull=True).order_by("-started_at").first()
+        if run is not None:
+            logger.info("Sweeper %s resuming after pk=%s", name, run.last_pk)
+            return run
+    return SweeperRun.objects.create(name=name, started_at=timezone.now())
+
+
+def run_sweeper(name, queryset, apply, batch_size=None, pause_seconds=0, resume=False):
+    batch_size = max(batch_size or settings.SWEEPER_BATCH_SIZE, 1)
+    run = start_run(name, resume)
+    started = time.perf_counter()
+    elapsed_before = run.elapsed_ms
+
+    for window, boundary in pk_windows(queryset, batch_size, run.last_pk):
+        with transaction.atomic():
+            affected = apply(window)
+            run.batches += 1
+            run.rows += affected
+            run.last_pk = boundary
+            run.elapsed_ms = elapsed_before + (time.perf_counter() - started) * 1000
+            run.save(update_fields=["batches", "rows", "last_pk", "elapsed_ms"])
+        if pause_seconds and affected:
+            time.sleep(pause_seconds)
+
+    run.finished_at = timezone.now()
+    run.elapsed_ms = elapsed_before + (time.perf_counter() - started) * 1000
+    run.save(update_fields=["finished_at", "elapsed_ms"])
+    SweeperRun.objects.filter(
+        started_at__lt=run.started_at - timedelta(days=settings.SWEEPER_RUN_RETENTION_DAYS)
+    ).delete()
+
+    logger.info(
+        "Sweeper %s touched %s row(s) in %s batch(es) in %.1fms",
+        name,
+        run.rows,
+        run.batches,
+        run.elapsed_ms,
+    )
+    return run
+
+
+def sweep_expired_seat_holds(batch_size=None):
+    return run_sweeper(
+        "seat_holds",
+        Seat.objects.filter(is_held=True).filter(
+            Q(hold_expires_at__isnull=True) | Q(hold_expires_at__lte=timezone.now())
+        ),
+        lambda window: window.update(is_held=False, hold_expires_at=None, hold_owner=None, hold_journey_date=None),
+        batch_size=batch_size,
+    )
+
+
+def sweep_abandoned_payments(batch_size=None):
+    cutoff = timezone.now() - timedelta(minutes=settings.ABANDONED_PAYMENT_MINUTES)
+    return run_sweeper(
+        "abandoned_payments",
+        Payment.objects.filter(status="CREATED", created_at__lt=cutoff),
+        lambda window: window.update(status="FAILED"),
+        batch_size=batch_size,
+    )
+
+
+def sweep_booking_statuses(batch_size=None):
+    return run_sweeper(
+        "booking_statuses",
+        Booking.objects.filter(status=Booking.STATUS_CONFIRMED, journey_date__lt=timezone.localdate()),
+        lambda window: window.update(status=Booking.STATUS_EXPIRED),
+        batch_size=batch_size,
+    )
+
+
+def stale_booking_cutoff():
+    return timezone.localdate() - timedelta(days=settings.STALE_BOOKING_RETENTION_DAYS)
+
+
+def stale_bookings():
+    return Booking.objects.filter(journey_date__lt=stale_booking_cutoff())
+
+
+def delete_bookings(window, archive=False):
+    booking_ids = archive_bookings(window) if archive else list(window.values_list("pk", flat=True))
+    if not booking_ids:
+        return 0
+    return Booking.objects.filter(pk__in=booking_ids).delete()[1].get(Booking._meta.label, 0)
+
+
+def sweep_stale_bookings(batch_size=None, pause_seconds=0, archive=None, resume=False):
+    if archive is None:
+        archive = settings.STALE_BOOKING_ARCHIVE
+    return run_sweeper(
+        "stale_bookings",
+        stale_bookings(),
+        lambda window: delete_bookings(window, archive=archive),
+        batch_size=batch_size,
+        pause_seconds=pause_seconds,
+        resume=resume,
+    )
+
+
+def archivable_payments():
+    cutoff = timezone.now() - timedelta(days=settings.PAYMENT_ARCHIVE_AFTER_DAYS)
+    return Payment.objects.filter(created_at__lt=cutoff, booking__isnull=True, bookings__isnull=True)
+
+
+def move_payments(window):
+    payment_ids = archive_payments(window)
+    if not payment_ids:
+        return 0
+    return Payment.objects.filter(pk__in=payment_ids).delete()[1].get(Payment._meta.label, 0)
+
+
+def sweep_archived_payments(batch_size=None, pause_seconds=0, resume=False):
+    return run_sweeper(
+        "archived_payments",
+        archivable_payments(),
+        move_payments,
+        batch_size=batch_size,
+        pause_seconds=pause_seconds,
+        resume=resume,
+    )
+
+
+def latest_sweeper_runs():
+    runs = {}
+    for run in SweeperRun.objects.filter(finished_at__isnull=False).order_by("name", "-started_at"):
+        runs.setdefault(run.name, run)
+    return runs
@@ -2,6 +2,17 @@ import logging
 import requests
 from celery import shared_task
 
+from .models import Bus, Ticket
+from .route_map_cache import prerender_route_map
+from .sweepers import (
+    sweep_abandoned_payments,
+    sweep_archived_payments,
+    sweep_booking_statuses,
+    sweep_expired_seat_holds,
+    sweep_stale_bookings,
+)
+from .ticket_service import TicketArtifactStore, generate_tickets_pdf_bytes
+from .tomtom_service import tomtom_key_configured
 from .utils import Util
 
 logger = logging.getLogger(__name__)
@@ -65,4 +76,159 @@ def send_templated_email_task(
             to_email,
             self.request.id,
         )
-        raise
\ No newline at end of file
+        raise
+
+
+@shared_task(
+    bind=True,
+    name="send_ticket_email_task",
+    autoretry_for=(requests.RequestException, TimeoutError),
+    retry_backoff=True,
+    retry_backoff_max=300,
+    retry_jitter=True,
+    retry_kwargs={"max_retries": 3},
+    soft_time_limit=60,
+    time_limit=90,
+)
+def send_ticket_email_task(self, ticket_id):
+    try:
+        ticket = Ticket.objects.select_related(
+            "booking", "booking__bus", "booking__seat", "booking__user"
+        ).get(id=ticket_id)
+    except Ticket.DoesNotExist:
+        logger.warning("Ticket email skipped, ticket_id=%s no longer exists task_id=%s", ticket_id, self.request.id)
+        return
+
+    booking = ticket.booking
+    user = booking.user
+    if not user.email:
+        return
+
+    pdf_bytes = TicketArtifactStore.get_or_render(ticket)
+
+    logger.info("Ticket email task started ticket_id=%s task_id=%s", ticket_id, self.request.id)
+
+    Util.send_templated_email(
+        subject="Your Bus Ticket – Travels App",
+        to_email=user.email,
+        template_name="emails/ticket_email.html",
+        context={
+            "username": user.username,
+            "ticket_id": ticket.id,
+            "bus_name": booking.bus.bus_name,
+            "origin": booking.bus.origin,
+            "destination": booking.bus.destination,
+            "seat_number": booking.seat.seat_number,
+            "start_time": booking.bus.start_time,
+            "reach_time": booking.bus.reach_time,
+        },
+        attachments=[{
+            "filename": f"ticket_{ticket.id}.pdf",
+            "content": pdf_bytes,
+        }],
+    )
+
+    logger.info("Ticket email sent ticket_id=%s task_id=%s", ticket_id, self.request.id)
+
+
+@shared_task(
+    bind=True,
+    name="send_group_ticket_email_task",
+    autoretry_for=(requests.RequestException, TimeoutError),
+    retry_backoff=True,
+    retry_backoff_max=300,
+    retry_jitter=True,
+    retry_kwargs={"max_retries": 3},
+    soft_time_limit=120,
+    time_limit=180,
+)
+def send_group_ticket_email_task(self, ticket_ids):
+    tickets = list(
+        Ticket.objects.select_related(
+            "booking", "booking__bus", "booking__seat", "booking__user"
+        ).filter(id__in=ticket_ids).order_by("booking__seat_id")
+    )
+    if not tickets:
+        logger.warning("Group ticket email skipped, ticket_ids=%s no longer exist task_id=%s", ticket_ids, self.request.id)
+        return
+
+    booking = tickets[0].booking
+    user = booking.user
+    if not user.email:
+        return
+
+    pdf_bytes = generate_tickets_pdf_bytes(tickets)
+
+    logger.info("Group ticket email task started ticket_ids=%s task_id=%s", ticket_ids, self.request.id)
+
+    Util.send_templated_email(
+        subject="Your Bus Tickets – Travels App",
+        to_email=user.email,
+        template_name="emails/ticket_email.html",
+        context={
+            "username": user.username,
+            "ticket_id": ", #".join(str(ticket.id) for ticket in tickets),
+            "bus_name": booking.bus.bus_name,
+            "origin": booking.bus.origin,
+            "destination": booking.bus.destination,
+            "seat_number": ", ".join(ticket.booking.seat.seat_number for ticket in tickets),
+            "start_time": booking.bus.start_time,
+            "reach_time": booking.bus.reach_time,
+        },
+        attachments=[{
+            "filename": f"tickets_{tickets[0].id}.pdf",
+            "content": pdf_bytes,
+        }],
+    )
+
+    logger.info("Group ticket email sent ticket_ids=%s task_id=%s", ticket_ids, self.request.id)
+
+
+@shared_task(
+    bind=True,
+    name="prerender_route_map_task",
+    autoretry_for=(requests.RequestException, TimeoutError),
+    retry_backoff=True,
+    retry_backoff_max=300,
+    retry_jitter=True,
+    retry_kwargs={"max_retries": 3},
+    soft_time_limit=60,
+    time_limit=90,
+)
+def prerender_route_map_task(self, bus_id):
+    bus = Bus.objects.filter(id=bus_id, is_active=True).only("origin", "destination").first()
+    if bus is None or not tomtom_key_configured():
+        return
+
+    try:
+        prerender_route_map(bus.origin, bus.destination)
+    except ValueError as exc:
+        logger.warning("Route map prerender skipped bus_id=%s reason=%s task_id=%s", bus_id, exc, self.request.id)
+        return
+
+    logger.info("Route map prerendered bus_id=%s task_id=%s", bus_id, self.request.id)
+
+
+@shared_task(name="sweep_expired_seat_holds_task", ignore_result=True, soft_time_limit=50, time_limit=60)
+def sweep_expired_seat_holds_task():
+    return sweep_expired_seat_holds().rows
+
+
+@shared_task(name="sweep_abandoned_payments_task", ignore_result=True, soft_time_limit=300, time_limit=360)
+def sweep_abandoned_payments_task():
+    return sweep_abandoned_payments().rows
+
+
+@shared_task(name="sweep_booking_statuses_task", ignore_result=True, soft_time_limit=300, time_limit=360)
+def sweep_booking_statuses_task():
+    return sweep_booking_statuses().rows
+
+
+@shared_task(name="sweep_stale_bookings_task", ignore_result=True, soft_time_limit=900, time_limit=960)
+def sweep_stale_bookings_task():
+    return sweep_stale_bookings(resume=True).rows
+
+
+@shared_task(name="sweep_archived_payments_task", ignore_result=True, soft_time_limit=900, time_limit=960)
+def sweep_archived_payments_task():
+    return sweep_archived_payments(resume=True).rows
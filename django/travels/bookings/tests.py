@@ -1,11 +1,105 @@
-from unittest.mock import patch
+import asyncio
+import csv
+import io
+import json
+import tempfile
+import time as clock
+from array import array
+from datetime import date, time, timedelta
+from unittest.mock import Mock, patch
 
+import httpx
+import requests
+from asgiref.sync import async_to_sync
+from django.conf import settings
 from django.contrib.auth.models import User
-from django.test import TestCase
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import resolve
+from django.utils import timezone
 from rest_framework.test import APIRequestFactory, force_authenticate
 
+from . import http_client
+from .archive import archive_bookings, archive_payments
+from .availability import SeatAvailability
+from .dashboard_rollups import rollup_totals
+from .exports import EXPORTS
+from .models import (
+    Booking,
+    BookingHistory,
+    Bus,
+    DailyBusRollup,
+    GeocodeCacheEntry,
+    Payment,
+    PaymentHistory,
+    Seat,
+    SweeperRun,
+    Ticket,
+)
+from .route_geometry import decode_polyline, encode_polyline, route_bbox, simplify
+from .route_map_cache import build_geometry, route_cache, route_cache_key
+from .redis_service import LocalRedisOTPService
+from .seat_bitmap_service import SeatBitmapService
+from .seat_hold_service import ACQUIRE_HOLDS, SeatHoldService
+from .sweepers import (
+    sweep_abandoned_payments,
+    sweep_archived_payments,
+    sweep_booking_statuses,
+    sweep_expired_seat_holds,
+    sweep_stale_bookings,
+)
+from .tasks import prerender_route_map_task
+from .ticket_service import draw_card_background, generate_ticket_pdf_bytes, ticket_card_stream
+from .tomtom_service import clear_geocode_memory_cache, fetch_route_map_image, geocode_location
 from .serializers import UserProfileSerializer
-from .views import UserProfileView
+from .views import (
+    AdminAnalyticsView,
+    AdminBusDetailView,
+    AdminBusImportView,
+    AdminBusListCreateView,
+    AdminDashboardSummaryView,
+    AdminExportView,
+    AdminTotalRevenueView,
+    BookingTicketView,
+    BusDetailView,
+    BusListCreateApiView,
+    BusRouteMapView,
+    BusRouteView,
+    CancelBookingView,
+    CreatePaymentOrderView,
+    MyBookingsView,
+    PaymentTicketsView,
+    RefundTicketView,
+    ReleaseSeatHoldView,
+    SyncBusRouteMapView,
+    SyncBusRouteView,
+    UserProfileView,
+    VerifyPaymentView,
+    clamp_tolerance,
+)
+
+
+def use_temp_ticket_storage(test_case):
+    artifact_root = test_case.enterContext(tempfile.TemporaryDirectory())
+    test_case.enterContext(override_settings(TICKET_ARTIFACT_STORAGE_OPTIONS={"location": artifact_root}))
+
+
+def create_bus(number, **overrides):
+    fields = {
+        "bus_name": f"Bus {number}",
+        "number": number,
+        "origin": "Delhi",
+        "destination": "Jaipur",
+        "features": "AC",
+        "start_time": time(8, 0),
+        "reach_time": time(14, 0),
+        "no_of_seats": 4,
+        "price": "500.00",
+    }
+    fields.update(overrides)
+    return Bus.objects.create(**fields)
 
 
 class UserProfileTests(TestCase):
@@ -34,3 +128,1228 @@ class UserProfileTests(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data["avatar"], None)
         self.assertEqual(response.data["email"], "demo@example.com")
+
+
+class BusSeatAvailabilityTests(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(username="rider", password="strong-password-123")
+
+    def book(self, bus, seat_index, journey_date):
+        seat = bus.seats.order_by("id")[seat_index]
+        return Booking.objects.create(user=self.user, bus=bus, seat=seat, journey_date=journey_date)
+
+    def list_buses(self, **params):
+        request = self.factory.get("/api/buses/", params)
+        return BusListCreateApiView.as_view()(request)
+
+    def test_list_marks_seats_booked_only_for_requested_date(self):
+        bus = create_bus("DL-01")
+        self.book(bus, 0, "2030-01-10")
+        self.book(bus, 2, "2030-01-11")
+
+        response = self.list_buses(date="2030-01-10")
+
+        self.assertEqual(response.status_code, 200)
+        seats = response.data[0]["seats"]
+        self.assertEqual([seat["is_booked"] for seat in seats], [True, False, False, False])
+
+    def test_route_search_matches_partial_normalized_city_names(self):
+        create_bus("DL-04", origin="  New   Delhi ", destination="Jaipur")
+        create_bus("DL-05", origin="Mumbai", destination="Pune")
+
+        response = self.list_buses(origin="new del", destination="JAIP")
+
+        self.assertEqual([bus["number"] for bus in response.data], ["DL-04"])
+        self.assertNotIn("origin_normalized", response.data[0])
+
+    def test_list_query_count_is_independent_of_fleet_size(self):
+        for index in range(2):
+            self.book(create_bus(f"DL-A{index}"), 0, "2030-01-10")
+
+        with self.assertNumQueries(3):
+            small = self.list_buses(date="2030-01-10")
+            small.render()
+
+        for index in range(6):
+            self.book(create_bus(f"DL-B{index}"), 1, "2030-01-10")
+
+        with self.assertNumQueries(3):
+            large = self.list_buses(date="2030-01-10")
+            large.render()
+
+        self.assertEqual(len(large.data), 8)
+
+    def test_booking_committed_while_bitmap_is_filled_is_patched_in(self):
+        bus = create_bus("DL-06")
+        self.book(bus, 0, "2030-01-10")
+
+        def store_after_concurrent_booking(bitmaps, journey_date):
+            self.book(bus, 2, "2030-01-10")
+            return True
+
+        with patch.object(SeatBitmapService, "store_many", side_effect=store_after_concurrent_booking), patch.object(
+            SeatBitmapService, "set_offset"
+        ) as set_offset:
+            response = self.list_buses(date="2030-01-10")
+            response.render()
+
+        set_offset.assert_called_once_with(bus.id, 2, date(2030, 1, 10), True)
+        self.assertEqual([seat["is_booked"] for seat in response.data[0]["seats"]], [True, False, True, False])
+
+    def test_detail_uses_same_availability_engine(self):
+        bus = create_bus("DL-02")
+        self.book(bus, 1, "2030-01-10")
+
+        request = self.factory.get(f"/api/buses/{bus.id}/", {"date": "2030-01-10"})
+        with self.assertNumQueries(3):
+            response = BusDetailView.as_view()(request, pk=bus.id)
+
+        self.assertEqual([seat["is_booked"] for seat in response.data["seats"]], [False, True, False, False])
+
+    def test_list_reads_cached_bitmap_without_querying_bookings(self):
+        bus = create_bus("DL-03")
+        seat_ids = list(bus.seats.order_by("id").values_list("id", flat=True))
+        bitmap = SeatBitmapService.encode(seat_ids, {seat_ids[3]})
+
+        with patch.object(SeatBitmapService, "get_many", return_value={bus.id: bitmap}):
+            with self.assertNumQueries(2):
+                response = self.list_buses(date="2030-01-10")
+                response.render()
+
+        self.assertEqual([seat["is_booked"] for seat in response.data[0]["seats"]], [False, False, False, True])
+
+
+class SeatProvisioningTests(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.admin = User.objects.create_user(username="admin", password="strong-password-123", is_staff=True)
+
+    def update_bus(self, bus, **data):
+        request = self.factory.put(f"/api/admin/buses/{bus.id}/", data, format="multipart")
+        force_authenticate(request, user=self.admin)
+        return AdminBusDetailView.as_view()(request, pk=bus.id)
+
+    def seat_numbers(self, bus):
+        return sorted(bus.seats.values_list("seat_number", flat=True), key=lambda number: int(number[1:]))
+
+    def test_new_bus_seats_are_created_in_one_insert(self):
+        with self.assertNumQueries(2):
+            bus = create_bus("RJ-01", no_of_seats=60)
+
+        self.assertEqual(bus.seats.count(), 60)
+
+    def test_updating_seat_count_adds_and_removes_only_the_delta(self):
+        bus = create_bus("RJ-02")
+        original_ids = set(bus.seats.values_list("id", flat=True))
+
+        response = self.update_bus(bus, no_of_seats=6)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.seat_numbers(bus), ["S1", "S2", "S3", "S4", "S5", "S6"])
+        self.assertTrue(original_ids <= set(bus.seats.values_list("id", flat=True)))
+
+        self.update_bus(bus, no_of_seats=3)
+        self.assertEqual(self.seat_numbers(bus), ["S1", "S2", "S3"])
+
+    def test_shrinking_keeps_seats_with_bookings(self):
+        bus = create_bus("RJ-03")
+        user = User.objects.create_user(username="rider", password="strong-password-123")
+        Booking.objects.create(user=user, bus=bus, seat=bus.seats.get(seat_number="S4"), journey_date="2030-01-10")
+
+        self.update_bus(bus, no_of_seats=2)
+
+        self.assertEqual(self.seat_numbers(bus), ["S1", "S2", "S4"])
+
+
+class FleetImportTests(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.admin = User.objects.create_user(username="fleet", password="strong-password-123", is_staff=True)
+        create_bus("FL-EXISTING")
+
+    def row(self, number, **overrides):
+        row = {
+            "bus_name": f"Fleet {number}",
+            "number": number,
+            "origin": " New  Delhi ",
+            "destination": "Jaipur",
+            "features": "AC",
+            "start_time": "08:00",
+            "reach_time": "14:00",
+            "no_of_seats": 3,
+            "price": "450.00",
+        }
+        row.update(overrides)
+        return row
+
+    def post(self, data, **params):
+        path = "/api/admin/buses/import/"
+        if params:
+            path += "?" + "&".join(f"{key}={value}" for key, value in params.items())
+        request = self.factory.post(path, data, format="json")
+        force_authenticate(request, user=self.admin)
+        return AdminBusImportView.as_view()(request)
+
+    def test_valid_rows_are_bulk_created_and_errors_reported_per_row(self):
+        rows = [self.row(f"FL-{index}") for index in range(20)]
+        rows += [self.row("FL-EXISTING"), self.row("FL-3"), self.row("FL-BAD", no_of_seats="many")]
+
+        with self.assertNumQueries(6):
+            response = self.post(rows)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data["created"], response.data["seats"]), (20, 60))
+        self.assertEqual([error["row"] for error in response.data["errors"]], [21, 22, 23])
+        self.assertIn("no_of_seats", response.data["errors"][2]["errors"])
+        bus = Bus.objects.get(number="FL-7")
+        self.assertEqual(bus.origin_normalized, "new delhi")
+        self.assertEqual(sorted(bus.seats.values_list("seat_number", flat=True)), ["S1", "S2", "S3"])
+
+    def test_dry_run_and_csv_command(self):
+        response = self.post({"buses": [self.row("FL-DRY")]}, dry_run=1)
+        self.assertEqual((response.status_code, response.data["created"]), (200, 0))
+        self.assertFalse(Bus.objects.filter(number="FL-DRY").exists())
+
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as handle:
+            writer = csv.DictWriter(handle, fieldnames=list(self.row("x")))
+            writer.writeheader()
+            writer.writerow(self.row("FL-CSV"))
+        out = io.StringIO()
+        call_command("import_fleet", handle.name, stdout=out)
+
+        self.assertIn("Created 1 bus(es) and 3 seat(s)", out.getvalue())
+        self.assertEqual(Bus.objects.get(number="FL-CSV").seats.count(), 3)
+
+    def upload(self, content):
+        request = self.factory.post(
+            "/api/admin/buses/import/",
+            {"file": SimpleUploadedFile("fleet.csv", content, content_type="text/csv")},
+            format="multipart",
+        )
+        force_authenticate(request, user=self.admin)
+        return AdminBusImportView.as_view()(request)
+
+    def test_short_csv_rows_and_bad_encoding_are_client_errors(self):
+        response = self.upload(b"number,bus_name,origin\nX1,Foo\n")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["errors"][0]["row"], 1)
+        self.assertIn("origin", response.data["errors"][0]["errors"])
+
+        response = self.upload(b"number,bus_name\n\xff\xfe,Foo\n")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["error"], "File must be UTF-8 encoded")
+
+
+class AdminBusListTests(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.admin = User.objects.create_user(username="fleet", password="strong-password-123", is_staff=True)
+
+    def list_buses(self, url="/api/admin/buses/", **params):
+        request = self.factory.get(url, params)
+        force_authenticate(request, user=self.admin)
+        return AdminBusListCreateView.as_view()(request)
+
+    def test_pages_by_id_without_loading_image_field(self):
+        buses = [create_bus(f"PG-{index}") for index in range(5)]
+        Bus.objects.filter(pk=buses[0].pk).update(image="buses/pg.png", image_url="/media/buses/pg.png")
+
+        with self.assertNumQueries(1) as queries:
+            first = self.list_buses(page_size=3)
+        self.assertNotIn('"image",', queries.captured_queries[0]["sql"])
+        self.assertEqual([bus["number"] for bus in first.data["results"]], ["PG-4", "PG-3", "PG-2"])
+
+        second = self.list_buses(first.data["next"])
+        self.assertEqual([bus["number"] for bus in second.data["results"]], ["PG-1", "PG-0"])
+        self.assertIsNone(second.data["next"])
+        self.assertEqual(second.data["results"][1]["image"], "/media/buses/pg.png")
+
+    def test_filters_by_status_route_and_operator(self):
+        create_bus("FI-1", bus_name="Shatabdi Travels")
+        create_bus("FI-2", bus_name="Shatabdi Travels", destination="Agra")
+        create_bus("FI-3", bus_name="Shatabdi Travels", is_active=False)
+        create_bus("FI-4", bus_name="Royal Coaches")
+
+        with self.assertNumQueries(1) as queries:
+            response = self.list_buses(active="true", operator="  SHATABDI   travels ", destination="jaipur")
+        self.assertEqual([bus["number"] for bus in response.data["results"]], ["FI-1"])
+        self.assertIn("bus_name_normalized", queries.captured_queries[0]["sql"])
+        self.assertEqual(
+            [bus["number"] for bus in self.list_buses(operator="ro").data["results"]],
+            ["FI-4"],
+        )
+        self.assertEqual(self.list_buses(active="maybe").status_code, 400)
+
+    def test_saving_an_image_precomputes_its_url(self):
+        bus = create_bus("IM-1")
+        bus.image = "buses/im.png"
+        bus.save()
+
+        bus.refresh_from_db()
+        self.assertTrue(bus.image_url.endswith("buses/im.png"))
+
+
+@patch("bookings.views.client")
+class BookingConflictTests(TestCase):
+    def setUp(self):
+        use_temp_ticket_storage(self)
+        self.factory = APIRequestFactory()
+        self.bus = create_bus("MH-01")
+        self.seat = self.bus.seats.order_by("id").first()
+        self.first = User.objects.create_user(username="first", password="strong-password-123")
+        self.second = User.objects.create_user(username="second", password="strong-password-123")
+
+    def verify(self, user, order_id):
+        Payment.objects.create(user=user, razorpay_order_id=order_id, amount=50000)
+        request = self.factory.post(
+            "/api/payments/verify/",
+            {
+                "razorpay_order_id": order_id,
+                "razorpay_payment_id": f"pay_{order_id}",
+                "razorpay_signature": "signature",
+                "seat_id": self.seat.id,
+                "journey_date": "2030-01-10",
+            },
+            format="json",
+        )
+        force_authenticate(request, user=user)
+        return VerifyPaymentView.as_view()(request)
+
+    def test_second_confirmation_for_same_seat_and_date_is_rejected(self, _client):
+        self.assertEqual(self.verify(self.first, "order_1").status_code, 200)
+
+        response = self.verify(self.second, "order_2")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["error"], "Seat already booked for this date")
+        self.assertEqual(Booking.objects.filter(seat=self.seat).count(), 1)
+        self.assertEqual(Payment.objects.get(razorpay_order_id="order_2").status, "CREATED")
+
+    def test_group_confirmation_books_every_seat_with_one_combined_pdf(self, _client):
+        self.first.email = "first@example.com"
+        self.first.save()
+        seats = list(self.bus.seats.order_by("id")[:3])
+        Payment.objects.create(
+            user=self.first,
+            razorpay_order_id="order_group",
+            amount=150000,
+            seat_ids=[seat.id for seat in seats],
+            journey_date="2030-01-10",
+        )
+        request = self.factory.post(
+            "/api/payments/verify/",
+            {
+                "razorpay_order_id": "order_group",
+                "razorpay_payment_id": "pay_group",
+                "razorpay_signature": "signature",
+                "journey_date": "2030-01-10",
+            },
+            format="json",
+        )
+        force_authenticate(request, user=self.first)
+
+        with patch("bookings.tasks.send_group_ticket_email_task.delay") as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = VerifyPaymentView.as_view()(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            sorted(Booking.objects.filter(order_payment__razorpay_order_id="order_group").values_list("seat_id", flat=True)),
+            [seat.id for seat in seats],
+        )
+        ticket_ids = delay.call_args.kwargs["ticket_ids"]
+        self.assertEqual(Ticket.objects.filter(id__in=ticket_ids).count(), 3)
+
+        request = self.factory.get("/api/payments/order_group/tickets/")
+        force_authenticate(request, user=self.first)
+        pdf = PaymentTicketsView.as_view()(request, order_id="order_group")
+        self.assertEqual(pdf["Content-Type"], "application/pdf")
+        self.assertIn(b"/Count 3", pdf.content)
+
+        rollup = DailyBusRollup.objects.get()
+        self.assertEqual((rollup.bus_id, rollup.bookings, rollup.revenue), (self.bus.id, 3, 150000))
+
+    def test_refunds_and_cancellations_match_a_rollup_rebuild(self, _client):
+        seats = list(self.bus.seats.order_by("id")[:3])
+        Payment.objects.create(
+            user=self.first,
+            razorpay_order_id="order_group",
+            amount=150000,
+            seat_ids=[seat.id for seat in seats],
+            journey_date="2030-01-10",
+        )
+        request = self.factory.post(
+            "/api/payments/verify/",
+            {
+                "razorpay_order_id": "order_group",
+                "razorpay_payment_id": "pay_group",
+                "razorpay_signature": "signature",
+                "journey_date": "2030-01-10",
+            },
+            format="json",
+        )
+        force_authenticate(request, user=self.first)
+        with self.captureOnCommitCallbacks(execute=True):
+            VerifyPaymentView.as_view()(request)
+
+        refunded, cancelled, _ = Booking.objects.order_by("id")
+        request = self.factory.post(f"/api/bookings/{refunded.id}/refund/")
+        force_authenticate(request, user=self.first)
+        self.assertEqual(RefundTicketView.as_view()(request, booking_id=refunded.id).status_code, 200)
+
+        request = self.factory.post("/api/bookings/cancel/", {"booking_id": cancelled.id}, format="json")
+        force_authenticate(request, user=self.first)
+        self.assertEqual(CancelBookingView.as_view()(request).status_code, 200)
+
+        payment = Payment.objects.get(razorpay_order_id="order_group")
+        self.assertEqual((payment.status, payment.refunded_amount, payment.refunded_seats), ("SUCCESS", 50000, 1))
+
+        incremental = rollup_totals(DailyBusRollup.objects.all())
+        self.assertEqual(incremental, {"bookings": 1, "revenue": 1000, "refunds": 1, "refunded": 500})
+
+        call_command("rebuild_dashboard_rollups", stdout=io.StringIO())
+        self.assertEqual(rollup_totals(DailyBusRollup.objects.all()), incremental)
+
+    def test_confirmation_enqueues_ticket_email_by_id_only(self, _client):
+        self.first.email = "first@example.com"
+        self.first.save()
+
+        with patch("bookings.tasks.send_ticket_email_task.delay") as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.verify(self.first, "order_3")
+
+        self.assertEqual(response.status_code, 200)
+        ticket = Ticket.objects.get(booking_id=response.data["booking_id"])
+        delay.assert_called_once_with(ticket_id=ticket.id)
+
+
+class FakeHoldRedis:
+    def __init__(self):
+        self.store = {}
+
+    def eval(self, script, numkeys, *args):
+        keys, owner = args[:numkeys], args[numkeys]
+        if script == ACQUIRE_HOLDS:
+            if any(self.store.get(key) not in (None, owner) for key in keys):
+                return 0
+            self.store.update({key: owner for key in keys})
+            return 1
+        released = [key for key in keys if self.store.get(key) == owner]
+        for key in released:
+            del self.store[key]
+        return len(released)
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def mget(self, keys):
+        return [self.store.get(key) for key in keys]
+
+
+@patch("bookings.views.client")
+class SeatHoldTests(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.bus = create_bus("GJ-01")
+        self.seat = self.bus.seats.order_by("id").first()
+        self.first = User.objects.create_user(username="first", password="strong-password-123")
+        self.second = User.objects.create_user(username="second", password="strong-password-123")
+        self.redis = FakeHoldRedis()
+        self.orders = 0
+
+    def new_order(self, data):
+        self.orders += 1
+        return {"id": f"order_{self.orders}"}
+
+    def post(self, view, path, user, journey_date):
+        request = self.factory.post(path, {"seat_id": self.seat.id, "journey_date": journey_date}, format="json")
+        force_authenticate(request, user=user)
+        return view.as_view()(request)
+
+    def hold(self, user, journey_date="2030-01-10"):
+        return self.post(CreatePaymentOrderView, "/api/payments/create-order/", user, journey_date)
+
+    def hold_group(self, user, seats, journey_date="2030-01-10"):
+        request = self.factory.post(
+            "/api/payments/create-order/",
+            {"seat_ids": [seat.id for seat in seats], "journey_date": journey_date},
+            format="json",
+        )
+        force_authenticate(request, user=user)
+        return CreatePaymentOrderView.as_view()(request)
+
+    def test_redis_holds_are_per_seat_and_date_without_row_writes(self, client):
+        client.order.create.side_effect = self.new_order
+
+        with patch.object(LocalRedisOTPService, "get_client", return_value=self.redis):
+            self.assertEqual(self.hold(self.first).status_code, 200)
+            self.assertEqual(self.hold(self.first).status_code, 200)
+            self.assertEqual(self.hold(self.second).status_code, 400)
+            self.assertEqual(self.hold(self.second, "2030-01-11").status_code, 200)
+
+            self.post(ReleaseSeatHoldView, "/api/payments/release-hold/", self.first, "2030-01-10")
+            self.assertEqual(self.hold(self.second).status_code, 200)
+
+        self.seat.refresh_from_db()
+        self.assertFalse(self.seat.is_held)
+
+    def test_held_seats_are_reported_for_their_date_only(self, client):
+        client.order.create.side_effect = self.new_order
+
+        with patch.object(LocalRedisOTPService, "get_client", return_value=self.redis):
+            self.hold(self.first)
+            held = SeatAvailability.for_buses([self.bus], date(2030, 1, 10)).seats_for(self.bus)
+            free = SeatAvailability.for_buses([self.bus], date(2030, 1, 11)).seats_for(self.bus)
+
+        self.assertTrue(held[0]["is_held"])
+        self.assertFalse(free[0]["is_held"])
+
+    def test_group_hold_is_all_or_nothing(self, client):
+        client.order.create.side_effect = self.new_order
+        seats = list(self.bus.seats.order_by("id"))
+
+        with patch.object(LocalRedisOTPService, "get_client", return_value=self.redis):
+            self.assertEqual(self.hold(self.first).status_code, 200)
+            self.assertEqual(self.hold_group(self.second, seats[:3]).status_code, 400)
+            held = SeatHoldService.held_seat_ids([seat.id for seat in seats], "2030-01-10")
+            response = self.hold_group(self.second, seats[1:4])
+
+        self.assertEqual(held, {self.seat.id})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["amount"], 3 * 50000)
+        self.assertEqual(Payment.objects.get(razorpay_order_id=response.data["order_id"]).seat_ids, [s.id for s in seats[1:4]])
+
+    def test_database_group_hold_rolls_back_when_one_seat_is_taken(self, client):
+        client.order.create.side_effect = self.new_order
+        seats = list(self.bus.seats.order_by("id"))
+
+        with patch.object(LocalRedisOTPService, "get_client", return_value=None):
+            self.hold(self.first)
+            response = self.hold_group(self.second, [seats[1], seats[0]])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Seat.objects.get(id=seats[1].id).is_held)
+
+    def test_database_hold_is_used_when_redis_is_down(self, client):
+        client.order.create.side_effect = self.new_order
+        broken = FakeHoldRedis()
+        broken.eval = Mock(side_effect=ConnectionError("redis down"))
+
+        with patch.object(LocalRedisOTPService, "get_client", return_value=broken):
+            self.assertEqual(self.hold(self.first).status_code, 200)
+            self.assertEqual(self.hold(self.second).status_code, 400)
+
+        self.seat.refresh_from_db()
+        self.assertTrue(self.seat.is_held)
+
+    def test_hold_is_lost_only_to_another_holder_on_the_same_date_on_both_backends(self, client):
+        def expire(redis):
+            if redis is None:
+                Seat.objects.filter(id=self.seat.id).update(hold_expires_at=timezone.now() - timedelta(seconds=1))
+            else:
+                redis.store.clear()
+
+        for redis in (FakeHoldRedis(), None):
+            with self.subTest(backend="redis" if redis else "database"), patch.object(
+                LocalRedisOTPService, "get_client", return_value=redis
+            ):
+                Seat.objects.filter(id=self.seat.id).update(
+                    is_held=False, hold_expires_at=None, hold_owner=None, hold_journey_date=None
+                )
+
+                def is_lost(user, journey_date="2030-01-10"):
+                    return SeatHoldService.is_lost([Seat.objects.get(id=self.seat.id)], journey_date, user)
+
+                self.assertTrue(SeatHoldService.acquire([self.seat], "2030-01-10", self.first))
+                self.assertFalse(is_lost(self.first))
+                self.assertTrue(is_lost(self.second))
+                self.assertFalse(is_lost(self.second, "2030-01-11"))
+
+                expire(redis)
+                self.assertFalse(is_lost(self.first))
+                self.assertFalse(is_lost(self.second))
+
+                self.assertTrue(SeatHoldService.acquire([self.seat], "2030-01-10", self.second))
+                self.assertTrue(is_lost(self.first))
+
+    def test_database_hold_can_be_retried_by_its_owner(self, client):
+        client.order.create.side_effect = self.new_order
+
+        with patch.object(LocalRedisOTPService, "get_client", return_value=None):
+            self.assertEqual(self.hold(self.first).status_code, 200)
+            self.assertEqual(self.hold(self.first).status_code, 200)
+            self.assertEqual(self.hold(self.second).status_code, 400)
+            self.assertEqual(self.hold(self.first, "2030-01-11").status_code, 400)
+
+    def test_database_hold_can_only_be_released_by_its_owner(self, client):
+        client.order.create.side_effect = self.new_order
+
+        with patch.object(LocalRedisOTPService, "get_client", return_value=None):
+            self.assertEqual(self.hold(self.first).status_code, 200)
+            self.post(ReleaseSeatHoldView, "/api/payments/release-hold/", self.second, "2030-01-10")
+            self.post(ReleaseSeatHoldView, "/api/payments/release-hold/", self.first, "2030-01-11")
+
+            self.seat.refresh_from_db()
+            self.assertTrue(self.seat.is_held)
+            self.assertEqual(self.seat.hold_owner, self.first)
+            self.assertEqual(self.hold(self.second).status_code, 400)
+
+            self.post(ReleaseSeatHoldView, "/api/payments/release-hold/", self.first, "2030-01-10")
+
+        self.seat.refresh_from_db()
+        self.assertFalse(self.seat.is_held)
+        self.assertIsNone(self.seat.hold_owner)
+
+
+class MyBookingsTests(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(username="rider", password="strong-password-123")
+        self.bus = create_bus("KA-01", no_of_seats=30)
+        self.seats = list(self.bus.seats.order_by("id"))
+
+    def add_bookings(self, count, journey_date="2030-01-10"):
+        for seat in self.seats[:count]:
+            Booking.objects.create(user=self.user, bus=self.bus, seat=seat, journey_date=journey_date)
+        self.seats = self.seats[count:]
+
+    def my_bookings(self, **params):
+        request = self.factory.get("/api/my/bookings/", params)
+        force_authenticate(request, user=self.user)
+        response = MyBookingsView.as_view()(request)
+        response.render()
+        return response
+
+    def test_query_count_is_independent_of_booking_history(self):
+        self.add_bookings(2)
+        with self.assertNumQueries(2):
+            self.my_bookings()
+
+        self.add_bookings(25)
+        with self.assertNumQueries(2):
+            response = self.my_bookings()
+
+        self.assertEqual(len(response.data["results"]), 20)
+        self.assertIsNotNone(response.data["next"])
+
+    def test_past_bookings_are_reported_expired_without_writes(self):
+        self.add_bookings(1, journey_date="2020-01-10")
+
+        response = self.my_bookings()
+
+        self.assertEqual(response.data["results"][0]["status"], Booking.STATUS_EXPIRED)
+        self.assertEqual(Booking.objects.get().status, Booking.STATUS_CONFIRMED)
+
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(username="archived", password="strong-password-123")
+        self.admin = User.objects.create_user(username="boss", password="strong-password-123", is_staff=True)
+        self.bus = create_bus("RJ-01", no_of_seats=6)
+        self.seats = list(self.bus.seats.order_by("id"))
+
+    def book(self, seat, journey_date, order_id, amount=50000):
+        booking = Booking.objects.create(user=self.user, bus=self.bus, seat=seat, journey_date=journey_date)
+        Ticket.objects.create(booking=booking, user=self.user)
+        Payment.objects.create(
+            user=self.user,
+            booking=booking,
+            razorpay_order_id=order_id,
+            amount=amount,
+            status="SUCCESS",
+        )
+        return booking
+
+    def get(self, view, path, user, **params):
+        request = self.factory.get(path, params)
+        force_authenticate(request, user=user)
+        response = view.as_view()(request)
+        response.render()
+        return response
+
+    def test_my_bookings_pages_from_live_into_history(self):
+        past = [self.book(seat, "2020-01-10", f"order_past_{seat.id}") for seat in self.seats[:3]]
+        live = [self.book(seat, "2030-01-10", f"order_live_{seat.id}") for seat in self.seats[3:5]]
+        sweep_stale_bookings(archive=True)
+
+        first = self.get(MyBookingsView, "/api/my/bookings/", self.user, page_size=3)
+        second = self.get(MyBookingsView, first.data["next"], self.user)
+
+        self.assertEqual(
+            [row["id"] for row in first.data["results"] + second.data["results"]],
+            [booking.id for booking in reversed(past + live)],
+        )
+        self.assertIsNone(second.data["next"])
+        archived = second.data["results"][-1]
+        self.assertTrue(archived["archived"])
+        self.assertEqual(archived["status"], Booking.STATUS_EXPIRED)
+        self.assertEqual(archived["bus_id"], self.bus.id)
+
+    @override_settings(PAYMENT_ARCHIVE_AFTER_DAYS=0)
+    def test_rebuilt_dashboard_rollups_cover_live_and_archived_rows(self):
+        for seat in self.seats[:3]:
+            self.book(seat, "2020-01-10", f"order_past_{seat.id}")
+        self.book(self.seats[3], "2030-01-10", "order_live", amount=70000)
+        Payment.objects.create(user=self.user, razorpay_order_id="order_failed", amount=90000, status="FAILED")
+
+        sweep_stale_bookings(archive=True)
+        run = sweep_archived_payments()
+
+        self.assertEqual(run.rows, 4)
+        self.assertEqual(Payment.objects.get().razorpay_order_id, "order_live")
+        self.assertEqual(PaymentHistory.objects.count(), 4)
+        self.assertEqual(Booking.objects.count(), 1)
+
+        call_command("rebuild_dashboard_rollups", stdout=io.StringIO())
+        caches["default"].clear()
+
+        with self.assertNumQueries(4):
+            summary = self.get(AdminDashboardSummaryView, "/api/admin/dashboard/summary/", self.admin)
+        revenue = self.get(AdminTotalRevenueView, "/api/admin/dashboard/total-revenue/", self.admin)
+
+        self.assertEqual(summary.data["total_revenue"], 2200)
+        self.assertEqual(summary.data["total_bookings"], 4)
+        self.assertEqual(summary.data["active_buses"], 1)
+        self.assertEqual(len(summary.data["recent_bookings"]), 1)
+        self.assertEqual(revenue.data["total_revenue"], 2200)
+
+    def test_replayed_archive_batches_are_not_counted_twice(self):
+        self.book(self.seats[0], "2020-01-10", "order_replay")
+        bookings = Booking.objects.all()
+        payments = Payment.objects.all()
+
+        for _ in range(2):
+            self.assertEqual(len(archive_bookings(bookings)), 1)
+            self.assertEqual(len(archive_payments(payments)), 1)
+
+        self.assertEqual(BookingHistory.objects.count(), 1)
+        self.assertEqual(PaymentHistory.objects.count(), 1)
+
+
+class AnalyticsTests(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        self.factory = APIRequestFactory()
+        self.admin = User.objects.create_user(username="analyst", password="strong-password-123", is_staff=True)
+        self.rider = User.objects.create_user(username="rider", password="strong-password-123")
+        self.first = create_bus("AN-01", no_of_seats=4)
+        self.second = create_bus("AN-02", no_of_seats=2, origin="Jaipur", destination="Delhi")
+        DailyBusRollup.objects.bulk_create([
+            DailyBusRollup(day=date(2030, 1, 6), bus_id=self.first.id, bookings=2, revenue=100000),
+            DailyBusRollup(day=date(2030, 1, 7), bus_id=self.first.id, bookings=1, revenue=50000, refunds=1, refunded=50000),
+            DailyBusRollup(day=date(2030, 1, 7), bus_id=self.second.id, bookings=1, revenue=50000),
+        ])
+        for seat in self.first.seats.order_by("id")[:2]:
+            Booking.objects.create(user=self.rider, bus=self.first, seat=seat, journey_date="2030-01-07")
+        Booking.objects.create(
+            user=self.rider, bus=self.second, seat=self.second.seats.first(), journey_date="2030-01-08"
+        )
+
+    def analytics(self, **params):
+        request = self.factory.get("/api/admin/analytics/", params)
+        force_authenticate(request, user=self.admin)
+        return AdminAnalyticsView.as_view()(request)
+
+    def test_weekly_totals_combine_sales_and_occupancy(self):
+        response = self.analytics(start="2030-01-06", end="2030-01-08", granularity="week")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(row["period"], row["bookings"], row["revenue"], row["booked_seats"], row["seat_capacity"]) for row in response.data["series"]],
+            [(date(2029, 12, 31), 2, 1000, 0, 6), (date(2030, 1, 7), 2, 500, 3, 12)],
+        )
+        self.assertEqual(response.data["series"][1]["occupancy"], 0.25)
+
+    def test_route_grouping_and_caching(self):
+        with self.assertNumQueries(4):
+            response = self.analytics(start="2030-01-07", end="2030-01-08", granularity="day", group_by="route")
+        with self.assertNumQueries(0):
+            cached = self.analytics(start="2030-01-07", end="2030-01-08", granularity="day", group_by="route")
+
+        self.assertEqual(cached.data, response.data)
+        routes = {(row["period"], row["route_origin"]): row for row in response.data["series"]}
+        self.assertEqual(routes[date(2030, 1, 7), "delhi"]["occupancy"], 0.5)
+        self.assertEqual(routes[date(2030, 1, 8), "jaipur"]["occupancy"], 0.5)
+        self.assertEqual(routes[date(2030, 1, 7), "jaipur"]["revenue"], 500)
+
+    def test_invalid_parameters_are_rejected(self):
+        self.assertEqual(self.analytics(granularity="hour").status_code, 400)
+        self.assertEqual(self.analytics(start="2030-01-08", end="2030-01-01").status_code, 400)
+        self.assertEqual(self.analytics(start="2020-01-01", end="2030-01-01").status_code, 400)
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.admin = User.objects.create_user(username="exporter", password="strong-password-123", is_staff=True)
+        self.rider = User.objects.create_user(username="rider", password="strong-password-123")
+        self.bus = create_bus("EX-01", no_of_seats=4)
+        seats = list(self.bus.seats.order_by("id"))
+        self.past = Booking.objects.create(user=self.rider, bus=self.bus, seat=seats[0], journey_date="2020-01-10")
+        self.live = Booking.objects.create(user=self.rider, bus=self.bus, seat=seats[1], journey_date="2030-01-10")
+        Payment.objects.create(
+            user=self.rider, booking=self.live, razorpay_order_id="order_live", amount=50000, status="SUCCESS"
+        )
+        sweep_stale_bookings(archive=True)
+
+    def export(self, path, **params):
+        request = self.factory.get(path, params)
+        force_authenticate(request, user=self.admin)
+        dataset, file_format = path.rsplit("/", 1)[1].split(".")
+        return AdminExportView.as_view()(request, dataset=dataset, file_format=file_format)
+
+    def test_bookings_stream_as_csv_including_history(self):
+        response = self.export("/api/admin/export/bookings.csv")
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        rows = list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual(rows[0][:3], ["id", "username", "bus_id"])
+        self.assertEqual(
+            [(row[0], row[9], row[-1]) for row in rows[1:]],
+            [(str(self.live.id), "CONFIRMED", "False"), (str(self.past.id), "EXPIRED", "True")],
+        )
+
+    def test_payments_stream_as_ndjson_with_filters(self):
+        response = self.export("/api/admin/export/payments.ndjson", status="SUCCESS", bus_id=self.bus.id)
+
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 1)
+        payment = json.loads(lines[0])
+        self.assertEqual((payment["razorpay_order_id"], payment["amount"]), ("order_live", 50000))
+        self.assertEqual(self.export("/api/admin/export/buses.csv").status_code, 404)
+
+    @override_settings(SERVER_MODE="asgi", EXPORT_BUFFER_BYTES=1)
+    def test_asgi_exports_stream_chunks_lazily_from_an_async_iterator(self):
+        produced = []
+
+        def rows(filters):
+            for index in range(3):
+                produced.append(index)
+                yield [index, "x"]
+
+        async def first_chunk(response):
+            content = response.streaming_content
+            chunk = await content.__anext__()
+            consumed = list(produced)
+            rest = [chunk async for chunk in content]
+            return chunk, consumed, rest
+
+        with patch.dict(EXPORTS, {"bookings": (["id", "name"], rows)}):
+            response = self.export("/api/admin/export/bookings.ndjson")
+            chunk, consumed, rest = async_to_sync(first_chunk)(response)
+
+        self.assertTrue(response.is_async)
+        self.assertEqual(json.loads(chunk), {"id": 0, "name": "x"})
+        self.assertEqual(consumed, [0])
+        self.assertEqual(len(rest), 2)
+
+
+class SweeperTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="sweeper", password="strong-password-123")
+        self.bus = create_bus("MH-01", no_of_seats=7)
+        self.seats = list(self.bus.seats.order_by("id"))
+
+    def test_booking_sweepers_work_in_primary_key_batches(self):
+        for seat in self.seats[:5]:
+            Booking.objects.create(user=self.user, bus=self.bus, seat=seat, journey_date="2020-01-10")
+        upcoming = Booking.objects.create(user=self.user, bus=self.bus, seat=self.seats[5], journey_date="2030-01-10")
+
+        run = sweep_booking_statuses(batch_size=2)
+
+        self.assertEqual(run.rows, 5)
+        self.assertEqual(run.batches, 3)
+        self.assertEqual(Booking.objects.filter(status=Booking.STATUS_EXPIRED).count(), 5)
+        upcoming.refresh_from_db()
+        self.assertEqual(upcoming.status, Booking.STATUS_CONFIRMED)
+
+        run = sweep_stale_bookings(batch_size=2)
+
+        self.assertEqual(run.rows, 5)
+        self.assertEqual(list(Booking.objects.values_list("id", flat=True)), [upcoming.id])
+        self.assertEqual(SweeperRun.objects.count(), 2)
+
+    def test_cleanup_command_archives_in_batches_and_resumes(self):
+        past = [
+            Booking.objects.create(user=self.user, bus=self.bus, seat=seat, journey_date="2020-01-10")
+            for seat in self.seats[:5]
+        ]
+        Ticket.objects.create(booking=past[0], user=self.user)
+        Payment.objects.create(user=self.user, booking=past[0], razorpay_order_id="order_past", amount=50000)
+        SweeperRun.objects.create(name="stale_bookings", started_at=timezone.now(), batches=1, rows=0, last_pk=past[1].id)
+
+        out = io.StringIO()
+        call_command("cleanup_expired_bookings", "--dry-run", "--batch-size", "2", stdout=out)
+        self.assertIn("5 stale booking record(s)", out.getvalue())
+        self.assertEqual(Booking.objects.count(), 5)
+
+        call_command("cleanup_expired_bookings", "--archive", "--resume", "--batch-size", "2", stdout=out)
+
+        self.assertEqual(sorted(Booking.objects.values_list("id", flat=True)), [past[0].id, past[1].id])
+        self.assertEqual(BookingHistory.objects.count(), 3)
+        run = SweeperRun.objects.get(name="stale_bookings")
+        self.assertEqual((run.rows, run.last_pk), (3, past[4].id))
+        self.assertIsNotNone(run.finished_at)
+
+        call_command("cleanup_expired_bookings", "--archive", "--batch-size", "2", stdout=out)
+
+        self.assertFalse(Booking.objects.exists())
+        archived = BookingHistory.objects.get(booking_id=past[0].id)
+        self.assertEqual(archived.status, Booking.STATUS_EXPIRED)
+        self.assertEqual((archived.ticket_status, archived.razorpay_order_id), ("ACTIVE", "order_past"))
+        self.assertEqual(archived.seat_number, self.seats[0].seat_number)
+
+    def test_expired_holds_and_abandoned_payments_are_swept(self):
+        now = timezone.now()
+        Seat.objects.filter(id=self.seats[0].id).update(is_held=True, hold_expires_at=now - timedelta(minutes=1))
+        Seat.objects.filter(id=self.seats[1].id).update(is_held=True, hold_expires_at=now + timedelta(minutes=5))
+        stale = Payment.objects.create(user=self.user, razorpay_order_id="order_old", amount=50000)
+        fresh = Payment.objects.create(user=self.user, razorpay_order_id="order_new", amount=50000)
+        Payment.objects.filter(id=stale.id).update(created_at=now - timedelta(hours=2))
+
+        self.assertEqual(sweep_expired_seat_holds().rows, 1)
+        self.assertEqual(sweep_abandoned_payments().rows, 1)
+
+        self.assertEqual(list(Seat.objects.filter(is_held=True).values_list("id", flat=True)), [self.seats[1].id])
+        stale.refresh_from_db()
+        fresh.refresh_from_db()
+        self.assertEqual(stale.status, "FAILED")
+        self.assertEqual(fresh.status, "CREATED")
+
+
+class TicketArtifactTests(TestCase):
+    def setUp(self):
+        use_temp_ticket_storage(self)
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(username="rider", password="strong-password-123")
+        bus = create_bus("GJ-01")
+        self.booking = Booking.objects.create(
+            user=self.user, bus=bus, seat=bus.seats.order_by("id").first(), journey_date="2030-01-10"
+        )
+
+    def download(self):
+        request = self.factory.get(f"/api/bookings/{self.booking.id}/ticket/")
+        force_authenticate(request, user=self.user)
+        return BookingTicketView.as_view()(request, booking_id=self.booking.id)
+
+    def test_ticket_is_rendered_once_and_then_served_from_store(self):
+        with patch("bookings.ticket_service.generate_ticket_pdf_bytes", return_value=b"%PDF-cached") as render:
+            first = self.download()
+            second = self.download()
+
+        self.assertEqual(render.call_count, 1)
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(second["Content-Type"], "application/pdf")
+
+    def test_card_background_is_drawn_once_and_reused_across_documents(self):
+        ticket = Ticket.objects.create(booking=self.booking, user=self.user)
+        ticket_card_stream.cache_clear()
+        self.addCleanup(ticket_card_stream.cache_clear)
+
+        with patch("bookings.ticket_service.draw_card_background", wraps=draw_card_background) as draw:
+            first = generate_ticket_pdf_bytes(ticket)
+            second = generate_ticket_pdf_bytes(ticket)
+
+        self.assertEqual(draw.call_count, 1)
+        for pdf in (first, second):
+            self.assertIn(b"/FormXob.ticket_card", pdf)
+            self.assertIn(b"/BaseFont /Helvetica-Oblique", pdf)
+
+    @patch("bookings.views.client")
+    def test_refund_invalidates_stored_ticket(self, _client):
+        self.download()
+        ticket = Ticket.objects.get(booking=self.booking)
+        Payment.objects.create(
+            user=self.user, booking=self.booking, razorpay_order_id="order_1", amount=50000, status="SUCCESS"
+        )
+
+        request = self.factory.post(f"/api/bookings/{self.booking.id}/refund/")
+        force_authenticate(request, user=self.user)
+        with patch("bookings.views.TicketArtifactStore.invalidate") as invalidate:
+            RefundTicketView.as_view()(request, booking_id=self.booking.id)
+
+        invalidate.assert_called_once_with(ticket.id)
+        rollup = DailyBusRollup.objects.get()
+        self.assertEqual((rollup.refunds, rollup.refunded), (1, 50000))
+
+
+class GeocodeCacheTests(TestCase):
+    def setUp(self):
+        clear_geocode_memory_cache()
+        self.addCleanup(clear_geocode_memory_cache)
+
+    @patch("bookings.tomtom_service.fetch_geocode")
+    def test_city_is_geocoded_once_then_served_from_memory_and_database(self, fetch_geocode):
+        fetch_geocode.return_value = {"label": "Jaipur, Rajasthan", "position": {"lat": 26.9, "lon": 75.8}}
+
+        first = geocode_location(" Jaipur ")
+        second = geocode_location("jaipur")
+        clear_geocode_memory_cache()
+        with self.assertNumQueries(1):
+            third = geocode_location("JAIPUR")
+
+        fetch_geocode.assert_called_once_with("jaipur", deadline=None)
+        self.assertEqual(first, second)
+        self.assertEqual(third["position"], {"lat": 26.9, "lon": 75.8})
+        self.assertEqual(GeocodeCacheEntry.objects.get().query, "jaipur")
+
+
+@override_settings(TOMTOM_API_KEY="test-key")
+class RouteMapCacheTests(TestCase):
+    def setUp(self):
+        caches[settings.ROUTE_MAP_CACHE_ALIAS].clear()
+        self.addCleanup(caches[settings.ROUTE_MAP_CACHE_ALIAS].clear)
+        self.factory = APIRequestFactory()
+        self.bus = create_bus("UP-01", origin="Lucknow", destination="Agra")
+        position = {"label": "City", "position": {"lat": 26.8, "lon": 80.9}}
+        patchers = [
+            patch("bookings.route_map_cache.geocode_location_async", return_value=position),
+            patch(
+                "bookings.route_map_cache.fetch_route_points_async",
+                return_value={
+                    "origin": position,
+                    "destination": position,
+                    "distance_meters": 1000,
+                    "points": array("d", [26.8, 80.9, 26.95, 79.45, 27.1, 78.0]),
+                },
+            ),
+            patch("bookings.route_map_cache.fetch_route_map_image_async", return_value=(b"jpeg-bytes", "image/jpeg")),
+        ]
+        self.geocode, self.route, self.image = [self.enterContext(patcher) for patcher in patchers]
+
+    def get_map(self, **headers):
+        request = self.factory.get(f"/api/buses/{self.bus.id}/route-map/", **headers)
+        return async_to_sync(BusRouteMapView.as_view())(request, pk=self.bus.id)
+
+    def test_repeated_views_reuse_cached_image(self):
+        first = self.get_map()
+        second = self.get_map()
+
+        self.assertEqual(second.content, b"jpeg-bytes")
+        self.assertEqual(first["ETag"], second["ETag"])
+        self.assertIn("max-age", second["Cache-Control"])
+        self.assertEqual(self.route.call_count, 1)
+        self.assertEqual(self.image.call_count, 1)
+
+    def test_matching_if_none_match_returns_not_modified(self):
+        etag = self.get_map()["ETag"]
+
+        response = self.get_map(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_origin_and_destination_are_geocoded_concurrently(self):
+        async def slow_geocode(place_name):
+            await asyncio.sleep(0.3)
+            return {"label": place_name, "position": {"lat": 26.8, "lon": 80.9}}
+
+        self.geocode.side_effect = slow_geocode
+        started = clock.monotonic()
+        response = self.get_map()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertLess(clock.monotonic() - started, 0.55)
+
+    @override_settings(ROUTE_MAP_DEADLINE_SECONDS=0.1)
+    def test_pipeline_deadline_returns_bad_gateway(self):
+        async def stalled_geocode(place_name):
+            await asyncio.sleep(0.5)
+
+        self.geocode.side_effect = stalled_geocode
+
+        response = self.get_map()
+
+        self.assertEqual(response.status_code, 502)
+
+    def test_route_endpoint_returns_simplified_polyline(self):
+        request = self.factory.get(f"/api/buses/{self.bus.id}/route/", {"tolerance": "0.01"})
+        response = async_to_sync(BusRouteView.as_view())(request, pk=self.bus.id)
+
+        payload = json.loads(response.content)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((payload["original_point_count"], payload["point_count"]), (3, 2))
+        self.assertEqual(list(decode_polyline(payload["polyline"])), [26.8, 80.9, 27.1, 78.0])
+        self.assertTrue(response.has_header("ETag"))
+
+    def test_route_tolerance_is_quantized_before_keying_the_cache(self):
+        self.assertEqual(clamp_tolerance("0.0123456789", 0.0005), 0.0123)
+        self.assertEqual(clamp_tolerance("nan", 0.0005), 0.0005)
+        self.assertEqual(clamp_tolerance("9", 0.0005), 0.05)
+
+        for tolerance in ("0.01001", "0.01004"):
+            request = self.factory.get(f"/api/buses/{self.bus.id}/route/", {"tolerance": tolerance})
+            with patch("bookings.route_map_cache.build_geometry", wraps=build_geometry) as build:
+                async_to_sync(BusRouteView.as_view())(request, pk=self.bus.id)
+
+        build.assert_not_called()
+        self.assertEqual(self.route.call_count, 1)
+
+    def test_wsgi_deploys_serve_route_endpoints_from_the_sync_pipeline(self):
+        self.assertIs(resolve(f"/api/buses/{self.bus.id}/route-map/").func.view_class, SyncBusRouteMapView)
+        self.assertIs(resolve(f"/api/buses/{self.bus.id}/route/").func.view_class, SyncBusRouteView)
+
+        position = {"label": "City", "position": {"lat": 26.8, "lon": 80.9}}
+        route = {
+            "origin": position,
+            "destination": position,
+            "distance_meters": 1000,
+            "points": array("d", [26.8, 80.9, 26.95, 79.45, 27.1, 78.0]),
+        }
+        with patch("bookings.route_map_cache.geocode_location", return_value=position), patch(
+            "bookings.route_map_cache.fetch_route_points", return_value=route
+        ), patch("bookings.route_map_cache.fetch_route_map_image", return_value=(b"jpeg", "image/jpeg")):
+            route_map = SyncBusRouteMapView.as_view()(self.factory.get("/"), pk=self.bus.id)
+            geometry = SyncBusRouteView.as_view()(self.factory.get("/", {"tolerance": "0.01"}), pk=self.bus.id)
+
+        self.assertEqual(route_map.content, b"jpeg")
+        self.assertEqual(json.loads(geometry.content)["point_count"], 2)
+        self.geocode.assert_not_called()
+
+
+@override_settings(TOMTOM_API_KEY="test-key")
+class RoutePrerenderTests(TestCase):
+    def setUp(self):
+        caches[settings.ROUTE_MAP_CACHE_ALIAS].clear()
+        self.addCleanup(caches[settings.ROUTE_MAP_CACHE_ALIAS].clear)
+        self.factory = APIRequestFactory()
+        self.admin = User.objects.create_user(username="admin", password="strong-password-123", is_staff=True)
+        self.bus = create_bus("MP-01", origin="Indore", destination="Bhopal")
+
+    def update_bus(self, **data):
+        request = self.factory.put(f"/api/admin/buses/{self.bus.id}/", data, format="multipart")
+        force_authenticate(request, user=self.admin)
+        return AdminBusDetailView.as_view()(request, pk=self.bus.id)
+
+    @patch("bookings.tasks.prerender_route_map_task.delay")
+    def test_only_route_changes_queue_a_prerender(self, delay):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.update_bus(price=650)
+        delay.assert_not_called()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.update_bus(destination="Ujjain")
+        delay.assert_called_once_with(bus_id=self.bus.id)
+
+    def test_prerender_task_fills_route_map_cache(self):
+        position = {"label": "City", "position": {"lat": 22.7, "lon": 75.8}}
+        route = {
+            "origin": position,
+            "destination": position,
+            "distance_meters": 190000,
+            "points": array("d", [22.7, 75.8, 23.2, 77.4]),
+        }
+        with patch("bookings.route_map_cache.geocode_location", return_value=position), patch(
+            "bookings.route_map_cache.fetch_route_points", return_value=route
+        ), patch("bookings.route_map_cache.fetch_route_map_image", return_value=(b"jpeg", "image/jpeg")):
+            prerender_route_map_task.apply(args=[self.bus.id])
+
+        route_map = route_cache().get(route_cache_key("route-map", "Indore", "Bhopal", 900, 360))
+        self.assertEqual(route_map["content"], b"jpeg")
+
+
+class RouteGeometryTests(TestCase):
+    def test_polyline_round_trip_matches_reference_encoding(self):
+        coords = array("d", [38.5, -120.2, 40.7, -120.95, 43.252, -126.453])
+
+        self.assertEqual(encode_polyline(coords), "_p~iF~ps|U_ulLnnqC_mqNvxq`@")
+        self.assertEqual(list(decode_polyline("_p~iF~ps|U_ulLnnqC_mqNvxq`@")), list(coords))
+
+    def test_simplify_keeps_endpoints_and_significant_turns(self):
+        coords = array("d", [0, 0, 0.0001, 1, 0, 2, 1, 3, 0, 4])
+
+        self.assertEqual(list(simplify(coords, 0.01)), [0, 0, 0, 2, 1, 3, 0, 4])
+        self.assertEqual(list(simplify(coords, 0)), list(coords))
+
+    def test_bbox_pads_extremes(self):
+        bbox = route_bbox(array("d", [26.0, 75.0, 28.0, 77.0, 27.0, 74.0]))
+
+        self.assertAlmostEqual(bbox["min_lat"], 25.76)
+        self.assertAlmostEqual(bbox["max_lon"], 77.36)
+
+
+class OutboundHttpTests(TestCase):
+    def setUp(self):
+        http_client.reset_sessions()
+        http_client.reset_metrics()
+        self.addCleanup(http_client.reset_sessions)
+        self.addCleanup(http_client.reset_metrics)
+
+    def test_upstreams_get_one_pooled_session_each(self):
+        tomtom = http_client.get_session("tomtom")
+
+        self.assertIs(http_client.get_session("tomtom"), tomtom)
+        self.assertIsNot(http_client.get_session("resend"), tomtom)
+        self.assertEqual(tomtom.get_adapter("https://api.tomtom.com")._pool_maxsize, settings.OUTBOUND_HTTP_POOL_SIZE)
+
+    def test_requests_use_upstream_timeout_and_record_latency(self):
+        session = http_client.get_session("tomtom")
+        with patch.object(session, "request") as send:
+            send.return_value.status_code = 200
+            http_client.request("tomtom", "GET", "https://api.tomtom.com/search")
+
+        self.assertEqual(send.call_args.kwargs["timeout"], settings.OUTBOUND_HTTP["tomtom"]["timeout"])
+        metrics = http_client.upstream_metrics()["tomtom"]
+        self.assertEqual((metrics["requests"], metrics["errors"]), (1, 0))
+
+    def test_deadline_requests_retry_themselves_within_the_budget(self):
+        session = http_client.get_session("tomtom", retries=False)
+        self.assertEqual(session.get_adapter("https://api.tomtom.com").max_retries.total, 0)
+
+        with patch.object(session, "request") as send, patch("bookings.http_client.time.sleep"):
+            send.side_effect = [Mock(status_code=503), Mock(status_code=200)]
+            response = http_client.request("tomtom", "GET", "https://api.tomtom.com/search", deadline=http_client.Deadline(5))
+
+        self.assertEqual((response.status_code, send.call_count), (200, 2))
+        self.assertLessEqual(send.call_args.kwargs["timeout"], 5)
+
+        deadline = http_client.Deadline(0.2)
+        with patch.object(session, "request", side_effect=requests.ConnectTimeout("slow")) as send:
+            with self.assertRaises(requests.Timeout):
+                http_client.request("tomtom", "GET", "https://api.tomtom.com/search", deadline=deadline)
+
+        self.assertEqual(deadline.remaining(), 0)
+        self.assertLessEqual(send.call_count, settings.OUTBOUND_HTTP["tomtom"]["retries"] + 1)
+
+    def test_async_requests_share_a_client_per_event_loop_and_record_latency(self):
+        transport = httpx.MockTransport(lambda request: httpx.Response(503))
+
+        async def call_twice():
+            clients = []
+            for _ in range(2):
+                response = await http_client.arequest("tomtom", "GET", "https://api.tomtom.com/search")
+                clients.append(http_client.get_async_client("tomtom"))
+            await http_client.close_async_clients()
+            return response, clients
+
+        with patch(
+            "bookings.http_client.build_async_client",
+            side_effect=lambda upstream: httpx.AsyncClient(transport=transport),
+        ):
+            response, clients = async_to_sync(call_twice)()
+
+        self.assertEqual(response.status_code, 503)
+        self.assertIs(clients[0], clients[1])
+        metrics = http_client.upstream_metrics()["tomtom"]
+        self.assertEqual((metrics["requests"], metrics["errors"]), (2, 2))
+
+    def test_static_map_only_hedges_to_center_when_bbox_fails(self):
+        bbox = {"min_lat": 12.9, "min_lon": 77.5, "max_lat": 13.1, "max_lon": 80.3}
+
+        with patch("bookings.tomtom_service.request_static_map", return_value=(b"bbox", "image/jpeg")) as fetch:
+            self.assertEqual(fetch_route_map_image(bbox, deadline=http_client.Deadline(5)), (b"bbox", "image/jpeg"))
+
+        self.assertEqual(fetch.call_count, 1)
+        self.assertIn("bbox", fetch.call_args.args[0])
+
+        def bbox_fails(params, deadline=None):
+            if "bbox" in params:
+                raise requests.HTTPError("bad bbox")
+            return b"center", "image/jpeg"
+
+        with patch("bookings.tomtom_service.request_static_map", side_effect=bbox_fails) as fetch:
+            self.assertEqual(fetch_route_map_image(bbox, deadline=http_client.Deadline(5)), (b"center", "image/jpeg"))
+
+        self.assertEqual(fetch.call_count, 2)
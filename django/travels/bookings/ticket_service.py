@@ -0,0 +1,219 @@
+import hashlib
+import logging
+from functools import lru_cache
+from io import BytesIO
+
+import qrcode
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+
+
+logger = logging.getLogger(__name__)
+
+
+TICKET_VERIFY_URL = "https://travels-backend-ge3s.onrender.com/api/tickets/verify/{ticket_id}/"
+
+WIDTH, HEIGHT = A4
+CARD_X = 40
+CARD_Y = 120
+CARD_W = WIDTH - 80
+CARD_H = HEIGHT - 200
+FIELD_LABELS = [
+    "Passenger",
+    "Bus",
+    "Route",
+    "Seat",
+    "Journey Date",
+    "Start Time",
+    "Reach Time",
+    "Price",
+    "Booked At",
+]
+FIELD_TOP = HEIGHT - 180
+FIELD_GAP = 28
+
+
+@lru_cache(maxsize=512)
+def ticket_qr_image(ticket_id):
+    image = qrcode.make(
+        TICKET_VERIFY_URL.format(ticket_id=ticket_id),
+        box_size=3,
+        border=2,
+    ).convert("1")
+    buffer = BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def ticket_fields(ticket):
+    booking = ticket.booking
+    return [
+        booking.user.username,
+        booking.bus.bus_name,
+        f"{booking.bus.origin} → {booking.bus.destination}",
+        booking.seat.seat_number,
+        booking.journey_date,
+        booking.bus.start_time,
+        booking.bus.reach_time,
+        f"₹ {booking.bus.price}",
+        booking.booking_time.strftime("%d %b %Y, %I:%M %p"),
+    ]
+
+
+def ticket_version(ticket):
+    payload = "|".join(str(value) for value in ticket_fields(ticket))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def draw_card_background(p):
+    p.setFillColorRGB(0.05, 0.1, 0.15)
+    p.roundRect(CARD_X, CARD_Y, CARD_W, CARD_H, 20, fill=1)
+
+    p.setFillColor(colors.white)
+    p.setFont("Helvetica-Bold", 20)
+    p.drawString(CARD_X + 30, HEIGHT - 100, "Travels App - Bus Ticket")
+
+    p.setStrokeColor(colors.grey)
+    p.line(CARD_X + 20, HEIGHT - 145, CARD_X + CARD_W - 20, HEIGHT - 145)
+
+    p.setFillColor(colors.cyan)
+    p.setFont("Helvetica-Bold", 11)
+    for index, label in enumerate(FIELD_LABELS):
+        p.drawString(CARD_X + 30, FIELD_TOP - index * FIELD_GAP, label)
+
+    p.setFillColor(colors.lightgrey)
+    p.setFont("Helvetica", 9)
+    p.drawString(CARD_X + CARD_W - 155, CARD_Y + 40, "Scan to verify ticket")
+
+    p.setFont("Helvetica-Oblique", 10)
+    p.drawString(CARD_X + 30, CARD_Y + 30, "Show this ticket while boarding. Have a safe journey!")
+
+
+@lru_cache(maxsize=1)
+def ticket_card_stream():
+    scratch = canvas.Canvas(BytesIO(), pagesize=A4)
+    scratch.beginForm("ticket_card")
+    draw_card_background(scratch)
+    return list(scratch._doc.fontMapping), "\n".join(scratch._code)
+
+
+def add_card_form(p):
+    fonts, stream = ticket_card_stream()
+    p.beginForm("ticket_card")
+    for font in fonts:
+        p._doc.getInternalFontName(font)
+    p.addLiteral(stream)
+    p.endForm()
+
+
+def draw_ticket_page(p, ticket):
+    p.doForm("ticket_card")
+
+    p.setFont("Helvetica", 11)
+    p.setFillColor(colors.lightgrey)
+    p.drawString(CARD_X + 30, HEIGHT - 125, f"Ticket ID: #{ticket.id}")
+
+    p.setFillColor(colors.white)
+    p.setFont("Helvetica", 12)
+    for index, value in enumerate(ticket_fields(ticket)):
+        p.drawString(CARD_X + 180, FIELD_TOP - index * FIELD_GAP, str(value))
+
+    qr_image = ImageReader(BytesIO(ticket_qr_image(ticket.id)))
+    p.drawImage(qr_image, CARD_X + CARD_W - 150, CARD_Y + 50, 110, 110)
+
+    p.showPage()
+
+
+def generate_tickets_pdf_bytes(tickets):
+    buffer = BytesIO()
+    p = canvas.Canvas(buffer, pagesize=A4)
+
+    add_card_form(p)
+
+    for ticket in tickets:
+        draw_ticket_page(p, ticket)
+
+    p.save()
+
+    pdf_bytes = buffer.getvalue()
+    buffer.close()
+    return pdf_bytes
+
+
+def generate_ticket_pdf_bytes(ticket):
+    return generate_tickets_pdf_bytes([ticket])
+
+
+@lru_cache(maxsize=1)
+def get_ticket_storage():
+    storage_class = import_string(settings.TICKET_ARTIFACT_STORAGE)
+    return storage_class(**settings.TICKET_ARTIFACT_STORAGE_OPTIONS)
+
+
+@receiver(setting_changed)
+def reset_ticket_storage(setting, **kwargs):
+    if setting.startswith("TICKET_ARTIFACT_STORAGE"):
+        get_ticket_storage.cache_clear()
+
+
+class TicketArtifactStore:
+    @staticmethod
+    def _path(ticket, version=None):
+        return f"{ticket.id}/{version or ticket_version(ticket)}.pdf"
+
+    @classmethod
+    def get(cls, ticket):
+        storage = get_ticket_storage()
+        path = cls._path(ticket)
+
+        try:
+            if storage.exists(path):
+                with storage.open(path, "rb") as artifact:
+                    return artifact.read()
+        except Exception:
+            logger.warning("Failed to read ticket artifact for ticket_id=%s", ticket.id)
+        return None
+
+    @classmethod
+    def put(cls, ticket, pdf_bytes):
+        storage = get_ticket_storage()
+        path = cls._path(ticket)
+
+        try:
+            if storage.exists(path):
+                storage.delete(path)
+            storage.save(path, ContentFile(pdf_bytes))
+            return True
+        except Exception:
+            logger.warning("Failed to store ticket artifact for ticket_id=%s", ticket.id)
+            return False
+
+    @classmethod
+    def get_or_render(cls, ticket):
+        pdf_bytes = cls.get(ticket)
+        if pdf_bytes is None:
+            pdf_bytes = generate_ticket_pdf_bytes(ticket)
+            cls.put(ticket, pdf_bytes)
+        return pdf_bytes
+
+    @classmethod
+    def invalidate(cls, ticket_id):
+        storage = get_ticket_storage()
+
+        try:
+            _, files = storage.listdir(str(ticket_id))
+            for filename in files:
+                storage.delete(f"{ticket_id}/{filename}")
+            return len(files)
+        except (FileNotFoundError, NotImplementedError):
+            return 0
+        except Exception:
+            logger.warning("Failed to invalidate ticket artifacts for ticket_id=%s", ticket_id)
+            return 0
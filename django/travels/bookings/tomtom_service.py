@@ -1,13 +1,28 @@
+import asyncio
 import logging
+import threading
+from collections import OrderedDict
+from concurrent import futures
 from urllib.parse import quote
 
+import httpx
 import requests
+from asgiref.sync import sync_to_async
 from django.conf import settings
 
+from . import http_client
+from .models import GeocodeCacheEntry, normalize_city
+from .route_geometry import compact_points
+
 
 logger = logging.getLogger(__name__)
 
 
+GEOCODE_MEMORY_SIZE = 1024
+_geocode_memory = OrderedDict()
+_geocode_memory_lock = threading.Lock()
+
+
 def tomtom_key_configured():
     return bool(getattr(settings, "TOMTOM_API_KEY", ""))
 
@@ -31,57 +46,169 @@ def build_location_queries(place_name):
     return unique_queries
 
 
-def geocode_location(place_name):
+def tomtom_url(path):
+    return f"{settings.TOMTOM_BASE_URL.rstrip('/')}/{path}"
+
+
+def geocode_request(query):
+    return tomtom_url(f"search/2/geocode/{quote(query)}.json"), {
+        "key": settings.TOMTOM_API_KEY,
+        "limit": 1,
+        "countrySet": "IN",
+        "view": "IN",
+        "language": "en-GB",
+    }
+
+
+def parse_geocode(payload, query):
+    results = payload.get("results", [])
+    if not results:
+        return None
+
+    top_match = results[0]
+    position = top_match.get("position") or {}
+    if "lat" not in position or "lon" not in position:
+        return None
+
+    return {
+        "label": top_match.get("address", {}).get("freeformAddress") or query,
+        "position": {
+            "lat": position["lat"],
+            "lon": position["lon"],
+        },
+    }
+
+
+def fetch_geocode(place_name, deadline=None):
     for query in build_location_queries(place_name):
-        response = requests.get(
-            f"https://api.tomtom.com/search/2/geocode/{quote(query)}.json",
-            params={
-                "key": settings.TOMTOM_API_KEY,
-                "limit": 1,
-                "countrySet": "IN",
-                "view": "IN",
-                "language": "en-GB",
-            },
-            timeout=10,
-        )
+        url, params = geocode_request(query)
+        response = http_client.request("tomtom", "GET", url, deadline=deadline, params=params)
         response.raise_for_status()
 
-        results = response.json().get("results", [])
-        if not results:
-            continue
+        location = parse_geocode(response.json(), query)
+        if location is not None:
+            return location
+
+    raise ValueError(f"No geocoding result found for '{place_name}'")
+
 
-        top_match = results[0]
-        position = top_match.get("position") or {}
-        if "lat" not in position or "lon" not in position:
-            continue
+async def fetch_geocode_async(place_name):
+    for query in build_location_queries(place_name):
+        url, params = geocode_request(query)
+        response = await http_client.arequest("tomtom", "GET", url, params=params)
+        response.raise_for_status()
 
-        return {
-            "label": top_match.get("address", {}).get("freeformAddress") or query,
-            "position": {
-                "lat": position["lat"],
-                "lon": position["lon"],
-            },
-        }
+        location = parse_geocode(response.json(), query)
+        if location is not None:
+            return location
 
     raise ValueError(f"No geocoding result found for '{place_name}'")
 
 
-def fetch_route_points(origin, destination):
-    route_response = requests.get(
-        "https://api.tomtom.com/routing/1/calculateRoute/"
-        f"{origin['position']['lat']},{origin['position']['lon']}:"
-        f"{destination['position']['lat']},{destination['position']['lon']}/json",
-        params={
-            "key": settings.TOMTOM_API_KEY,
-            "traffic": "true",
-            "routeType": "fastest",
-            "travelMode": "car",
+def geocode_cache_key(place_name):
+    return normalize_city(place_name)[:100]
+
+
+def store_geocode(key, location):
+    GeocodeCacheEntry.objects.update_or_create(
+        query=key,
+        defaults={
+            "label": location["label"][:255],
+            "lat": location["position"]["lat"],
+            "lon": location["position"]["lon"],
         },
-        timeout=10,
     )
-    route_response.raise_for_status()
 
-    routes = route_response.json().get("routes", [])
+
+def _memory_get(key):
+    with _geocode_memory_lock:
+        location = _geocode_memory.get(key)
+        if location is not None:
+            _geocode_memory.move_to_end(key)
+        return location
+
+
+def _memory_put(key, location):
+    with _geocode_memory_lock:
+        _geocode_memory[key] = location
+        _geocode_memory.move_to_end(key)
+        while len(_geocode_memory) > GEOCODE_MEMORY_SIZE:
+            _geocode_memory.popitem(last=False)
+
+
+def entry_location(entry):
+    return {
+        "label": entry.label,
+        "position": {"lat": entry.lat, "lon": entry.lon},
+    }
+
+
+def geocode_location(place_name, deadline=None):
+    key = geocode_cache_key(place_name)
+    if not key:
+        raise ValueError("Location name is required")
+
+    location = _memory_get(key)
+    if location is not None:
+        return location
+
+    entry = GeocodeCacheEntry.objects.filter(query=key).first()
+    if entry is not None:
+        location = entry_location(entry)
+    else:
+        location = fetch_geocode(key, deadline=deadline)
+        try:
+            store_geocode(key, location)
+        except Exception:
+            logger.exception("Failed to persist geocode cache entry for query=%s", key)
+
+    _memory_put(key, location)
+    return location
+
+
+async def geocode_location_async(place_name):
+    key = geocode_cache_key(place_name)
+    if not key:
+        raise ValueError("Location name is required")
+
+    location = _memory_get(key)
+    if location is not None:
+        return location
+
+    entry = await GeocodeCacheEntry.objects.filter(query=key).afirst()
+    if entry is not None:
+        location = entry_location(entry)
+    else:
+        location = await fetch_geocode_async(key)
+        try:
+            await sync_to_async(store_geocode)(key, location)
+        except Exception:
+            logger.exception("Failed to persist geocode cache entry for query=%s", key)
+
+    _memory_put(key, location)
+    return location
+
+
+def clear_geocode_memory_cache():
+    with _geocode_memory_lock:
+        _geocode_memory.clear()
+
+
+def route_request(origin, destination):
+    return tomtom_url(
+        "routing/1/calculateRoute/"
+        f"{origin['position']['lat']},{origin['position']['lon']}:"
+        f"{destination['position']['lat']},{destination['position']['lon']}/json"
+    ), {
+        "key": settings.TOMTOM_API_KEY,
+        "traffic": "true",
+        "routeType": "fastest",
+        "travelMode": "car",
+    }
+
+
+def parse_route(payload, origin, destination):
+    routes = payload.get("routes", [])
     if not routes:
         raise ValueError("TomTom did not return a route")
 
@@ -96,35 +223,26 @@ def fetch_route_points(origin, destination):
         "origin": origin,
         "destination": destination,
         "distance_meters": summary.get("lengthInMeters"),
-        "points": [
-            {
-                "lat": point["latitude"],
-                "lon": point["longitude"],
-            }
+        "points": compact_points(
+            (point["latitude"], point["longitude"])
             for point in points
             if "latitude" in point and "longitude" in point
-        ],
+        ),
     }
 
 
-def route_bbox(points, padding_ratio=0.12):
-    lats = [point["lat"] for point in points]
-    lons = [point["lon"] for point in points]
-
-    min_lat = min(lats)
-    max_lat = max(lats)
-    min_lon = min(lons)
-    max_lon = max(lons)
+def fetch_route_points(origin, destination, deadline=None):
+    url, params = route_request(origin, destination)
+    route_response = http_client.request("tomtom", "GET", url, deadline=deadline, params=params)
+    route_response.raise_for_status()
+    return parse_route(route_response.json(), origin, destination)
 
-    lat_padding = max((max_lat - min_lat) * padding_ratio, 0.05)
-    lon_padding = max((max_lon - min_lon) * padding_ratio, 0.05)
 
-    return {
-        "min_lat": max(min_lat - lat_padding, -85),
-        "max_lat": min(max_lat + lat_padding, 85),
-        "min_lon": max(min_lon - lon_padding, -180),
-        "max_lon": min(max_lon + lon_padding, 180),
-    }
+async def fetch_route_points_async(origin, destination):
+    url, params = route_request(origin, destination)
+    route_response = await http_client.arequest("tomtom", "GET", url, params=params)
+    route_response.raise_for_status()
+    return parse_route(route_response.json(), origin, destination)
 
 
 def route_center_and_zoom(route_bbox_data):
@@ -153,18 +271,32 @@ def route_center_and_zoom(route_bbox_data):
     }
 
 
-def request_static_map(params, timeout=15):
-    response = requests.get(
-        "https://api.tomtom.com/map/1/staticimage",
+def request_static_map(params, timeout=15, deadline=None):
+    response = http_client.request(
+        "tomtom",
+        "GET",
+        tomtom_url("map/1/staticimage"),
         params=params,
         timeout=timeout,
-        headers={"User-Agent": "TravelsApp/1.0"},
+        deadline=deadline,
     )
     response.raise_for_status()
     return response.content, response.headers.get("Content-Type", "image/jpeg")
 
 
-def fetch_route_map_image(route_bbox_data, width=900, height=360):
+async def request_static_map_async(params, timeout=15):
+    response = await http_client.arequest(
+        "tomtom",
+        "GET",
+        tomtom_url("map/1/staticimage"),
+        params=params,
+        timeout=timeout,
+    )
+    response.raise_for_status()
+    return response.content, response.headers.get("Content-Type", "image/jpeg")
+
+
+def static_map_params(route_bbox_data, width, height):
     center_config = route_center_and_zoom(route_bbox_data)
 
     base_params = {
@@ -191,31 +323,90 @@ def fetch_route_map_image(route_bbox_data, width=900, height=360):
         ),
     }
 
+    center_params = {
+        **base_params,
+        "center": center_config["center"],
+        "zoom": center_config["zoom"],
+    }
+
+    return bbox_params, center_params
+
+
+def hedge_delay(deadline=None):
+    delay = settings.ROUTE_MAP_HEDGE_DELAY_SECONDS
+    if deadline is not None:
+        delay = min(delay, deadline.remaining())
+    return delay
+
+
+def fetch_route_map_image(route_bbox_data, width=900, height=360, deadline=None):
+    bbox_params, center_params = static_map_params(route_bbox_data, width, height)
+
+    pending = {http_client.submit(request_static_map, bbox_params, deadline=deadline): "bbox"}
+    timeout = hedge_delay(deadline)
+    hedged = False
+
     try:
-        return request_static_map(bbox_params)
-    except requests.RequestException as exc:
-        response = getattr(exc, "response", None)
-        if response is not None:
-            logger.warning(
-                "Static map bbox request failed: status=%s body=%s",
-                response.status_code,
-                response.text[:500],
-            )
-
-        center_params = {
-            **base_params,
-            "center": center_config["center"],
-            "zoom": center_config["zoom"],
-        }
+        while True:
+            done, _ = futures.wait(pending, timeout=timeout, return_when=futures.FIRST_COMPLETED)
+            for attempt in done:
+                kind = pending.pop(attempt)
+                try:
+                    return attempt.result()
+                except requests.RequestException as exc:
+                    log_static_map_failure(kind, exc)
+                    if hedged and not pending:
+                        raise
+
+            if hedged:
+                if not done:
+                    raise requests.Timeout("Outbound request deadline exceeded")
+                continue
+
+            hedged = True
+            pending[http_client.submit(request_static_map, center_params, deadline=deadline)] = "center"
+            timeout = deadline.remaining() if deadline is not None else None
+    finally:
+        for attempt in pending:
+            attempt.cancel()
+
+
+async def fetch_route_map_image_async(route_bbox_data, width=900, height=360):
+    bbox_params, center_params = static_map_params(route_bbox_data, width, height)
+
+    pending = {asyncio.ensure_future(request_static_map_async(bbox_params)): "bbox"}
+    timeout = hedge_delay()
+    hedged = False
 
-        try:
-            return request_static_map(center_params)
-        except requests.RequestException as center_exc:
-            center_response = getattr(center_exc, "response", None)
-            if center_response is not None:
-                logger.warning(
-                    "Static map center request failed: status=%s body=%s",
-                    center_response.status_code,
-                    center_response.text[:500],
-                )
-            raise
+    try:
+        while True:
+            done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            for attempt in done:
+                kind = pending.pop(attempt)
+                try:
+                    return attempt.result()
+                except httpx.HTTPError as exc:
+                    log_static_map_failure(kind, exc)
+                    if hedged and not pending:
+                        raise
+
+            if hedged:
+                continue
+
+            hedged = True
+            pending[asyncio.ensure_future(request_static_map_async(center_params))] = "center"
+            timeout = None
+    finally:
+        for attempt in pending:
+            attempt.cancel()
+
+
+def log_static_map_failure(kind, exc):
+    response = getattr(exc, "response", None)
+    if response is not None:
+        logger.warning(
+            "Static map %s request failed: status=%s body=%s",
+            kind,
+            response.status_code,
+            response.text[:500],
+        )
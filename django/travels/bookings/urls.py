@@ -1,10 +1,17 @@
+from django.conf import settings
 from django.urls import path
-from .views import EditBookingRequestView, VerifyEditPaymentView, MarkTicketUsedView, AdminActiveBusesView, AdminRecentBookingsView, AdminTotalBookingsView, AdminTotalRevenueView, RegisterApiView, AdminBusListCreateView, AdminBusDetailView, RefundTicketView, TicketVerifyView, BookingTicketView, LoginView, PaymentStatusView, MyPaymentsView, BusDetailView, BusListCreateApiView, BusRouteMapView, VerifyPaymentView, CreatePaymentOrderView, RequestPasswordResetView, ConfirmPasswordResetView, UserProfileView, MyBookingsView, CancelBookingView, RequestOTPView, VerifyOTPView
+from .views import EditBookingRequestView, VerifyEditPaymentView, MarkTicketUsedView, AdminActiveBusesView, AdminRecentBookingsView, AdminDashboardSummaryView, AdminAnalyticsView, AdminExportView, AdminTotalBookingsView, AdminUpstreamMetricsView, AdminSweeperMetricsView, AdminTotalRevenueView, RegisterApiView, AdminBusListCreateView, AdminBusDetailView, AdminBusImportView, RefundTicketView, TicketVerifyView, BookingTicketView, LoginView, PaymentStatusView, MyPaymentsView, BusDetailView, BusListCreateApiView, BusRouteMapView, BusRouteView, SyncBusRouteMapView, SyncBusRouteView, VerifyPaymentView, CreatePaymentOrderView, ReleaseSeatHoldView, PaymentTicketsView, RequestPasswordResetView, ConfirmPasswordResetView, UserProfileView, MyBookingsView, CancelBookingView, RequestOTPView, VerifyOTPView
+
+if settings.SERVER_MODE == "asgi":
+    route_map_view, route_view = BusRouteMapView, BusRouteView
+else:
+    route_map_view, route_view = SyncBusRouteMapView, SyncBusRouteView
 
 urlpatterns = [
     path('buses/', BusListCreateApiView.as_view(), name='buslist'),
     path('buses/<int:pk>/', BusDetailView.as_view(), name='bus-details'),
-    path('buses/<int:pk>/route-map/', BusRouteMapView.as_view(), name='bus-route-map'),
+    path('buses/<int:pk>/route-map/', route_map_view.as_view(), name='bus-route-map'),
+    path('buses/<int:pk>/route/', route_view.as_view(), name='bus-route'),
     path('register/', RegisterApiView.as_view(), name='register'),
     path('login/', LoginView.as_view(), name='login'),
     path('request-otp/', RequestOTPView.as_view(), name='request-otp'),
@@ -16,18 +23,26 @@ urlpatterns = [
     path("password-reset/confirm/", ConfirmPasswordResetView.as_view()),
     path("payments/create-order/", CreatePaymentOrderView.as_view()),
     path("payments/verify/", VerifyPaymentView.as_view()),
+    path("payments/release-hold/", ReleaseSeatHoldView.as_view()),
     path("payments/my/", MyPaymentsView.as_view()),
     path("payments/status/<str:order_id>/", PaymentStatusView.as_view()),
+    path("payments/<str:order_id>/tickets/", PaymentTicketsView.as_view()),
     path("bookings/<int:booking_id>/ticket/", BookingTicketView.as_view()),
     path("tickets/verify/<int:ticket_id>/", TicketVerifyView.as_view()),
     path("bookings/<int:booking_id>/refund/", RefundTicketView.as_view()),
 
     path('admin/buses/', AdminBusListCreateView.as_view(), name='admin-bus-list-create'),
     path('admin/buses/<int:pk>/', AdminBusDetailView.as_view(), name='admin-bus-detail'),
+    path('admin/buses/import/', AdminBusImportView.as_view(), name='admin-bus-import'),
     path("admin/dashboard/total-bookings/", AdminTotalBookingsView.as_view()),
     path("admin/dashboard/total-revenue/", AdminTotalRevenueView.as_view()),
     path("admin/dashboard/active-buses/", AdminActiveBusesView.as_view()),
     path("admin/dashboard/recent-bookings/", AdminRecentBookingsView.as_view()),
+    path("admin/dashboard/summary/", AdminDashboardSummaryView.as_view()),
+    path("admin/analytics/", AdminAnalyticsView.as_view()),
+    path("admin/export/<slug:dataset>.<slug:file_format>", AdminExportView.as_view()),
+    path("admin/metrics/upstreams/", AdminUpstreamMetricsView.as_view()),
+    path("admin/metrics/sweepers/", AdminSweeperMetricsView.as_view()),
     path("tickets/mark-used/<int:ticket_id>/", MarkTicketUsedView.as_view()),
     path("bookings/<int:booking_id>/edit/request/", EditBookingRequestView.as_view()),
     path("bookings/edit/verify/", VerifyEditPaymentView.as_view()),
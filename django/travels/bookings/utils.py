@@ -3,12 +3,13 @@ import base64
 import json
 import logging
 
-import requests
 from celery import current_app
 from django.db import transaction
 from django.core.serializers.json import DjangoJSONEncoder
 from django.template.loader import render_to_string
 
+from . import http_client
+
 
 logger = logging.getLogger(__name__)
 
@@ -72,14 +73,15 @@ class Util:
         if normalized_attachments:
             payload["attachments"] = normalized_attachments
 
-        response = requests.post(
+        response = http_client.request(
+            "resend",
+            "POST",
             "https://api.resend.com/emails",
             headers={
                 "Authorization": f"Bearer {api_key}",
                 "Content-Type": "application/json",
             },
             json=payload,
-            timeout=15,
         )
         if response.status_code not in [200, 201]:
             logger.error("Resend error: status=%s body=%s", response.status_code, response.text)
@@ -114,19 +116,69 @@ class Util:
             "attachments": Util._normalize_attachments(attachments),
         }
 
-        def enqueue_email():
+        return Util._enqueue(
+            send_templated_email_task,
+            payload,
+            f"email task for {to_email}",
+            fail_silently,
+            use_on_commit,
+        )
+
+    @staticmethod
+    def _enqueue(task, kwargs, log_label, fail_silently, use_on_commit):
+        def enqueue():
             try:
-                send_templated_email_task.delay(**payload)
-                return True  
+                task.delay(**kwargs)
+                return True
             except Exception:
-                logger.exception("Failed to enqueue email task for %s", to_email)
+                logger.exception("Failed to enqueue %s", log_label)
                 if not fail_silently:
                     raise
                 return False
 
         if use_on_commit and transaction.get_connection().in_atomic_block:
-            transaction.on_commit(enqueue_email)
+            transaction.on_commit(enqueue)
             return True
 
-        return enqueue_email()
-  
\ No newline at end of file
+        return enqueue()
+
+    @staticmethod
+    def queue_ticket_email(ticket_id, fail_silently=True, use_on_commit=True):
+        from .tasks import send_ticket_email_task
+
+        return Util._enqueue(
+            send_ticket_email_task,
+            {"ticket_id": ticket_id},
+            f"ticket email task for ticket_id={ticket_id}",
+            fail_silently,
+            use_on_commit,
+        )
+
+    @staticmethod
+    def queue_group_ticket_email(ticket_ids, fail_silently=True, use_on_commit=True):
+        from .tasks import send_group_ticket_email_task
+
+        ticket_ids = list(ticket_ids)
+        return Util._enqueue(
+            send_group_ticket_email_task,
+            {"ticket_ids": ticket_ids},
+            f"group ticket email task for ticket_ids={ticket_ids}",
+            fail_silently,
+            use_on_commit,
+        )
+
+    @staticmethod
+    def queue_route_map_prerender(bus_id, fail_silently=True, use_on_commit=True):
+        from .tasks import prerender_route_map_task
+        from .tomtom_service import tomtom_key_configured
+
+        if not tomtom_key_configured():
+            return False
+
+        return Util._enqueue(
+            prerender_route_map_task,
+            {"bus_id": bus_id},
+            f"route map prerender for bus_id={bus_id}",
+            fail_silently,
+            use_on_commit,
+        )
@@ -1,10 +1,12 @@
+import asyncio
 import logging
 import secrets
 
+import httpx
 import requests
 from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
-from django.db import transaction
+from django.db import IntegrityError, transaction
 from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.response import Response
@@ -19,117 +21,66 @@ from django.utils.encoding import force_str
 from .payments import client
 from django.conf import settings
 from .utils import Util
-from .models import Bus, Seat, Booking, Payment, Ticket, Profile
+from .analytics import GRANULARITIES, GROUPINGS, revenue_series
+from .availability import parse_journey_date, seats_prefetch
+from .dashboard_rollups import (
+    dashboard_summary,
+    record_bus_change,
+    record_cancellation,
+    record_refund,
+    record_sale,
+)
+from .exports import CONTENT_TYPES, EXPORTS, aiter_chunks, export_stream
+from .fleet_import import FleetImportError, import_fleet, parse_fleet
+from .models import Bus, Seat, Booking, BookingHistory, Payment, Ticket, Profile
 from .redis_service import LocalRedisOTPService
 from .rate_limit_service import allow_otp_request
+from .route_search import filter_operator, filter_route
+from .seat_bitmap_service import SeatBitmapService
+from .seat_hold_service import SeatHoldService
+from .seat_provisioning import reconcile_seats
+from .sweepers import latest_sweeper_runs
+from .ticket_service import TicketArtifactStore, generate_tickets_pdf_bytes
 from .serializers import (
     UserRegisterSerializer,
     BusSerializers,
     BookingSerializer,
+    BookingHistorySerializer,
     UserProfileSerializer,
     PaymentSerializer,
     AdminBusSerializer,
+    AdminBusListSerializer,
     AdminRecentBookingSerializer,
     RequestOTPSerializer,
     VerifyOTPSerializer,
 )
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
-from reportlab.lib import colors
-from django.http import HttpResponse
-import qrcode
+from django.http import HttpResponse, HttpResponseNotModified, JsonResponse, StreamingHttpResponse
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
 from django.shortcuts import render
+from django.views import View
 
 from django.utils import timezone
-from datetime import timedelta
-
-from io import BytesIO
 
+from .http_client import upstream_metrics
+from .pagination import AdminBusPagination, BookingTimelinePagination
 from .permissions import IsAdmin
-from .tomtom_service import (
-    fetch_route_map_image,
-    fetch_route_points,
-    geocode_location,
-    route_bbox,
-    tomtom_key_configured,
-)
+from .route_map_cache import get_route_geometry, get_route_geometry_async, get_route_map, get_route_map_async
+from .tomtom_service import tomtom_key_configured
 
 
-from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.parsers import JSONParser, MultiPartParser, FormParser
 
-from django.db.models import Sum
+from django.db.models import Q
 from datetime import date as date
+from datetime import timedelta
 
 logger = logging.getLogger(__name__)
 
 
-def generate_ticket_pdf_bytes(ticket):
-    buffer = BytesIO()
-    p = canvas.Canvas(buffer, pagesize=A4)
-    width, height = A4
-
-    card_x = 40
-    card_y = 120
-    card_w = width - 80
-    card_h = height - 200
-
-    p.setFillColorRGB(0.05, 0.1, 0.15)
-    p.roundRect(card_x, card_y, card_w, card_h, 20, fill=1)
-
-    p.setFillColor(colors.white)
-    p.setFont("Helvetica-Bold", 20)
-    p.drawString(card_x + 30, height - 100, "Travels App - Bus Ticket")
-
-    p.setFont("Helvetica", 11)
-    p.setFillColor(colors.lightgrey)
-    p.drawString(card_x + 30, height - 125, f"Ticket ID: #{ticket.id}")
-
-    p.setStrokeColor(colors.grey)
-    p.line(card_x + 20, height - 145, card_x + card_w - 20, height - 145)
-
-    y = height - 180
-    gap = 28
-
-    def field(label, value):
-        nonlocal y
-        p.setFillColor(colors.cyan)
-        p.setFont("Helvetica-Bold", 11)
-        p.drawString(card_x + 30, y, label)
-        p.setFillColor(colors.white)
-        p.setFont("Helvetica", 12)
-        p.drawString(card_x + 180, y, str(value))
-        y -= gap
-
-    booking = ticket.booking
-
-    field("Passenger", booking.user.username)
-    field("Bus", booking.bus.bus_name)
-    field("Route", f"{booking.bus.origin} → {booking.bus.destination}")
-    field("Seat", booking.seat.seat_number)
-    field("Journey Date", booking.journey_date)
-    field("Start Time", booking.bus.start_time)
-    field("Reach Time", booking.bus.reach_time)
-    field("Price", f"₹ {booking.bus.price}")
-    field("Booked At", booking.booking_time.strftime("%d %b %Y, %I:%M %p"))
-
-    verify_url = f"https://travels-backend-ge3s.onrender.com/api/tickets/verify/{ticket.id}/"
-    qr_img = qrcode.make(verify_url).convert("RGB")
-    p.drawInlineImage(qr_img, card_x + card_w - 150, card_y + 50, 110, 110)
-
-    p.setFillColor(colors.lightgrey)
-    p.setFont("Helvetica", 9)
-    p.drawString(card_x + card_w - 155, card_y + 40, "Scan to verify ticket")
-
-    p.setFillColor(colors.lightgrey)
-    p.setFont("Helvetica-Oblique", 10)
-    p.drawString(card_x + 30, card_y + 30, "Show this ticket while boarding. Have a safe journey!")
-
-    p.showPage()
-    p.save()
-
-    pdf_bytes = buffer.getvalue()
-    buffer.close()
-    return pdf_bytes
+def invalidate_booking_tickets(booking):
+    for ticket_id in Ticket.objects.filter(booking=booking).values_list("id", flat=True):
+        TicketArtifactStore.invalidate(ticket_id)
 
 
 class BookingTicketView(APIView):
@@ -145,7 +96,7 @@ class BookingTicketView(APIView):
             defaults={"user": request.user}
         )
 
-        pdf_bytes = generate_ticket_pdf_bytes(ticket)
+        pdf_bytes = TicketArtifactStore.get_or_render(ticket)
 
         response = HttpResponse(pdf_bytes, content_type="application/pdf")
         response["Content-Disposition"] = f'attachment; filename="ticket_{ticket.id}.pdf"'
@@ -236,20 +187,22 @@ class RefundTicketView(APIView):
             return Response({"error": "Ticket already refunded"}, status=400)
 
         payment = Payment.objects.filter(
+            Q(booking=booking) | Q(bookings=booking),
             user=request.user,
-            booking=booking,
             status="SUCCESS"
-        ).first()
+        ).distinct().first()
 
         if not payment:
             return Response({"error": "No successful payment found"}, status=400)
 
+        refund_paise = payment.amount // max(len(payment.seat_ids), 1)
+
         try:
 
             refund = client.payment.refund(
                 payment.razorpay_payment_id,
                 {
-                    "amount": payment.amount 
+                    "amount": refund_paise
                 }
             )
             print("Refund success:", refund)
@@ -261,16 +214,25 @@ class RefundTicketView(APIView):
             ticket.status = "REFUNDED"
             ticket.save()
 
-            payment.status = "REFUNDED"
+            payment.bus_id = payment.bus_id or booking.bus_id
+            payment.refunded_amount += refund_paise
+            payment.refunded_seats += 1
+            if not payment.bookings.exclude(id=booking.id).exists():
+                payment.status = "REFUNDED"
             payment.save()
 
             seat = booking.seat
             seat.is_booked = False
             seat.save()
 
-            refund_amount = payment.amount / 100
+            refund_amount = refund_paise / 100
 
             booking.delete()
+            SeatBitmapService.mark_free(seat, booking.journey_date)
+            record_refund(payment, refund_paise)
+            record_cancellation(booking)
+
+        TicketArtifactStore.invalidate(ticket.id)
 
      
         if request.user.email:
@@ -566,52 +528,63 @@ class ConfirmPasswordResetView(APIView):
         return Response({"message": "Password reset successful"}, status=status.HTTP_200_OK)
 
 
+def requested_seat_ids(data):
+    seat_ids = data.get("seat_ids")
+    if seat_ids is None:
+        seat_ids = [data["seat_id"]] if data.get("seat_id") else []
+    if not isinstance(seat_ids, (list, tuple)):
+        seat_ids = [seat_ids]
+
+    try:
+        return sorted({int(seat_id) for seat_id in seat_ids})
+    except (TypeError, ValueError):
+        return None
+
+
 class CreatePaymentOrderView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
-        seat_id = request.data.get("seat_id")
+        seat_ids = requested_seat_ids(request.data)
         journey_date = request.data.get("journey_date")
 
-        if not seat_id:
+        if seat_ids is None:
+            return Response({"error": "Invalid seat"}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not seat_ids:
             return Response({"error": "seat_id is required"}, status=status.HTTP_400_BAD_REQUEST)
 
-        with transaction.atomic():
-            try:
-                seat = (
-                    Seat.objects
-                    .select_for_update()
-                    .select_related("bus")
-                    .get(id=seat_id)
-                )
-            except Seat.DoesNotExist:
-                return Response({"error": "Invalid seat"}, status=status.HTTP_400_BAD_REQUEST)
-
-  
-            if journey_date and Booking.objects.filter(
-                bus=seat.bus,
-                seat=seat,
-                journey_date=journey_date
-            ).exists():
-                return Response({"error": "Seat already booked for this date"}, status=400)
+        if len(seat_ids) > settings.GROUP_BOOKING_MAX_SEATS:
+            return Response(
+                {"error": f"You can book at most {settings.GROUP_BOOKING_MAX_SEATS} seats at once"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-            if seat.is_held and seat.hold_expires_at:
-                if seat.hold_expires_at > timezone.now():
-                    return Response(
-                        {"error": "Seat is temporarily held. Try again later."},
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-                else:
-     
-                    seat.is_held = False
-                    seat.hold_expires_at = None
-                    seat.save()
+        journey_date = parse_journey_date(journey_date)
+        if journey_date is None:
+            return Response({"error": "A valid journey_date is required"}, status=status.HTTP_400_BAD_REQUEST)
 
-            seat.is_held = True
-            seat.hold_expires_at = timezone.now() + timedelta(minutes=5)
-            seat.save()
+        seats = list(Seat.objects.select_related("bus").filter(id__in=seat_ids).order_by("id"))
+        if len(seats) != len(seat_ids):
+            return Response({"error": "Invalid seat"}, status=status.HTTP_400_BAD_REQUEST)
+
+        if len({seat.bus_id for seat in seats}) > 1:
+            return Response({"error": "All seats must be on the same bus"}, status=status.HTTP_400_BAD_REQUEST)
+
+        if Booking.objects.filter(
+            seat__in=seats,
+            journey_date=journey_date,
+            status=Booking.STATUS_CONFIRMED,
+        ).exists():
+            return Response({"error": "Seat already booked for this date"}, status=400)
+
+        if not SeatHoldService.acquire(seats, journey_date, request.user):
+            return Response(
+                {"error": "Seat is temporarily held. Try again later."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-        amount = int(seat.bus.price * 100)
+        amount = int(seats[0].bus.price * 100) * len(seats)
 
         order = client.order.create({
             "amount": amount,
@@ -623,6 +596,8 @@ class CreatePaymentOrderView(APIView):
             user=request.user,
             razorpay_order_id=order["id"],
             amount=amount,
+            seat_ids=seat_ids,
+            journey_date=journey_date,
             status="CREATED"
         )
 
@@ -631,6 +606,7 @@ class CreatePaymentOrderView(APIView):
             "amount": amount,
             "currency": "INR",
             "key": settings.RAZORPAY_KEY_ID,
+            "seat_ids": seat_ids,
         })
 
 
@@ -670,87 +646,103 @@ class VerifyPaymentView(APIView):
             except Payment.DoesNotExist:
                 return Response({"error": "Payment record not found"}, status=404)
 
-            try:
-                seat = (
-                    Seat.objects
-                    .select_for_update()
-                    .select_related("bus")
-                    .get(id=seat_id)
-                )
-            except Seat.DoesNotExist:
-                return Response({"error": "Seat not found"}, status=404)
-
-        
-            if Booking.objects.filter(
-                bus=seat.bus,
-                seat=seat,
-                journey_date=journey_date
-            ).exists():
-                return Response(  {"error": "Seat already booked for this date"}, status=400)
-
+            seat_ids = payment.seat_ids or [seat_id]
+            journey_date = payment.journey_date or journey_date
 
+            seats = list(Seat.objects.select_related("bus").filter(id__in=seat_ids).order_by("id"))
+            if not seats or len(seats) != len(set(seat_ids)):
+                return Response({"error": "Seat not found"}, status=404)
 
-            if seat.hold_expires_at and seat.hold_expires_at < timezone.now():
-                seat.is_held = False
-                seat.hold_expires_at = None
-                seat.save()
+            if SeatHoldService.is_lost(seats, journey_date, request.user):
                 return Response({"error": "Seat hold expired"}, status=400)
 
-     
-            booking = Booking.objects.create(
-                user=request.user,
-                bus=seat.bus,
-                seat=seat,
-                journey_date=journey_date
-            )
+            try:
+                with transaction.atomic():
+                    bookings = Booking.objects.bulk_create([
+                        Booking(
+                            user=request.user,
+                            bus=seat.bus,
+                            seat=seat,
+                            journey_date=journey_date,
+                            order_payment=payment,
+                        )
+                        for seat in seats
+                    ])
+            except IntegrityError:
+                SeatHoldService.release(seats, journey_date, request.user)
+                return Response({"error": "Seat already booked for this date"}, status=400)
 
-            seat.is_held = False
-            seat.hold_expires_at = None
-            seat.save()
+            for seat in seats:
+                SeatBitmapService.mark_booked(seat, journey_date)
+
+            transaction.on_commit(lambda: SeatHoldService.release(seats, journey_date, request.user))
 
 
             payment.razorpay_payment_id = payment_id
             payment.razorpay_signature = signature
             payment.status = "SUCCESS"
-            payment.booking = booking
+            payment.booking = bookings[0]
+            payment.bus = seats[0].bus
             payment.save()
+            record_sale(payment, len(bookings))
 
-   
-        ticket, _ = Ticket.objects.get_or_create(
-            booking=booking,
-            defaults={"user": request.user}
-        )
-
-        pdf_bytes = generate_ticket_pdf_bytes(ticket)
+            tickets = Ticket.objects.bulk_create([
+                Ticket(booking=booking, user=request.user)
+                for booking in bookings
+            ])
 
-        if request.user.email:
-            Util.queue_templated_email(
-                subject="Your Bus Ticket – Travels App",
-                template_name="emails/ticket_email.html",
-                context={
-                    "username": request.user.username,
-                    "ticket_id": ticket.id,
-                    "bus_name": booking.bus.bus_name,
-                    "origin": booking.bus.origin,
-                    "destination": booking.bus.destination,
-                    "seat_number": booking.seat.seat_number,
-                    "start_time": booking.bus.start_time,
-                    "reach_time": booking.bus.reach_time,
-                },
-                to_email=request.user.email,
-                attachments=[{
-                    "filename": f"ticket_{ticket.id}.pdf",
-                    "content": pdf_bytes,
-                    "mimetype": "application/pdf",
-                }],
-            )
+            if request.user.email:
+                if len(tickets) == 1:
+                    Util.queue_ticket_email(tickets[0].id)
+                else:
+                    Util.queue_group_ticket_email([ticket.id for ticket in tickets])
 
         return Response({
             "message": "Payment verified and booking confirmed",
-            "booking_id": booking.id
+            "booking_id": bookings[0].id,
+            "booking_ids": [booking.id for booking in bookings],
         })
 
 
+class PaymentTicketsView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, order_id):
+        tickets = list(
+            Ticket.objects
+            .select_related("booking", "booking__user", "booking__bus", "booking__seat")
+            .filter(
+                user=request.user,
+                booking__order_payment__razorpay_order_id=order_id,
+            )
+            .order_by("booking__seat_id")
+        )
+        if not tickets:
+            return Response({"error": "No tickets found for this payment"}, status=status.HTTP_404_NOT_FOUND)
+
+        pdf_bytes = generate_tickets_pdf_bytes(tickets)
+
+        response = HttpResponse(pdf_bytes, content_type="application/pdf")
+        response["Content-Disposition"] = f'attachment; filename="tickets_{order_id}.pdf"'
+        return response
+
+
+class ReleaseSeatHoldView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        journey_date = parse_journey_date(request.data.get("journey_date"))
+        if journey_date is None:
+            return Response({"error": "A valid journey_date is required"}, status=status.HTTP_400_BAD_REQUEST)
+
+        seat_ids = requested_seat_ids(request.data)
+        seats = list(Seat.objects.filter(id__in=seat_ids or []))
+        if not seats:
+            return Response({"error": "Invalid seat"}, status=status.HTTP_400_BAD_REQUEST)
+
+        SeatHoldService.release(seats, journey_date, request.user)
+        return Response({"message": "Seat hold released"})
+
 
 class MyPaymentsView(APIView):
     permission_classes = [IsAuthenticated]
@@ -778,67 +770,177 @@ class BusListCreateApiView(generics.ListAPIView):
     serializer_class = BusSerializers
 
     def get_queryset(self):
-        queryset = Bus.objects.filter(is_active=True)
-        origin = self.request.query_params.get("origin")
-        destination = self.request.query_params.get("destination")
-
-        if origin:
-            queryset = queryset.filter(origin__icontains=origin)
-        if destination:
-            queryset = queryset.filter(destination__icontains=destination)
-
-        return queryset
+        queryset = Bus.objects.filter(is_active=True).prefetch_related(seats_prefetch())
+        return filter_route(
+            queryset,
+            origin=self.request.query_params.get("origin"),
+            destination=self.request.query_params.get("destination"),
+        )
 
     def get_serializer_context(self):
         return {"request": self.request}
 
 
 class BusDetailView(generics.RetrieveAPIView):
-    queryset = Bus.objects.all()
+    queryset = Bus.objects.prefetch_related(seats_prefetch())
     serializer_class = BusSerializers
 
     def get_serializer_context(self):
         return {"request": self.request}
 
 
-class BusRouteMapView(APIView):
-    permission_classes = []
+def clamp_dimension(value, default, minimum=128, maximum=1600):
+    try:
+        return min(max(int(value), minimum), maximum)
+    except (TypeError, ValueError):
+        return default
+
+
+def etag_matches(request, etag):
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+    return etag in parse_etags(if_none_match) or if_none_match.strip() == "*"
+
+
+def route_map_response(response, etag):
+    response["ETag"] = etag
+    patch_cache_control(response, public=True, max_age=settings.ROUTE_MAP_BROWSER_MAX_AGE_SECONDS)
+    return response
+
+
+def route_lookup_failed(exc, default_message):
+    upstream_response = getattr(exc, "response", None)
+    error_message = default_message
+    if upstream_response is not None and upstream_response.text:
+        error_message = upstream_response.text[:500]
+    return JsonResponse(
+        {"error": error_message},
+        status=status.HTTP_502_BAD_GATEWAY,
+    )
+
+
+def clamp_tolerance(value, default, maximum=0.05, places=4):
+    try:
+        tolerance = float(value)
+    except (TypeError, ValueError):
+        return default
+    if tolerance != tolerance:
+        return default
+    return round(min(max(tolerance, 0.0), maximum), places)
+
+
+def route_error(bus):
+    if bus is None:
+        return JsonResponse({"error": "Bus not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    if not tomtom_key_configured():
+        return JsonResponse(
+            {"error": "Map API key is not configured"},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+
+    return None
+
+
+def route_map_result(request, route_map):
+    if etag_matches(request, route_map["etag"]):
+        return route_map_response(HttpResponseNotModified(), route_map["etag"])
+
+    return route_map_response(
+        HttpResponse(route_map["content"], content_type=route_map["content_type"]),
+        route_map["etag"],
+    )
+
+
+def route_geometry_result(request, route):
+    if etag_matches(request, route["etag"]):
+        return route_map_response(HttpResponseNotModified(), route["etag"])
 
+    payload = {field: value for field, value in route.items() if field != "etag"}
+    return route_map_response(JsonResponse(payload), route["etag"])
+
+
+class SyncBusRouteMapView(View):
     def get(self, request, pk):
+        bus = Bus.objects.filter(pk=pk, is_active=True).first()
+        error_response = route_error(bus)
+        if error_response is not None:
+            return error_response
+
+        width = clamp_dimension(request.GET.get("width"), 900)
+        height = clamp_dimension(request.GET.get("height"), 360)
+
         try:
-            bus = Bus.objects.get(pk=pk, is_active=True)
-        except Bus.DoesNotExist:
-            return Response({"error": "Bus not found"}, status=status.HTTP_404_NOT_FOUND)
+            route_map = get_route_map(bus.origin, bus.destination, width, height)
+        except ValueError as exc:
+            return JsonResponse({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        except requests.RequestException as exc:
+            logger.exception("Route map lookup failed for bus_id=%s", bus.id)
+            return route_lookup_failed(exc, "Unable to load map right now")
 
-        if not tomtom_key_configured():
-            return Response(
-                {"error": "Map API key is not configured"},
-                status=status.HTTP_503_SERVICE_UNAVAILABLE,
-            )
+        return route_map_result(request, route_map)
+
+
+class SyncBusRouteView(View):
+    def get(self, request, pk):
+        bus = Bus.objects.filter(pk=pk, is_active=True).first()
+        error_response = route_error(bus)
+        if error_response is not None:
+            return error_response
+
+        tolerance = clamp_tolerance(request.GET.get("tolerance"), settings.ROUTE_SIMPLIFY_TOLERANCE)
 
         try:
-            origin = geocode_location(bus.origin)
-            destination = geocode_location(bus.destination)
-            route_data = fetch_route_points(origin, destination)
-            route_bounds = route_bbox(route_data["points"])
-            image_bytes, content_type = fetch_route_map_image(route_bounds)
+            route = get_route_geometry(bus.origin, bus.destination, tolerance)
         except ValueError as exc:
-            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+            return JsonResponse({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
         except requests.RequestException as exc:
+            logger.exception("Route lookup failed for bus_id=%s", bus.id)
+            return route_lookup_failed(exc, "Unable to load route right now")
+
+        return route_geometry_result(request, route)
+
+
+class BusRouteMapView(View):
+    async def get(self, request, pk):
+        bus = await Bus.objects.filter(pk=pk, is_active=True).afirst()
+        error_response = route_error(bus)
+        if error_response is not None:
+            return error_response
+
+        width = clamp_dimension(request.GET.get("width"), 900)
+        height = clamp_dimension(request.GET.get("height"), 360)
+
+        try:
+            route_map = await get_route_map_async(bus.origin, bus.destination, width, height)
+        except ValueError as exc:
+            return JsonResponse({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        except (httpx.HTTPError, asyncio.TimeoutError) as exc:
             logger.exception("Route map lookup failed for bus_id=%s", bus.id)
-            upstream_response = getattr(exc, "response", None)
-            error_message = "Unable to load map right now"
-            if upstream_response is not None and upstream_response.text:
-                error_message = upstream_response.text[:500]
-            return Response(
-                {"error": error_message},
-                status=status.HTTP_502_BAD_GATEWAY,
-            )
+            return route_lookup_failed(exc, "Unable to load map right now")
+
+        return route_map_result(request, route_map)
 
-        return HttpResponse(image_bytes, content_type=content_type)
- 
 
+class BusRouteView(View):
+    async def get(self, request, pk):
+        bus = await Bus.objects.filter(pk=pk, is_active=True).afirst()
+        error_response = route_error(bus)
+        if error_response is not None:
+            return error_response
 
+        tolerance = clamp_tolerance(request.GET.get("tolerance"), settings.ROUTE_SIMPLIFY_TOLERANCE)
+
+        try:
+            route = await get_route_geometry_async(bus.origin, bus.destination, tolerance)
+        except ValueError as exc:
+            return JsonResponse({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        except (httpx.HTTPError, asyncio.TimeoutError) as exc:
+            logger.exception("Route lookup failed for bus_id=%s", bus.id)
+            return route_lookup_failed(exc, "Unable to load route right now")
+
+        return route_geometry_result(request, route)
 
 
 class CancelBookingView(APIView):
@@ -877,24 +979,62 @@ class CancelBookingView(APIView):
                 to_email=request.user.email,
             )
 
+        invalidate_booking_tickets(booking)
         booking.delete()
+        SeatBitmapService.mark_free(seat, booking.journey_date)
+        record_cancellation(booking)
         return Response({"message": "Booking cancelled successfully"}, status=status.HTTP_200_OK)
 
 
-class MyBookingsView(APIView):
+class MyBookingsView(generics.ListAPIView):
     permission_classes = [IsAuthenticated]
+    serializer_class = BookingSerializer
+    pagination_class = BookingTimelinePagination
 
-    def get(self, request):
-        today = timezone.localdate()
-        Booking.objects.filter(
-            user=request.user,
-            journey_date__lt=today,
-            status=Booking.STATUS_CONFIRMED
-        ).update(status=Booking.STATUS_EXPIRED)
+    def get_queryset(self):
+        return (
+            Booking.objects
+            .filter(user=self.request.user)
+            .select_related("user", "bus", "seat", "seat__bus")
+        )
 
-        bookings = Booking.objects.filter(user=request.user)
-        serializer = BookingSerializer(bookings, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+    def get_history_queryset(self):
+        return BookingHistory.objects.filter(user=self.request.user).select_related("user")
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["today"] = timezone.localdate()
+        return context
+
+    def list(self, request, *args, **kwargs):
+        page = self.paginator.paginate_sources(
+            [(self.get_queryset(), "id"), (self.get_history_queryset(), "booking_id")],
+            request,
+        )
+        context = self.get_serializer_context()
+        data = [
+            BookingSerializer(row, context=context).data
+            if isinstance(row, Booking)
+            else BookingHistorySerializer(row, context=context).data
+            for row in page
+        ]
+        return self.paginator.get_paginated_response(data)
+
+
+ADMIN_BUS_LIST_COLUMNS = [
+    "id",
+    "bus_name",
+    "number",
+    "origin",
+    "destination",
+    "features",
+    "start_time",
+    "reach_time",
+    "no_of_seats",
+    "price",
+    "is_active",
+    "image_url",
+]
 
 
 class AdminBusListCreateView(APIView):
@@ -902,9 +1042,24 @@ class AdminBusListCreateView(APIView):
     parser_classes = [MultiPartParser, FormParser]
 
     def get(self, request):
-        buses = Bus.objects.all().order_by("-id")
-        serializer = AdminBusSerializer(buses, many=True)
-        return Response(serializer.data)
+        params = request.query_params
+        buses = Bus.objects.only(*ADMIN_BUS_LIST_COLUMNS)
+
+        active = params.get("active")
+        if active in ("1", "true", "True"):
+            buses = buses.filter(is_active=True)
+        elif active in ("0", "false", "False"):
+            buses = buses.filter(is_active=False)
+        elif active:
+            return Response({"error": "active must be true or false"}, status=status.HTTP_400_BAD_REQUEST)
+
+        buses = filter_route(buses, origin=params.get("origin"), destination=params.get("destination"))
+        buses = filter_operator(buses, params.get("operator"))
+
+        paginator = AdminBusPagination()
+        page = paginator.paginate_queryset(buses, request)
+        serializer = AdminBusListSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
     def post(self, request):
         serializer = AdminBusSerializer(data=request.data)
@@ -914,6 +1069,42 @@ class AdminBusListCreateView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class AdminBusImportView(APIView):
+    permission_classes = [IsAuthenticated, IsAdmin]
+    parser_classes = [JSONParser, MultiPartParser, FormParser]
+
+    def post(self, request):
+        upload = request.FILES.get("file")
+        try:
+            if upload is not None:
+                file_format = upload.name.rsplit(".", 1)[-1].lower()
+                rows = parse_fleet(upload.read(), file_format)
+            elif isinstance(request.data, list):
+                rows = request.data
+            elif isinstance(request.data.get("buses"), list):
+                rows = request.data["buses"]
+            else:
+                raise FleetImportError("Upload a CSV or JSON file, or send a list of buses")
+        except FleetImportError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if len(rows) > settings.FLEET_IMPORT_MAX_ROWS:
+            return Response(
+                {"error": f"Import is limited to {settings.FLEET_IMPORT_MAX_ROWS} buses per request"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        dry_run = request.query_params.get("dry_run") in ("1", "true", "True")
+        result = import_fleet(rows, dry_run=dry_run)
+        if result["created"]:
+            response_status = status.HTTP_201_CREATED
+        elif result["errors"]:
+            response_status = status.HTTP_400_BAD_REQUEST
+        else:
+            response_status = status.HTTP_200_OK
+        return Response(result, status=response_status)
+
+
 class AdminBusDetailView(APIView):
     permission_classes = [IsAuthenticated, IsAdmin]
     parser_classes = [MultiPartParser, FormParser]
@@ -924,9 +1115,13 @@ class AdminBusDetailView(APIView):
         except Bus.DoesNotExist:
             return Response({"error": "Bus not found"}, status=404)
 
+        previous_seat_count = bus.no_of_seats
         serializer = AdminBusSerializer(bus, data=request.data, partial=True)
         if serializer.is_valid():
-            serializer.save()
+            with transaction.atomic():
+                bus = serializer.save()
+                if bus.no_of_seats != previous_seat_count:
+                    reconcile_seats(bus)
             return Response(serializer.data)
         return Response(serializer.errors, status=400)
 
@@ -944,7 +1139,7 @@ class AdminTotalBookingsView(APIView):
     permission_classes = [IsAuthenticated, IsAdmin]
 
     def get(self, request):
-        total_bookigs = Booking.objects.count()
+        total_bookigs = dashboard_summary()["totals"]["bookings"]
         return Response({
             "total_bookings":total_bookigs
         }, status=status.HTTP_200_OK)
@@ -954,10 +1149,10 @@ class AdminTotalRevenueView(APIView):
     permission_classes = [IsAuthenticated, IsAdmin]
 
     def get(self, request):
-        total_revenue = Payment.objects.filter(status ="SUCCESS").aggregate(total=Sum("amount"))["total"] or 0
+        total_revenue = dashboard_summary()["totals"]["revenue"]
 
         return Response({
-            "total_revenue":total_revenue/100
+            "total_revenue":total_revenue
         }, status=status.HTTP_200_OK)
     
 
@@ -967,7 +1162,7 @@ class AdminActiveBusesView(APIView):
 
     def get(self, request):
         
-        active_buses = Bus.objects.filter(is_active=True).count()
+        active_buses = dashboard_summary()["active_buses"]
 
         return Response({
             "active_buses":active_buses},
@@ -975,18 +1170,136 @@ class AdminActiveBusesView(APIView):
             )
 
 
-class AdminRecentBookingsView(APIView):
+class AdminUpstreamMetricsView(APIView):
     permission_classes = [IsAuthenticated, IsAdmin]
 
     def get(self, request):
-        recent_bookings = (
-            Booking.objects
-            .select_related("bus", "seat", "user")
-            .order_by("-booking_time")[:10]
+        return Response(upstream_metrics(), status=status.HTTP_200_OK)
+
+
+class AdminSweeperMetricsView(APIView):
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get(self, request):
+        return Response(
+            {
+                name: {
+                    "started_at": run.started_at,
+                    "finished_at": run.finished_at,
+                    "batches": run.batches,
+                    "rows": run.rows,
+                    "elapsed_ms": round(run.elapsed_ms, 1),
+                }
+                for name, run in latest_sweeper_runs().items()
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class AdminAnalyticsView(APIView):
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get(self, request):
+        today = timezone.localdate()
+        end = parse_journey_date(request.query_params.get("end")) or today
+        start = parse_journey_date(request.query_params.get("start")) or end - timedelta(days=29)
+        granularity = request.query_params.get("granularity", "day")
+        group_by = request.query_params.get("group_by", "total")
+        bus_id = request.query_params.get("bus_id")
+
+        if start > end:
+            return Response({"error": "start must be on or before end"}, status=status.HTTP_400_BAD_REQUEST)
+        if (end - start).days + 1 > settings.ANALYTICS_MAX_DAYS:
+            return Response(
+                {"error": f"Date range cannot exceed {settings.ANALYTICS_MAX_DAYS} days"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if granularity not in GRANULARITIES:
+            return Response({"error": "granularity must be day, week or month"}, status=status.HTTP_400_BAD_REQUEST)
+        if group_by not in GROUPINGS:
+            return Response({"error": "group_by must be total, bus or route"}, status=status.HTTP_400_BAD_REQUEST)
+        if bus_id is not None:
+            try:
+                bus_id = int(bus_id)
+            except ValueError:
+                return Response({"error": "Invalid bus id"}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(
+            {
+                "start": start,
+                "end": end,
+                "granularity": granularity,
+                "group_by": group_by,
+                "series": revenue_series(start, end, granularity, group_by, bus_id),
+            },
+            status=status.HTTP_200_OK,
         )
 
-        serializer = AdminRecentBookingSerializer(recent_bookings, many=True)
-        return Response(serializer.data)
+
+class AdminExportView(APIView):
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get(self, request, dataset, file_format):
+        if dataset not in EXPORTS or file_format not in CONTENT_TYPES:
+            return Response({"error": "Unknown export"}, status=status.HTTP_404_NOT_FOUND)
+
+        filters = {
+            "start": parse_journey_date(request.query_params.get("start")),
+            "end": parse_journey_date(request.query_params.get("end")),
+            "status": request.query_params.get("status"),
+            "bus_id": None,
+        }
+        bus_id = request.query_params.get("bus_id")
+        if bus_id is not None:
+            try:
+                filters["bus_id"] = int(bus_id)
+            except ValueError:
+                return Response({"error": "Invalid bus id"}, status=status.HTTP_400_BAD_REQUEST)
+
+        chunks = export_stream(dataset, file_format, filters)
+        if settings.SERVER_MODE == "asgi":
+            chunks = aiter_chunks(chunks)
+
+        response = StreamingHttpResponse(chunks, content_type=CONTENT_TYPES[file_format])
+        filename = f"{dataset}-{timezone.localdate():%Y%m%d}.{file_format}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        response["Cache-Control"] = "no-store"
+        return response
+
+
+def recent_bookings_data():
+    recent_bookings = (
+        Booking.objects
+        .select_related("bus", "seat", "user")
+        .order_by("-booking_time")[:10]
+    )
+    return AdminRecentBookingSerializer(recent_bookings, many=True).data
+
+
+class AdminRecentBookingsView(APIView):
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get(self, request):
+        return Response(recent_bookings_data())
+
+
+class AdminDashboardSummaryView(APIView):
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get(self, request):
+        summary = dashboard_summary()
+        return Response(
+            {
+                "total_bookings": summary["totals"]["bookings"],
+                "total_revenue": summary["totals"]["revenue"],
+                "total_refunds": summary["totals"]["refunds"],
+                "refunded_amount": summary["totals"]["refunded"],
+                "active_buses": summary["active_buses"],
+                "today": summary["today"],
+                "recent_bookings": recent_bookings_data(),
+            },
+            status=status.HTTP_200_OK,
+        )
 
 
 class EditBookingRequestView(APIView):
@@ -1065,15 +1378,23 @@ class EditBookingRequestView(APIView):
         total_extra = extra_amount + edit_fee
 
         if total_extra <= 0:
-            with transaction.atomic():
-                if new_bus_id:
-                    booking.bus = new_bus
-                if new_seat_id and new_seat.id != booking.seat.id:
-                    booking.seat = new_seat
-                if new_date and str(new_date) != str(booking.journey_date):
-                    booking.journey_date = new_date
-                booking.save()
+            try:
+                with transaction.atomic():
+                    SeatBitmapService.mark_free(booking.seat, booking.journey_date)
+                    previous_bus_id = booking.bus_id
+                    if new_bus_id:
+                        booking.bus = new_bus
+                    if new_seat_id and new_seat.id != booking.seat.id:
+                        booking.seat = new_seat
+                    if new_date and str(new_date) != str(booking.journey_date):
+                        booking.journey_date = new_date
+                    booking.save()
+                    SeatBitmapService.mark_booked(booking.seat, booking.journey_date)
+                    record_bus_change(booking, previous_bus_id)
+            except IntegrityError:
+                return Response({"error": "Seat already booked for this date"}, status=400)
 
+            invalidate_booking_tickets(booking)
             return Response({"message": "No extra payment required"})
 
         amount = int(total_extra * 100)
@@ -1152,8 +1473,10 @@ class VerifyEditPaymentView(APIView):
                     )
 
         
+            SeatBitmapService.mark_free(booking.seat, booking.journey_date)
             booking.seat.is_booked = False
             booking.seat.save()
+            previous_bus_id = booking.bus_id
 
             if new_bus_id:
                 booking.bus = Bus.objects.get(id=new_bus_id)
@@ -1167,10 +1490,20 @@ class VerifyEditPaymentView(APIView):
             if new_date:
                 booking.journey_date = new_date
  
-            booking.save()
+            try:
+                with transaction.atomic():
+                    booking.save()
+            except IntegrityError:
+                transaction.set_rollback(True)
+                return Response({"error": "Seat already booked for this date"}, status=400)
+            SeatBitmapService.mark_booked(booking.seat, booking.journey_date)
+            record_bus_change(booking, previous_bus_id)
 
             payment.status = "SUCCESS"
             payment.razorpay_payment_id = payment_id
+            payment.bus = booking.bus
             payment.save()
+            record_sale(payment, 0)
 
+        invalidate_booking_tickets(booking)
         return Response({"message": "Booking updated successfully"})
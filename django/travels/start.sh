@@ -3,4 +3,9 @@ set -e
 
 python manage.py collectstatic --noinput
 python manage.py migrate --noinput
+
+if [ "${SERVER_MODE:-wsgi}" = "asgi" ]; then
+    exec gunicorn travels.asgi:application -k uvicorn_worker.UvicornWorker --bind 0.0.0.0:${PORT:-8000}
+fi
+
 gunicorn travels.wsgi:application --bind 0.0.0.0:${PORT:-8000}
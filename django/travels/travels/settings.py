@@ -1,6 +1,8 @@
 from pathlib import Path
 from datetime import timedelta
 import os
+import sys
+from celery.schedules import crontab
 from dotenv import load_dotenv
 
 try:
@@ -139,8 +141,90 @@ OTP_TTL_SECONDS = int(os.getenv("OTP_TTL_SECONDS", "300"))
 OTP_RATE_LIMIT_MAX_REQUESTS = int(os.getenv("OTP_RATE_LIMIT_MAX_REQUESTS", "3"))
 OTP_RATE_LIMIT_WINDOW_SECONDS = int(os.getenv("OTP_RATE_LIMIT_WINDOW_SECONDS", "300"))
 USER_CACHE_TTL_SECONDS = int(os.getenv("USER_CACHE_TTL_SECONDS", "300"))
+SEAT_BITMAP_TTL_SECONDS = int(os.getenv("SEAT_BITMAP_TTL_SECONDS", "600"))
+SEAT_HOLD_TTL_SECONDS = int(os.getenv("SEAT_HOLD_TTL_SECONDS", "300"))
+GROUP_BOOKING_MAX_SEATS = int(os.getenv("GROUP_BOOKING_MAX_SEATS", "6"))
 ENABLE_LOCAL_REDIS = not IS_PRODUCTION
 
+ROUTE_MAP_CACHE_ALIAS = "route_maps"
+ROUTE_MAP_CACHE_TTL_SECONDS = int(os.getenv("ROUTE_MAP_CACHE_TTL_SECONDS", "86400"))
+ROUTE_MAP_CACHE_MAX_ENTRIES = int(os.getenv("ROUTE_MAP_CACHE_MAX_ENTRIES", "200"))
+ROUTE_MAP_BROWSER_MAX_AGE_SECONDS = int(os.getenv("ROUTE_MAP_BROWSER_MAX_AGE_SECONDS", "3600"))
+ROUTE_MAP_DEADLINE_SECONDS = float(os.getenv("ROUTE_MAP_DEADLINE_SECONDS", "20"))
+ROUTE_MAP_HEDGE_DELAY_SECONDS = float(os.getenv("ROUTE_MAP_HEDGE_DELAY_SECONDS", "1.5"))
+ROUTE_SIMPLIFY_TOLERANCE = float(os.getenv("ROUTE_SIMPLIFY_TOLERANCE", "0.0005"))
+
+TESTING = len(sys.argv) > 1 and sys.argv[1] == "test"
+ROUTE_MAP_CACHE_URL = os.getenv("ROUTE_MAP_CACHE_URL", f"redis://{REDIS_HOST}:{REDIS_PORT}/0")
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    ROUTE_MAP_CACHE_ALIAS: {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": ROUTE_MAP_CACHE_URL,
+        "TIMEOUT": ROUTE_MAP_CACHE_TTL_SECONDS,
+        "KEY_PREFIX": "route-maps",
+        "OPTIONS": {
+            "socket_connect_timeout": 3,
+            "socket_timeout": 3,
+        },
+    },
+}
+
+if TESTING:
+    CACHES[ROUTE_MAP_CACHE_ALIAS] = {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "route-maps",
+        "TIMEOUT": ROUTE_MAP_CACHE_TTL_SECONDS,
+        "OPTIONS": {
+            "MAX_ENTRIES": ROUTE_MAP_CACHE_MAX_ENTRIES,
+            "CULL_FREQUENCY": 4,
+        },
+    }
+
+ROUTE_MAP_PRERENDER_SIZES = [(900, 360)]
+ROUTE_MAP_WARM_CONCURRENCY = int(os.getenv("ROUTE_MAP_WARM_CONCURRENCY", "4"))
+
+SWEEPER_BATCH_SIZE = int(os.getenv("SWEEPER_BATCH_SIZE", "1000"))
+SWEEPER_RUN_RETENTION_DAYS = int(os.getenv("SWEEPER_RUN_RETENTION_DAYS", "14"))
+ABANDONED_PAYMENT_MINUTES = int(os.getenv("ABANDONED_PAYMENT_MINUTES", "60"))
+STALE_BOOKING_RETENTION_DAYS = int(os.getenv("STALE_BOOKING_RETENTION_DAYS", "1"))
+STALE_BOOKING_ARCHIVE = os.getenv("STALE_BOOKING_ARCHIVE", "True") == "True"
+PAYMENT_ARCHIVE_AFTER_DAYS = int(os.getenv("PAYMENT_ARCHIVE_AFTER_DAYS", "30"))
+
+DASHBOARD_SUMMARY_CACHE_SECONDS = int(os.getenv("DASHBOARD_SUMMARY_CACHE_SECONDS", "30"))
+ANALYTICS_CACHE_SECONDS = int(os.getenv("ANALYTICS_CACHE_SECONDS", "300"))
+ANALYTICS_MAX_DAYS = int(os.getenv("ANALYTICS_MAX_DAYS", "731"))
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "2000"))
+EXPORT_BUFFER_BYTES = int(os.getenv("EXPORT_BUFFER_BYTES", "65536"))
+FLEET_IMPORT_BATCH_SIZE = int(os.getenv("FLEET_IMPORT_BATCH_SIZE", "500"))
+FLEET_IMPORT_MAX_ROWS = int(os.getenv("FLEET_IMPORT_MAX_ROWS", "5000"))
+
+CELERY_BEAT_SCHEDULE = {
+    "sweep-expired-seat-holds": {
+        "task": "sweep_expired_seat_holds_task",
+        "schedule": 60.0,
+    },
+    "sweep-abandoned-payments": {
+        "task": "sweep_abandoned_payments_task",
+        "schedule": 15 * 60.0,
+    },
+    "sweep-booking-statuses": {
+        "task": "sweep_booking_statuses_task",
+        "schedule": crontab(minute=5),
+    },
+    "sweep-stale-bookings": {
+        "task": "sweep_stale_bookings_task",
+        "schedule": crontab(hour=3, minute=30),
+    },
+    "sweep-archived-payments": {
+        "task": "sweep_archived_payments_task",
+        "schedule": crontab(hour=4, minute=0),
+    },
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -157,6 +241,14 @@ STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / "staticfiles"
 MEDIA_URL = "/media/"
 
+TICKET_ARTIFACT_STORAGE = os.getenv(
+    "TICKET_ARTIFACT_STORAGE",
+    "django.core.files.storage.FileSystemStorage",
+)
+TICKET_ARTIFACT_STORAGE_OPTIONS = {
+    "location": os.getenv("TICKET_ARTIFACT_ROOT", str(MEDIA_ROOT / "tickets")),
+}
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework_simplejwt.authentication.JWTAuthentication',
@@ -177,6 +269,24 @@ DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", "onboarding@resend.dev")
 RAZORPAY_KEY_ID = os.getenv("RAZORPAY_KEY_ID")
 RAZORPAY_KEY_SECRET = os.getenv("RAZORPAY_KEY_SECRET")
 TOMTOM_API_KEY = os.getenv("TOMTOM_API_KEY")
+TOMTOM_BASE_URL = os.getenv("TOMTOM_BASE_URL", "https://api.tomtom.com")
+SERVER_MODE = os.getenv("SERVER_MODE", "wsgi")
+
+OUTBOUND_HTTP_POOL_SIZE = int(os.getenv("OUTBOUND_HTTP_POOL_SIZE", "10"))
+OUTBOUND_HTTP_RETRIES = int(os.getenv("OUTBOUND_HTTP_RETRIES", "2"))
+OUTBOUND_HTTP_MAX_WORKERS = int(os.getenv("OUTBOUND_HTTP_MAX_WORKERS", "8"))
+OUTBOUND_HTTP = {
+    "tomtom": {
+        "timeout": float(os.getenv("TOMTOM_TIMEOUT_SECONDS", "10")),
+        "pool_maxsize": OUTBOUND_HTTP_POOL_SIZE,
+        "retries": OUTBOUND_HTTP_RETRIES,
+    },
+    "resend": {
+        "timeout": float(os.getenv("RESEND_TIMEOUT_SECONDS", "15")),
+        "pool_maxsize": OUTBOUND_HTTP_POOL_SIZE,
+        "retries": OUTBOUND_HTTP_RETRIES,
+    },
+}
 
 CLOUDINARY_CLOUD_NAME = os.getenv("CLOUDINARY_CLOUD_NAME")
 CLOUDINARY_API_KEY = os.getenv("CLOUDINARY_API_KEY")
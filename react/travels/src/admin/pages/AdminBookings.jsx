@@ -5,6 +5,7 @@ import { toast } from "react-toastify";
 const AdminBookings = () => {
   const [bookings, setBookings] = useState([]);
   const [loading, setLoading] = useState(true);
+  const [exporting, setExporting] = useState(null);
 
   useEffect(() => {
     const fetchBookings = async () => {
@@ -21,9 +22,51 @@ const AdminBookings = () => {
     fetchBookings();
   }, []);
 
+  const downloadExport = async (dataset, format) => {
+    setExporting(`${dataset}.${format}`);
+    try {
+      const res = await api.get(`/api/admin/export/${dataset}.${format}`, {
+        responseType: "blob",
+        timeout: 0,
+      });
+      const url = window.URL.createObjectURL(res.data);
+      const a = document.createElement("a");
+      a.href = url;
+      a.download = `${dataset}.${format}`;
+      document.body.appendChild(a);
+      a.click();
+      a.remove();
+      window.URL.revokeObjectURL(url);
+    } catch {
+      toast.error("Export failed");
+    } finally {
+      setExporting(null);
+    }
+  };
+
   return (
     <div className="space-y-6">
-      <h2 className="text-2xl font-semibold text-cyan-300">All Bookings</h2>
+      <div className="flex flex-wrap items-center justify-between gap-3">
+        <h2 className="text-2xl font-semibold text-cyan-300">All Bookings</h2>
+        <div className="flex flex-wrap gap-2">
+          {[
+            ["bookings", "csv", "Bookings CSV"],
+            ["bookings", "ndjson", "Bookings NDJSON"],
+            ["payments", "csv", "Payments CSV"],
+            ["payments", "ndjson", "Payments NDJSON"],
+          ].map(([dataset, format, label]) => (
+            <button
+              key={`${dataset}.${format}`}
+              type="button"
+              disabled={exporting !== null}
+              onClick={() => downloadExport(dataset, format)}
+              className="rounded-xl border border-cyan-400/30 px-3 py-2 text-sm text-cyan-300 transition hover:bg-cyan-500/10 disabled:cursor-not-allowed disabled:opacity-40"
+            >
+              {exporting === `${dataset}.${format}` ? "Exporting…" : label}
+            </button>
+          ))}
+        </div>
+      </div>
 
       <div className="rounded-3xl border border-white/10 bg-white/5 p-6">
         {loading ? (
@@ -8,6 +8,9 @@ const AdminDashboard = () => {
     totalBookings: 0,
     totalRevenue: 0,
     activeBuses: 0,
+    todayBookings: 0,
+    todayRevenue: 0,
+    totalRefunds: 0,
   });
 
   const [recentBookings, setRecentBookings] = useState([]);
@@ -15,21 +18,18 @@ const AdminDashboard = () => {
 
   const fetchDashboard = async () => {
     try {
-      const [bookingsRes, revenueRes, busesRes, recentRes] =
-        await Promise.all([
-          api.get("/api/admin/dashboard/total-bookings/"),
-          api.get("/api/admin/dashboard/total-revenue/"),
-          api.get("/api/admin/dashboard/active-buses/"),
-          api.get("/api/admin/dashboard/recent-bookings/"),
-        ]);
+      const { data } = await api.get("/api/admin/dashboard/summary/");
 
       setStats({
-        totalBookings: bookingsRes.data.total_bookings,
-        totalRevenue: revenueRes.data.total_revenue,
-        activeBuses: busesRes.data.active_buses,
+        totalBookings: data.total_bookings,
+        totalRevenue: data.total_revenue,
+        activeBuses: data.active_buses,
+        todayBookings: data.today.bookings,
+        todayRevenue: data.today.revenue,
+        totalRefunds: data.total_refunds,
       });
 
-      setRecentBookings(recentRes.data);
+      setRecentBookings(data.recent_bookings);
     } catch {
       toast.error("Failed to load admin dashboard");
     } finally {
@@ -79,6 +79,21 @@ const AdminDashboard = () => {
           value={stats.activeBuses}
           color="text-purple-300"
         />
+        <StatCard
+          label="Bookings Today"
+          value={stats.todayBookings}
+          color="text-cyan-300"
+        />
+        <StatCard
+          label="Revenue Today"
+          value={`₹ ${Number(stats.todayRevenue).toLocaleString("en-IN")}`}
+          color="text-green-300"
+        />
+        <StatCard
+          label="Refunds"
+          value={stats.totalRefunds}
+          color="text-red-300"
+        />
       </div>
 
  
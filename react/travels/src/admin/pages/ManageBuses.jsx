@@ -1,6 +1,7 @@
 import { useEffect, useState } from "react";
 import {
   fetchAdminBuses,
+  fetchAdminBusesPage,
   createAdminBus,
   updateAdminBus,
   deleteAdminBus,
@@ -10,7 +11,15 @@ import { resolveMediaUrl } from "../../utils/url";
 
 export default function ManageBuses() {
   const [buses, setBuses] = useState([]);
+  const [nextPage, setNextPage] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [filters, setFilters] = useState({
+    active: "",
+    origin: "",
+    destination: "",
+    operator: "",
+  });
   const [open, setOpen] = useState(false);
   const [editBus, setEditBus] = useState(null);
   const [imageFile, setImageFile] = useState(null);
@@ -34,8 +43,12 @@ export default function ManageBuses() {
   const loadBuses = async () => {
     setLoading(true);
     try {
-      const res = await fetchAdminBuses();
-      setBuses(res.data);
+      const params = Object.fromEntries(
+        Object.entries(filters).filter(([, value]) => value.trim() !== "")
+      );
+      const res = await fetchAdminBuses(params);
+      setBuses(res.data.results);
+      setNextPage(res.data.next);
     } catch {
       toast.error("Failed to load buses");
     } finally {
@@ -43,9 +56,27 @@ export default function ManageBuses() {
     }
   };
 
+  const loadMoreBuses = async () => {
+    if (!nextPage) return;
+    setLoadingMore(true);
+    try {
+      const res = await fetchAdminBusesPage(nextPage);
+      setBuses((prev) => [...prev, ...res.data.results]);
+      setNextPage(res.data.next);
+    } catch {
+      toast.error("Failed to load more buses");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
-    loadBuses();
-  }, []);
+    const timer = setTimeout(loadBuses, 300);
+    return () => clearTimeout(timer);
+  }, [filters]);
+
+  const handleFilterChange = (e) =>
+    setFilters({ ...filters, [e.target.name]: e.target.value });
 
   useEffect(() => {
     return () => {
@@ -160,11 +191,22 @@ export default function ManageBuses() {
         </button>
       </div>
 
+      <div className="grid grid-cols-2 gap-3 md:grid-cols-4">
+        <select name="active" value={filters.active} onChange={handleFilterChange} className="rounded-xl border border-white/10 bg-white/5 px-3 py-2 text-sm text-white">
+          <option value="">All statuses</option>
+          <option value="true">Active</option>
+          <option value="false">Inactive</option>
+        </select>
+        <input name="origin" value={filters.origin} onChange={handleFilterChange} placeholder="Origin" className="rounded-xl border border-white/10 bg-white/5 px-3 py-2 text-sm text-white" />
+        <input name="destination" value={filters.destination} onChange={handleFilterChange} placeholder="Destination" className="rounded-xl border border-white/10 bg-white/5 px-3 py-2 text-sm text-white" />
+        <input name="operator" value={filters.operator} onChange={handleFilterChange} placeholder="Operator / bus name" className="rounded-xl border border-white/10 bg-white/5 px-3 py-2 text-sm text-white" />
+      </div>
+
       <div className="overflow-hidden rounded-2xl border border-white/10 bg-white/5 backdrop-blur-xl">
         {loading ? (
           <div className="p-6 text-gray-300">Loading buses...</div>
         ) : buses.length === 0 ? (
-          <div className="p-6 text-gray-400">No buses added yet</div>
+          <div className="p-6 text-gray-400">No buses found</div>
         ) : (
           <table className="w-full text-left text-sm text-gray-200">
             <thead className="bg-white/5 text-xs uppercase tracking-wider text-gray-400">
@@ -222,6 +264,18 @@ export default function ManageBuses() {
         )}
       </div>
 
+      {nextPage && !loading && (
+        <div className="flex justify-center">
+          <button
+            onClick={loadMoreBuses}
+            disabled={loadingMore}
+            className="rounded-xl border border-white/10 px-4 py-2 text-sm text-cyan-300 hover:bg-white/10 disabled:opacity-50"
+          >
+            {loadingMore ? "Loading..." : "Load more"}
+          </button>
+        </div>
+      )}
+
       {open && (
         <div className="fixed inset-0 z-50 flex items-center justify-center bg-black/60 backdrop-blur-sm">
           <form
@@ -1,6 +1,9 @@
 import api from "./api";
 
-export const fetchAdminBuses = () => api.get("/api/admin/buses/");
+export const fetchAdminBuses = (params = {}) =>
+  api.get("/api/admin/buses/", { params });
+
+export const fetchAdminBusesPage = (url) => api.get(url);
 
 export const createAdminBus = (formData) =>
   api.post("/api/admin/buses/", formData, {
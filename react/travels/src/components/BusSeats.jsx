@@ -2,6 +2,10 @@ import React, { useEffect, useState } from "react";
 import api from "../api/api";
 import { useNavigate, useParams, useSearchParams } from "react-router-dom";
 import { toast } from "react-toastify";
+import { decodePolyline, polylineToSvgPath } from "../utils/polyline";
+
+const ROUTE_SVG_WIDTH = 900;
+const ROUTE_SVG_HEIGHT = 320;
 
 const BusSeats = () => {
   const [bus, setBus] = useState(null);
@@ -9,6 +13,7 @@ const BusSeats = () => {
   const [loading, setLoading] = useState(false);
   const [processingSeatId, setProcessingSeatId] = useState(null);
   const [mapFailed, setMapFailed] = useState(false);
+  const [routePath, setRoutePath] = useState(null);
   const { busId } = useParams();
   const [searchParams] = useSearchParams();
   const journeyDate = searchParams.get("date");
@@ -18,8 +23,31 @@ const BusSeats = () => {
 
   useEffect(() => {
     setMapFailed(false);
+    setRoutePath(null);
   }, [busId]);
 
+  useEffect(() => {
+    if (!mapFailed) return;
+
+    const fetchRoute = async () => {
+      try {
+        const res = await api.get(`/api/buses/${busId}/route/`);
+        setRoutePath(
+          polylineToSvgPath(
+            decodePolyline(res.data.polyline),
+            res.data.bbox,
+            ROUTE_SVG_WIDTH,
+            ROUTE_SVG_HEIGHT
+          )
+        );
+      } catch {
+        setRoutePath(null);
+      }
+    };
+
+    fetchRoute();
+  }, [busId, mapFailed]);
+
   useEffect(() => {
     const fetchBus = async () => {
       setLoading(true);
@@ -127,6 +155,17 @@ const BusSeats = () => {
     }
   };
 
+  const releaseSeatHold = async (seatId) => {
+    try {
+      await api.post("/api/payments/release-hold/", {
+        seat_id: seatId,
+        journey_date: journeyDate,
+      });
+    } catch {
+      // The hold expires on its own if the release request fails.
+    }
+  };
+
   const handlePayAndBook = async (seatId) => {
     try {
       if (!journeyDate) {
@@ -178,9 +217,17 @@ const BusSeats = () => {
           }
         },
         theme: { color: "#22d3ee" },
+        modal: {
+          ondismiss: () => releaseSeatHold(seatId),
+        },
       };
 
-      new window.Razorpay(options).open();
+      const razorpay = new window.Razorpay(options);
+      razorpay.on("payment.failed", () => {
+        releaseSeatHold(seatId);
+        toast.error("Payment failed. The seat has been released.");
+      });
+      razorpay.open();
     } catch {
       toast.error("Seat unavailable. Try another seat.");
     }
@@ -314,6 +361,23 @@ const BusSeats = () => {
                   onError={() => setMapFailed(true)}
                   className="h-[320px] w-full object-cover"
                 />
+              ) : routePath ? (
+                <svg
+                  viewBox={`0 0 ${ROUTE_SVG_WIDTH} ${ROUTE_SVG_HEIGHT}`}
+                  preserveAspectRatio="xMidYMid meet"
+                  className="h-[320px] w-full"
+                  role="img"
+                  aria-label={`${bus.origin} to ${bus.destination} route`}
+                >
+                  <path
+                    d={routePath}
+                    fill="none"
+                    stroke="#22d3ee"
+                    strokeWidth="4"
+                    strokeLinecap="round"
+                    strokeLinejoin="round"
+                  />
+                </svg>
               ) : (
                 <div className="flex h-[320px] items-center justify-center px-6 text-center text-sm text-slate-400">
                   Route map is unavailable right now.
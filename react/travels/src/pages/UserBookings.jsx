@@ -9,7 +9,9 @@ import { FaTicketAlt } from "react-icons/fa";
 
 const UserBookings = () => {
   const [bookings, setBookings] = useState([]);
+  const [nextPage, setNextPage] = useState(null);
   const [loading, setLoading] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [actionId, setActionId] = useState(null);
   const [editingBookingId, setEditingBookingId] = useState(null);
   const [editDate, setEditDate] = useState("");
@@ -20,7 +22,8 @@ const UserBookings = () => {
     setLoading(true);
     try {
       const res = await api.get("/api/my/bookings/");
-      setBookings(res.data);
+      setBookings(res.data.results);
+      setNextPage(res.data.next);
     } catch {
       toast.error("Failed to load bookings");
     } finally {
@@ -28,6 +31,20 @@ const UserBookings = () => {
     }
   };
 
+  const loadMoreBookings = async () => {
+    if (!nextPage) return;
+    setLoadingMore(true);
+    try {
+      const res = await api.get(nextPage);
+      setBookings((prev) => [...prev, ...res.data.results]);
+      setNextPage(res.data.next);
+    } catch {
+      toast.error("Failed to load more bookings");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     fetchBookings();
   }, []);
@@ -304,7 +321,7 @@ const UserBookings = () => {
             
                   <div className="flex items-center gap-3 md:justify-end">
 
-                    {b.status === "EXPIRED" ? (
+                    {b.status === "EXPIRED" || b.archived ? (
                       <span
                         title="Expired Booking"
                         className="px-3 py-1 rounded-full text-xs border border-red-400/30 bg-red-500/10 text-red-300"
@@ -323,7 +340,7 @@ const UserBookings = () => {
                 
                     <button
                       title="Download Ticket"
-                      disabled={b.status === "EXPIRED"}
+                      disabled={b.status === "EXPIRED" || b.archived}
                       onClick={() => handlePrint(b)}
                       className="flex items-center justify-center w-10 h-10 rounded-xl border border-cyan-400/30 text-cyan-300 hover:bg-cyan-500/10 transition disabled:opacity-40 disabled:cursor-not-allowed"
                     >
@@ -332,7 +349,7 @@ const UserBookings = () => {
 
                     <button
                       type="button"
-                      disabled={b.status === "EXPIRED"}
+                      disabled={b.status === "EXPIRED" || b.archived}
                       onClick={() => openEditMode(b)}
                       title="Edit"
                       className="flex items-center gap-2 h-10 px-3 rounded-xl border border-amber-300/30 text-amber-300 hover:bg-amber-500/10 transition text-sm font-medium disabled:opacity-40 disabled:cursor-not-allowed"
@@ -344,7 +361,7 @@ const UserBookings = () => {
                 
                     <button
                       title="Refund Ticket"
-                      disabled={actionId === b.id || b.status === "EXPIRED"}
+                      disabled={actionId === b.id || b.status === "EXPIRED" || b.archived}
                       onClick={() => refundTicket(b.id)}
                       className="flex items-center justify-center w-10 h-10 rounded-xl border border-purple-400/30 text-purple-300 hover:bg-purple-500/10 transition disabled:opacity-40 disabled:cursor-not-allowed"
                     >
@@ -418,6 +435,18 @@ const UserBookings = () => {
           </div>
         )}
 
+        {!loading && nextPage && (
+          <div className="mt-8 text-center">
+            <button
+              type="button"
+              onClick={loadMoreBookings}
+              disabled={loadingMore}
+              className="text-sm text-cyan-300 hover:underline disabled:opacity-60"
+            >
+              {loadingMore ? "Loading..." : "Load more bookings"}
+            </button>
+          </div>
+        )}
     
         {!loading && bookings.length > 0 && (
           <div className="mt-12 backdrop-blur-xl bg-white/5 border border-white/10 rounded-3xl p-5 text-center">
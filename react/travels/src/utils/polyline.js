@@ -0,0 +1,42 @@
+export const decodePolyline = (encoded, precision = 5) => {
+  const factor = 10 ** precision;
+  const points = [];
+  let index = 0;
+  let lat = 0;
+  let lon = 0;
+
+  const readValue = () => {
+    let result = 0;
+    let shift = 0;
+    let byte;
+
+    do {
+      byte = encoded.charCodeAt(index++) - 63;
+      result |= (byte & 0x1f) << shift;
+      shift += 5;
+    } while (byte >= 0x20);
+
+    return result & 1 ? ~(result >> 1) : result >> 1;
+  };
+
+  while (index < encoded.length) {
+    lat += readValue();
+    lon += readValue();
+    points.push([lat / factor, lon / factor]);
+  }
+
+  return points;
+};
+
+export const polylineToSvgPath = (points, bbox, width, height) => {
+  const lonSpan = bbox.max_lon - bbox.min_lon || 1;
+  const latSpan = bbox.max_lat - bbox.min_lat || 1;
+
+  return points
+    .map(([lat, lon], position) => {
+      const x = ((lon - bbox.min_lon) / lonSpan) * width;
+      const y = ((bbox.max_lat - lat) / latSpan) * height;
+      return `${position === 0 ? "M" : "L"}${x.toFixed(1)},${y.toFixed(1)}`;
+    })
+    .join(" ");
+};